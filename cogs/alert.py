@@ -12,12 +12,14 @@ from sqlalchemy import text
 
 from db.session import SessionLocal
 from core.utils import interaction_response, interaction_followup
+from core.cache import TTLCache
 from queries.alert_query import (
-    get_alert_list, get_user_alerts, add_user_alert, 
-    remove_user_alert, create_custom_alert,
+    add_user_alert, get_or_create_custom_alert,
     get_upcoming_alerts, check_alert_table_exists,
-    check_deep_alert_user, remove_deep_alert_user,
-    add_deep_alert_user, select_deep_alert_users
+    remove_deep_alert_user,
+    add_deep_alert_user, select_deep_alert_users,
+    get_user_alert_state, set_user_alerts,
+    remove_user_custom_alert
 )
 from queries.channel_query import select_alert_channel
 
@@ -84,21 +86,80 @@ DAY_MAPPING = {
     "sun": "sun"
 }
 
+# 사용자별 알림 상태 캐시 - 설정 메뉴를 여는 동안 같은 상태를 여러 컴포넌트가 재사용
+# 심층 알림 상태는 길드마다 다르므로 (사용자, 길드) 단위로 캐시
+ALERT_STATE_TTL = 30  # 초
+_alert_state_cache = TTLCache(ttl=ALERT_STATE_TTL, maxsize=1024)
+_alert_state_guilds = {}  # {user_id: 캐시된 guild_id 집합} - 사용자 단위 갱신/무효화용
+
+def _alert_state_key(user_id, guild_id):
+    return str(user_id), str(guild_id) if guild_id else None
+
+def load_user_alert_state(user_id, guild_id=None):
+    """사용자의 전체 알림 구독 상태(기본/요일/커스텀/심층)를 한 번의 쿼리로 조회"""
+    key = _alert_state_key(user_id, guild_id)
+    state = _alert_state_cache.get(key)
+    if state is not None:
+        return state
+
+    with SessionLocal() as db:
+        state = get_user_alert_state(db, user_id, guild_id)
+    _alert_state_cache.set(key, state)
+    _alert_state_guilds.setdefault(key[0], set()).add(key[1])
+    return state
+
+def update_user_alert_state(user_id, alert_types, alert_ids):
+    """구독 일괄 변경 결과(새 구독 집합)를 사용자의 캐시된 알림 상태(모든 길드)에 반영"""
+    alert_ids = {str(alert_id) for alert_id in alert_ids}
+    guild_ids = _alert_state_guilds.get(str(user_id), set())
+    for guild_id in list(guild_ids):
+        key = (str(user_id), guild_id)
+        state = _alert_state_cache.get(key)
+        if state is None:
+            guild_ids.discard(guild_id)  # 만료된 항목 정리
+            continue
+
+        user_alerts = [a for a in state['user_alerts'] if a['alert_type'] not in alert_types]
+        for alert_type in alert_types:
+            user_alerts.extend(a for a in state['alert_list'].get(alert_type, []) if str(a['alert_id']) in alert_ids)
+        user_alerts.sort(key=lambda a: (a['alert_type'], a['alert_time']))
+
+        _alert_state_cache.set(key, {**state, 'user_alerts': user_alerts})
+
+def invalidate_user_alert_state(user_id):
+    """알림 설정 변경 후 사용자 상태 캐시 무효화 (모든 길드)"""
+    for guild_id in _alert_state_guilds.pop(str(user_id), set()):
+        _alert_state_cache.pop((str(user_id), guild_id))
+
 class AlertView(discord.ui.View):
-    def __init__(self, user_id, bot):
+    def __init__(self, user_id, bot, state=None):
         super().__init__(timeout=300)  # 5분 타임아웃
         self.user_id = user_id
         
+        # 사용자가 속한 길드 정보 가져오기
+        guild_id = state['guild_id'] if state else None
+        if not guild_id:
+            for guild in bot.guilds:
+                member = guild.get_member(int(user_id))
+                if member:
+                    guild_id = guild.id
+                    break
+        
+        # 알림 상태를 한 번만 조회해 모든 컴포넌트에 전달
+        if state is None:
+            state = load_user_alert_state(user_id, guild_id)
+        self.state = state
+        
         # 각 컴포넌트를 특정 행에 배치
-        boss_select = AlertSelect('boss', '보스 알림 🔔', user_id)
+        boss_select = AlertSelect('boss', '보스 알림 🔔', user_id, state)
         boss_select.row = 0  # 첫 번째 행
         self.add_item(boss_select)
 
-        barrier_select = AlertSelect('barrier', '결계 알림 🛡️', user_id)
+        barrier_select = AlertSelect('barrier', '결계 알림 🛡️', user_id, state)
         barrier_select.row = 1  # 두 번째 행
         self.add_item(barrier_select)
 
-        day_select = DaySelect(user_id)
+        day_select = DaySelect(user_id, state)
         day_select.row = 2  # 세 번째 행
         self.add_item(day_select)
 
@@ -107,69 +168,47 @@ class AlertView(discord.ui.View):
         custom_btn.row = 3  # 네 번째 행
         self.add_item(custom_btn)
         
-        # 심층 알림 관련 데이터 가져오기
-        with SessionLocal() as db:
-            # 사용자가 속한 길드 정보 가져오기
-            guild_id = None
-            for guild in bot.guilds:
-                member = guild.get_member(int(user_id))
-                if member:
-                    guild_id = guild.id
-                    break
+        # 심층 알림 버튼 - 사용자가 권한을 가진 그룹만 표시
+        guild = bot.get_guild(int(guild_id)) if guild_id else None
+        member = guild.get_member(int(user_id)) if guild else None
+        if member:
+            user_roles = [role.name for role in member.roles]
             
-            if guild_id:
-                # 사용자의 권한 확인 - 멤버 객체를 통해 역할 가져오기
-                member = bot.get_guild(guild_id).get_member(int(user_id))
-                user_roles = [role.name for role in member.roles] if member else []
-                
-                # 모든 심층 채널 및 권한 그룹 정보 가져오기
-                from queries.channel_query import select_deep_channels
-                auth_groups = []
-                
-                deep_channels = select_deep_channels(db, guild_id)
-                for _, auth in deep_channels:
-                    if auth not in auth_groups:
-                        auth_groups.append(auth)
-                
-                # 사용자가 권한을 가진 그룹만 필터링 (관리자도 자신의 역할명과 일치하는 그룹만)
-                user_auth_groups = []
-                for auth_group in auth_groups:
-                    if auth_group in user_roles:
-                        user_auth_groups.append(auth_group)
-                
-                # 버튼 추가 - 사용자가 권한을 가진 그룹에 대해서만
-                for i, auth_group in enumerate(user_auth_groups[:5]):  # 최대 5개 그룹으로 제한
-                    is_on = check_deep_alert_user(db, user_id, guild_id, auth_group)
-                    deep_btn = DeepAlertToggleButton(is_on, auth_group)
-                    deep_btn.row = 4  # 모든 심층 버튼을 마지막 행에 배치
-                    self.add_item(deep_btn)
+            # 사용자가 권한을 가진 그룹만 필터링 (관리자도 자신의 역할명과 일치하는 그룹만)
+            user_auth_groups = [auth_group for auth_group in state['deep_alerts'] if auth_group in user_roles]
+            
+            # 버튼 추가 - 사용자가 권한을 가진 그룹에 대해서만
+            for auth_group in user_auth_groups[:5]:  # 최대 5개 그룹으로 제한
+                is_on = state['deep_alerts'][auth_group]
+                deep_btn = DeepAlertToggleButton(is_on, auth_group)
+                deep_btn.row = 4  # 모든 심층 버튼을 마지막 행에 배치
+                self.add_item(deep_btn)
 
 class AlertSelect(discord.ui.Select):
-    def __init__(self, alert_type, placeholder, user_id):
+    def __init__(self, alert_type, placeholder, user_id, state=None):
         self.alert_type = alert_type
         self.user_id = user_id  # 인스턴스 변수로 user_id 저장
         
-        with SessionLocal() as db:
-            # 이 유형의 알림 가져오기
-            alerts = get_alert_list(db, alert_type)
-            
-            # 전달된 user_id를 사용하여 사용자 선택 알림 가져오기
-            user_alerts = get_user_alerts(db, self.user_id)
-            user_alert_ids = [str(alert['alert_id']) for alert in user_alerts]  # Convert all to strings
-            
-            # 옵션 생성
-            options = []
-            for alert in alerts:
-                alert_time = alert['alert_time'].strftime('%H:%M')
-                emoji = ALERT_TYPE_EMOJI.get(alert_type, '🔔')
-                option = discord.SelectOption(
-                    label=f"{ALERT_TYPE_NAMES.get(alert_type, alert_type)} {alert_time}",
-                    value=str(alert['alert_id']),  # Ensure value is a string
-                    description=f"{alert['interval']}마다 {alert_time}에 알림",
-                    emoji=emoji,
-                    default=str(alert['alert_id']) in user_alert_ids  # Compare strings with strings
-                )
-                options.append(option)
+        if state is None:
+            state = load_user_alert_state(user_id)
+        
+        # 이 유형의 알림과 사용자 선택 알림
+        alerts = state['alert_list'].get(alert_type, [])
+        user_alert_ids = {str(alert['alert_id']) for alert in state['user_alerts']}  # Convert all to strings
+        
+        # 옵션 생성
+        options = []
+        for alert in alerts:
+            alert_time = alert['alert_time'].strftime('%H:%M')
+            emoji = ALERT_TYPE_EMOJI.get(alert_type, '🔔')
+            option = discord.SelectOption(
+                label=f"{ALERT_TYPE_NAMES.get(alert_type, alert_type)} {alert_time}",
+                value=str(alert['alert_id']),  # Ensure value is a string
+                description=f"{alert['interval']}마다 {alert_time}에 알림",
+                emoji=emoji,
+                default=str(alert['alert_id']) in user_alert_ids  # Compare strings with strings
+            )
+            options.append(option)
         
         super().__init__(
             placeholder=placeholder,
@@ -183,25 +222,11 @@ class AlertSelect(discord.ui.Select):
         
         with SessionLocal() as db:
             try:
-                # 현재 사용자의 이 유형 알림 가져오기
-                user_alerts = get_user_alerts(db, interaction.user.id)
-                current_alert_ids = [str(alert['alert_id']) for alert in user_alerts 
-                                    if alert['alert_type'] == self.alert_type]  # Convert to string
-                
-                # 추가할 알림과 제거할 알림 결정
-                selected_alert_ids = [alert_id for alert_id in self.values]  # Keep as strings
-                
-                # 새 선택 추가
-                for alert_id in selected_alert_ids:
-                    if alert_id not in current_alert_ids:
-                        add_user_alert(db, interaction.user.id, alert_id)
-                
-                # 선택 해제된 항목 제거
-                for alert_id in current_alert_ids:
-                    if alert_id not in selected_alert_ids:
-                        remove_user_alert(db, interaction.user.id, alert_id)
+                # 선택한 알림 집합으로 구독 일괄 변경 (삭제/추가를 한 번에 처리)
+                result = set_user_alerts(db, interaction.user.id, [self.alert_type], alert_ids=self.values)
                 
                 db.commit()
+                update_user_alert_state(interaction.user.id, [self.alert_type], result['alert_ids'])
                 
                 await interaction_followup(interaction, f"{ALERT_TYPE_NAMES.get(self.alert_type, self.alert_type)} 알림 설정이 저장되었습니다!")
                 
@@ -211,7 +236,7 @@ class AlertSelect(discord.ui.Select):
                 db.rollback()
 
 class DaySelect(discord.ui.Select):
-    def __init__(self, user_id=None):  # 기본값이 None인 user_id 매개변수 추가
+    def __init__(self, user_id=None, state=None):  # 기본값이 None인 user_id 매개변수 추가
         self.user_id = user_id  # user_id 저장
         options = []
         days = [
@@ -234,14 +259,14 @@ class DaySelect(discord.ui.Select):
         
         # user_id가 제공된 경우 현재 선택 항목 미리 선택
         if user_id:
-            with SessionLocal() as db:
-                user_alerts = get_user_alerts(db, user_id)
-                selected_days = [alert['alert_type'] for alert in user_alerts 
-                               if alert['alert_type'] in ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']]
-                
-                # 사용자 선택에 따라 기본 상태 업데이트
-                for option in options:
-                    option.default = option.value in selected_days
+            if state is None:
+                state = load_user_alert_state(user_id)
+            selected_days = [alert['alert_type'] for alert in state['user_alerts'] 
+                           if alert['alert_type'] in ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']]
+            
+            # 사용자 선택에 따라 기본 상태 업데이트
+            for option in options:
+                option.default = option.value in selected_days
         
         super().__init__(
             placeholder="요일 알림 📅",
@@ -257,27 +282,12 @@ class DaySelect(discord.ui.Select):
             try:
                 selected_days = self.values
                 
-                # 요일 알림 가져오기
-                day_alerts = []
-                for day in ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']:
-                    day_alerts.extend(get_alert_list(db, day))
-                
-                # 사용자가 선택한 요일 알림 가져오기
-                user_alerts = get_user_alerts(db, interaction.user.id)
-                current_day_alert_ids = [str(alert['alert_id']) for alert in user_alerts 
-                                        if alert['alert_type'] in ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']]
-                
-                # 각 요일 알림 처리
-                for alert in day_alerts:
-                    alert_id_str = str(alert['alert_id'])  # Convert to string
-                    if alert['alert_type'] in selected_days and alert_id_str not in current_day_alert_ids:
-                        # 이 요일 알림 추가
-                        add_user_alert(db, interaction.user.id, alert_id_str)
-                    elif alert['alert_type'] not in selected_days and alert_id_str in current_day_alert_ids:
-                        # 이 요일 알림 제거
-                        remove_user_alert(db, interaction.user.id, alert_id_str)
+                # 선택한 요일의 알림 전체로 요일 알림 구독 일괄 변경
+                day_types = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+                result = set_user_alerts(db, interaction.user.id, day_types, selected_types=selected_days)
                 
                 db.commit()
+                update_user_alert_state(interaction.user.id, day_types, result['alert_ids'])
                 
                 day_names = [ALERT_TYPE_NAMES.get(day, day) for day in selected_days]
                 await interaction_followup(interaction, f"요일 알림이 설정되었습니다: {', '.join(day_names) if day_names else '없음'}")
@@ -325,13 +335,12 @@ class CustomAlertModal(discord.ui.Modal, title="커스텀 알림 등록"):
         await interaction.response.defer(ephemeral=True)
 
         # 사용자가 이미 등록한 커스텀 알림 개수 확인 (최대 25개)
-        with SessionLocal() as db:
-            user_alerts = get_user_alerts(db, interaction.user.id)
-            custom_alerts = [a for a in user_alerts if a['alert_type'] == 'custom' or a['alert_type'].startswith('custom_')]
+        state = load_user_alert_state(interaction.user.id, interaction.guild.id if interaction.guild else None)
+        custom_alerts = [a for a in state['user_alerts'] if a['alert_type'] == 'custom' or a['alert_type'].startswith('custom_')]
 
-            if len(custom_alerts) >= 25:
-                await interaction_followup(interaction, "❌ 커스텀 알림은 최대 25개까지만 등록할 수 있습니다.")
-                return
+        if len(custom_alerts) >= 25:
+            await interaction_followup(interaction, "❌ 커스텀 알림은 최대 25개까지만 등록할 수 있습니다.")
+            return
 
         # 시간 형식 검증
         time_pattern = re.compile(r'^([0-1][0-9]|2[0-3]):([0-5][0-9])$')
@@ -364,17 +373,21 @@ class CustomAlertModal(discord.ui.Modal, title="커스텀 알림 등록"):
         
         with SessionLocal() as db:
             try:
-                # 적절한 알림 타입으로 커스텀 알림 생성
-                alert_id = create_custom_alert(db, self.alert_time.value, interval, alert_type)
+                # 같은 시간/주기/요일의 공유 커스텀 알림을 조회하거나 새로 생성
+                alert_id = get_or_create_custom_alert(db, self.alert_time.value, interval, alert_type)
                 
                 if not alert_id:
                     await interaction_followup(interaction, "❌ 커스텀 알림 생성에 실패했습니다.")
                     return
                 
-                # 사용자에게 할당
-                add_user_alert(db, interaction.user.id, alert_id)
+                # 사용자에게 할당 (이미 구독 중이면 안내)
+                if not add_user_alert(db, interaction.user.id, alert_id):
+                    db.rollback()
+                    await interaction_followup(interaction, "❌ 이미 등록된 커스텀 알림입니다.")
+                    return
                 
                 db.commit()
+                invalidate_user_alert_state(interaction.user.id)
                 
                 # 적절한 성공 메시지 생성
                 interval_display = "매일" if interval == "day" else "매주"
@@ -404,46 +417,68 @@ class CustomAlertDeleteButton(discord.ui.Button):
         
         with SessionLocal() as db:
             try:
-                # 사용자가 해당 알림을 등록했는지 확인
-                user_alerts = get_user_alerts(db, interaction.user.id)
-                alert_ids = [alert['alert_id'] for alert in user_alerts]
+                # 소유 확인 + 구독 삭제 + 고아 알림 정리를 한 번에 처리하고 남은 커스텀 알림을 돌려받음
+                result = remove_user_custom_alert(db, interaction.user.id, self.alert_id)
                 
-                if self.alert_id not in alert_ids:
+                if not result['removed']:
                     await interaction_followup(interaction, "❌ 해당 알림을 찾을 수 없습니다.")
                     return
                 
-                # 사용자-알림 연결 삭제
-                remove_user_alert(db, interaction.user.id, self.alert_id)
-                
-                # 해당 알림을 사용하는 다른 사용자가 있는지 확인
-                from sqlalchemy import text
-                check_query = text("SELECT COUNT(*) FROM alert_user WHERE alert_id = :alert_id")
-                result = db.execute(check_query, {"alert_id": self.alert_id}).fetchone()
-                
-                # 다른 사용자가 없으면 알림 자체도 삭제
-                if result[0] == 0:
-                    from queries.alert_query import delete_custom_alert
-                    delete_custom_alert(db, self.alert_id)
-                
                 db.commit()
+                invalidate_user_alert_state(interaction.user.id)
                 
-                # 삭제 성공 메시지 표시
-                await interaction_followup(interaction, "✅ 커스텀 알림이 삭제되었습니다.")
-                
-                # 메시지 삭제 시도 - 현재 메시지를 완전히 삭제
+                # 남은 알림으로 관리 화면 다시 그리기 (추가 조회 없음)
+                custom_alerts = result['custom_alerts']
                 try:
-                    await interaction.message.delete()
-                except:
-                    pass
+                    await interaction.edit_original_response(
+                        embed=build_custom_alert_embed(custom_alerts),
+                        view=CustomAlertManageView(custom_alerts)
+                    )
+                except discord.HTTPException as e:
+                    logger.warning(f"커스텀 알림 관리 화면 갱신 실패: {e}")
                 
-                # 새로운 상호작용으로 새 명령어 실행하도록 안내
-                await interaction_followup(interaction, "알림 설정이 변경되었습니다. 메시지를 닫고 `/알림설정` 명령어 또는 버튼을 다시클릭하여 설정 화면을 열어주세요.")
+                # 삭제 성공 메시지 표시
+                await interaction_followup(interaction, "✅ 커스텀 알림이 삭제되었습니다.")
                 
             except Exception as e:
                 logger.error(f"커스텀 알림 삭제 중 오류: {str(e)}")
                 await interaction_followup(interaction, "❌ 알림 삭제 중 오류가 발생했습니다.")
                 db.rollback()
 
+def build_custom_alert_embed(custom_alerts):
+    """커스텀 알림 관리 임베드 생성"""
+    embed = discord.Embed(
+        title="➕ 커스텀 알림 관리",
+        description=f"등록된 커스텀 알림: {len(custom_alerts)}/25개\n\n아래 버튼을 눌러 알림을 삭제할 수 있습니다.",
+        color=discord.Color.green()
+    )
+
+    if custom_alerts:
+        # 커스텀 알림 목록 표시
+        custom_list = []
+        for i, alert in enumerate(custom_alerts, 1):
+            time_str = alert['alert_time'].strftime('%H:%M')
+            if alert['alert_type'].startswith('custom_'):
+                day_code = alert['alert_type'][7:]
+                day_name = ALERT_TYPE_NAMES.get(day_code, day_code)
+                custom_list.append(f"{i}. {time_str} (매주 {day_name})")
+            else:
+                interval_display = "매일" if alert['interval'] == "day" else "매주"
+                custom_list.append(f"{i}. {time_str} ({interval_display})")
+
+        embed.add_field(
+            name="📋 알림 목록",
+            value="\n".join(custom_list[:25]),  # 최대 25개까지
+            inline=False
+        )
+    else:
+        embed.add_field(
+            name="알림 없음",
+            value="'알림등록' 버튼에서 커스텀 알림을 추가할 수 있습니다.",
+            inline=False
+        )
+    return embed
+
 class CustomAlertManageView(discord.ui.View):
     """커스텀 알림 관리 전용 뷰 - 최대 25개(5 rows × 5 buttons) 삭제 버튼 표시"""
     def __init__(self, custom_alerts):
@@ -540,6 +575,7 @@ class DeepAlertToggleButton(discord.ui.Button):
                             message = f"{auth_group} 심층 알림 활성화에 실패했습니다."
                 
                 db.commit()
+                invalidate_user_alert_state(interaction.user.id)
                 await interaction_followup(interaction, message)
                 
                 # 뷰 업데이트
@@ -692,18 +728,26 @@ class AlertCog(commands.Cog):
                 logger.info("새 상호작용 응답을 전송합니다.")
                 send_method = interaction.response.send_message
             
-            # 알림 테이블 존재 확인
-            with SessionLocal() as db:
-                table_exists = check_alert_table_exists(db)
+            # 사용자의 알림 상태 한 번에 가져오기 (기본/요일/커스텀/심층)
+            try:
+                state = load_user_alert_state(interaction.user.id, interaction.guild.id)
+                user_alerts = state['user_alerts']
+                logger.info(f"사용자 알림 조회 성공: {len(user_alerts)}개 알림")
+            except Exception as e:
+                logger.error(f"사용자 알림 조회 중 오류: {str(e)}")
+                
+                # 조회 실패 시에만 알림 테이블 존재 확인
+                with SessionLocal() as db:
+                    table_exists = check_alert_table_exists(db)
                 if not table_exists:
                     logger.error("알림 테이블이 존재하지 않습니다!")
-                    await interaction_response(interaction, 
-                                             "알림 시스템 테이블이 존재하지 않습니다. 관리자에게 문의하세요.", 
-                                             ephemeral=True)
-                    return
-                
-                # 심층 알림 상태 확인
-                is_deep_alert_on = check_deep_alert_user(db, interaction.user.id, interaction.guild.id, None)
+                    await interaction_followup(interaction, "알림 시스템 테이블이 존재하지 않습니다. 관리자에게 문의하세요.")
+                else:
+                    await interaction_followup(interaction, f"알림 정보 조회 중 오류가 발생했습니다: {str(e)}")
+                return
+            
+            # 심층 알림 상태 확인
+            is_deep_alert_on = any(state['deep_alerts'].values())
             
             # 알림 설정 임베드 생성
             embed = discord.Embed(
@@ -715,18 +759,6 @@ class AlertCog(commands.Cog):
                 color=discord.Color.blue()
             )
             
-            # 사용자의 현재 알림 가져오기
-            with SessionLocal() as db:
-                try:
-                    user_alerts = get_user_alerts(db, interaction.user.id)
-                    logger.info(f"사용자 알림 조회 성공: {len(user_alerts)}개 알림")
-                except Exception as e:
-                    logger.error(f"사용자 알림 조회 중 오류: {str(e)}")
-                    await interaction_response(interaction, 
-                                             f"알림 정보 조회 중 오류가 발생했습니다: {str(e)}", 
-                                             ephemeral=True)
-                    return
-            
             # 유형별로 알림 그룹화
             boss_alerts = [a for a in user_alerts if a['alert_type'] == 'boss']
             barrier_alerts = [a for a in user_alerts if a['alert_type'] == 'barrier']
@@ -786,7 +818,7 @@ class AlertCog(commands.Cog):
             embed.set_footer(text="알림은 설정 시간 5분 전과 정각에 발송됩니다.")
             
             # 기본 알림 선택용 뷰 생성
-            view = AlertView(interaction.user.id, self.bot)
+            view = AlertView(interaction.user.id, self.bot, state)
 
             # 메시지 전송 (적절한 메서드 사용)
             await send_method(embed=embed, view=view, ephemeral=True)
@@ -829,41 +861,11 @@ class AlertCog(commands.Cog):
                 await interaction.response.defer(ephemeral=True)
 
             # 사용자의 커스텀 알림 가져오기
-            with SessionLocal() as db:
-                user_alerts = get_user_alerts(db, interaction.user.id)
-                custom_alerts = [a for a in user_alerts if a['alert_type'] == 'custom' or a['alert_type'].startswith('custom_')]
+            state = load_user_alert_state(interaction.user.id, interaction.guild.id if interaction.guild else None)
+            custom_alerts = [a for a in state['user_alerts'] if a['alert_type'] == 'custom' or a['alert_type'].startswith('custom_')]
 
             # 임베드 생성
-            embed = discord.Embed(
-                title="➕ 커스텀 알림 관리",
-                description=f"등록된 커스텀 알림: {len(custom_alerts)}/25개\n\n아래 버튼을 눌러 알림을 삭제할 수 있습니다.",
-                color=discord.Color.green()
-            )
-
-            if custom_alerts:
-                # 커스텀 알림 목록 표시
-                custom_list = []
-                for i, alert in enumerate(custom_alerts, 1):
-                    time_str = alert['alert_time'].strftime('%H:%M')
-                    if alert['alert_type'].startswith('custom_'):
-                        day_code = alert['alert_type'][7:]
-                        day_name = ALERT_TYPE_NAMES.get(day_code, day_code)
-                        custom_list.append(f"{i}. {time_str} (매주 {day_name})")
-                    else:
-                        interval_display = "매일" if alert['interval'] == "day" else "매주"
-                        custom_list.append(f"{i}. {time_str} ({interval_display})")
-
-                embed.add_field(
-                    name="📋 알림 목록",
-                    value="\n".join(custom_list[:25]),  # 최대 25개까지
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name="알림 없음",
-                    value="'알림등록' 버튼에서 커스텀 알림을 추가할 수 있습니다.",
-                    inline=False
-                )
+            embed = build_custom_alert_embed(custom_alerts)
 
             # 커스텀 알림 관리 뷰 생성
             view = CustomAlertManageView(custom_alerts)
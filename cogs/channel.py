@@ -13,7 +13,7 @@ from queries.channel_query import (
     update_voice_channel, update_alert_channel, insert_deep_pair,
     # 새 함수 추가
     select_voice_channels, insert_voice_channel, delete_voice_channel,
-    insert_chatbot_channel, select_chatbot_channel
+    insert_chatbot_channel, select_chatbot_channel, update_guild_llm_quota
 )
 # from cogs.deep import initialize_deep_button
 
@@ -97,6 +97,11 @@ class ChannelCog(commands.Cog):
                 # 챗봇 채널 설정
                 insert_chatbot_channel(db, interaction.guild.id, 채널.id)
                 db.commit()
+
+                # 요약 봇 채널 캐시/메시지 버퍼 갱신
+                summary_cog = self.bot.get_cog("SummaryAssistant")
+                if summary_cog:
+                    summary_cog.set_chatbot_channel(interaction.guild.id, 채널.id)
                 
                 await interaction_followup(interaction, f"챗봇 채널이 {채널.mention}로 설정되었습니다.")
             
@@ -104,6 +109,56 @@ class ChannelCog(commands.Cog):
                 logger.error(f"챗봇 채널 설정 중 오류 발생: {str(e)}")
                 await interaction_followup(interaction, f"챗봇 채널 설정 중 오류가 발생했습니다: {str(e)}")
 
+    @is_super_user()
+    @app_commands.command(name="요약한도설정", description="이 서버의 시간당 요약(LLM) 사용량 한도를 설정합니다. 비워두면 기본값을 사용합니다.")
+    @app_commands.describe(
+        서버요청="서버 전체 시간당 요청 수",
+        서버토큰="서버 전체 시간당 예상 토큰 수",
+        사용자요청="사용자 1명당 시간당 요청 수",
+        사용자토큰="사용자 1명당 시간당 예상 토큰 수"
+    )
+    async def set_llm_quota(
+        self,
+        interaction: discord.Interaction,
+        서버요청: app_commands.Range[int, 1] = None,
+        서버토큰: app_commands.Range[int, 1000] = None,
+        사용자요청: app_commands.Range[int, 1] = None,
+        사용자토큰: app_commands.Range[int, 1000] = None
+    ):
+        await interaction.response.defer(ephemeral=True)
+
+        with SessionLocal() as db:
+            try:
+                result = update_guild_llm_quota(
+                    db, interaction.guild.id,
+                    guild_requests=서버요청,
+                    guild_tokens=서버토큰,
+                    user_requests=사용자요청,
+                    user_tokens=사용자토큰
+                )
+                if not result:
+                    await interaction_followup(interaction, "길드 정보가 없습니다. 먼저 길드인증을 해주세요.")
+                    return
+                db.commit()
+
+                # 요약 코그의 한도 캐시 갱신
+                summary_cog = self.bot.get_cog("SummaryAssistant")
+                if summary_cog:
+                    summary_cog.invalidate_guild_quota(interaction.guild.id)
+
+                def show(value):
+                    return f"{value:,}" if value else "기본값"
+                await interaction_followup(
+                    interaction,
+                    f"요약 사용량 한도가 설정되었습니다.\n"
+                    f"서버: 시간당 {show(서버요청)}회 / {show(서버토큰)}토큰\n"
+                    f"사용자: 시간당 {show(사용자요청)}회 / {show(사용자토큰)}토큰"
+                )
+
+            except Exception as e:
+                logger.error(f"요약 한도 설정 중 오류 발생: {str(e)}")
+                await interaction_followup(interaction, f"요약 한도 설정 중 오류가 발생했습니다: {str(e)}")
+
     @is_super_user()
     @app_commands.command(name="길드인증", description="길드를 인증합니다. 모든 기능은 길드인증을 받아야 사용 가능합니다.")
     @app_commands.describe(
@@ -217,6 +272,11 @@ class ChannelCog(commands.Cog):
             try:
                 # 현재 선택된 채널 목록 조회
                 current_channels = select_voice_channels(db, interaction.guild.id)
+
+                # 음성채널 코그의 부모 채널 캐시도 DB 기준으로 맞춤
+                voice_cog = interaction.client.get_cog("VoiceChannelCog")
+                if voice_cog:
+                    voice_cog.set_parent_voice_channels(interaction.guild.id, current_channels)
                 
                 # 서버의 모든 음성 채널 목록 가져오기
                 all_voice_channels = [ch for ch in interaction.guild.channels 
@@ -453,6 +513,11 @@ class VoiceChannelSelectView(discord.ui.View):
                     
                     db.commit()
                     logger.info(f"음성채널 설정 저장 완료: 추가 {len(channels_to_add)}개, 제거 {len(channels_to_remove)}개")
+
+                    # 음성채널 코그의 부모 채널 캐시 갱신 (입장 이벤트에서 DB 조회 없이 확인)
+                    voice_cog = interaction.client.get_cog("VoiceChannelCog")
+                    if voice_cog:
+                        voice_cog.set_parent_voice_channels(self.guild_id, selected_ids)
                 except Exception as db_error:
                     logger.error(f"데이터베이스 작업 중 오류: {db_error}")
                     db.rollback()
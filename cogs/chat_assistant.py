@@ -1,14 +1,25 @@
+import asyncio
 import logging
 import traceback
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from core.config import settings
-from openai import OpenAI
-from datetime import datetime
+from core.llm_client import LLMClient, LLMTimeoutError
+from core.message_buffer import MessageBuffer, to_record, format_record, split_blocks
+from core.cache import TTLCache, SingleFlight
+from core.prompt_builder import build_history, estimate_cost, estimate_tokens, MESSAGE_OVERHEAD
+from core.rate_limit import LLMRateLimiter
+from core.read_position import ReadPositionStore
+from core.extractive_summary import extract_summary
+from cogs.channel import is_super_user
+from datetime import datetime, timedelta, timezone
+import time
 from db.session import SessionLocal
-from queries.channel_query import select_chatbot_channel
+from queries.channel_query import select_chatbot_channel, select_guild_llm_quota
+from queries.summary_query import select_read_positions, upsert_read_positions
 import typing
+from collections import deque
 from typing import List, Dict, Any, Optional
 
 # 로거 설정
@@ -17,6 +28,115 @@ logger = logging.getLogger("cogs.chat_assistant")
 # API 키 설정 (DeepSeek API 키 사용)
 key = settings.DEEPSEEK_API_KEY
 
+# 상호작용 토큰 유효 시간 (만료되면 followup 전송 불가)
+INTERACTION_TTL = timedelta(minutes=15)
+INTERACTION_MARGIN = 5  # 만료 직전 전송할 여유 시간 (초)
+
+# 구간별 요약 - 메시지가 많으면 고정 크기 구간을 따로 요약한 뒤 합침
+SUMMARY_BLOCK_SIZE = 100
+SUMMARY_BLOCK_THRESHOLD = 200   # 이 개수를 넘으면 구간별 요약 사용
+SUMMARY_BLOCK_MAX_TOKENS = 300
+SUMMARY_BLOCK_CACHE_TTL = 3600
+
+# 채널별 메시지 버퍼 크기 (요약 메시지개수 최대값 + 구간 정렬 여유분)
+SUMMARY_BUFFER_SIZE = 500 + SUMMARY_BLOCK_SIZE
+
+# 요약 결과 캐시 - 새 메시지가 없으면 같은 요약을 재사용
+SUMMARY_CACHE_TTL = 600
+
+# AI 요약 최대 대기 시간 (초) - 넘으면 빠른 요약으로 대신 응답
+SUMMARY_MAX_WAIT = 60
+
+# 서버별 사용량 한도 캐시 시간 (초)
+QUOTA_CACHE_TTL = 300
+
+# 읽은 위치 최대 보관 개수 (채널-사용자 쌍)
+READ_POSITION_MAX = 50000
+
+# 실시간(스트리밍) 요약 - 메시지 수정 간격 (디스코드 수정 제한: 5초에 5회)
+STREAM_EDIT_INTERVAL = 1.5
+
+
+def fetch_read_positions(limit):
+    """저장된 읽은 위치 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return select_read_positions(db, limit)
+
+
+def save_read_positions(positions):
+    """읽은 위치 일괄 저장, 성공 여부 반환 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        saved = upsert_read_positions(db, positions)
+        if saved:
+            db.commit()
+        return saved
+
+
+def fetch_guild_llm_quota(guild_id):
+    """서버별 LLM 사용량 한도 설정 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return select_guild_llm_quota(db, guild_id)
+
+
+def build_summary_embed(summary, footer_text):
+    embed = discord.Embed(
+        description=f"> 요약 : \n {summary}",
+        color=0x242429
+    )
+    embed.set_footer(text=footer_text)
+    return embed
+
+
+class SummaryStream:
+    """
+    실시간 요약 표시
+    첫 내용이 도착하면 followup을 보내고, 이후 일정 간격으로만 메시지를 수정
+    """
+
+    def __init__(self, interaction, footer_text, max_length, ephemeral=False):
+        self.interaction = interaction
+        self.ephemeral = ephemeral  # 개인 전송 여부 (두 번째 followup부터는 defer 설정을 따르지 않으므로 직접 지정)
+        self.footer_text = footer_text
+        self.max_length = max_length
+        self.message = None
+        self.last_edit = 0.0
+        self.first_content_at = None
+
+    def _embed(self, content, done=False):
+        if len(content) > self.max_length:
+            content = content[:self.max_length] + "..."
+        footer_text = self.footer_text if done else f"{self.footer_text} | 작성 중..."
+        return build_summary_embed(content if done else f"{content} ▌", footer_text)
+
+    async def update(self, content):
+        now = time.monotonic()
+        try:
+            if self.message is None:
+                self.first_content_at = now
+                self.last_edit = now
+                self.message = await self.interaction.followup.send(
+                    embed=self._embed(content), ephemeral=self.ephemeral, wait=True
+                )
+            elif now - self.last_edit >= STREAM_EDIT_INTERVAL:
+                self.last_edit = now
+                await self.message.edit(embed=self._embed(content))
+        except Exception as e:
+            # 표시 실패는 요약 생성에 영향 주지 않음 (완료 시 한 번 더 전송)
+            logger.warning(f"실시간 요약 표시 실패: {e}")
+
+    async def finish(self, summary, footer_text=None):
+        """최종 요약 표시 (이미 보낸 메시지가 있으면 수정)"""
+        if footer_text:
+            self.footer_text = footer_text
+        embed = self._embed(summary, done=True)
+        if self.message is not None:
+            try:
+                await self.message.edit(embed=embed)
+                return
+            except Exception as e:
+                logger.warning(f"실시간 요약 최종 수정 실패: {e}")
+        await self.interaction.followup.send(embed=embed, ephemeral=self.ephemeral)
+
 class SummaryAssistant(commands.Cog):
     """
     메시지 요약 도우미 - 채널의 대화 맥락을 기반으로 요약본을 제공하는 Discord 챗봇
@@ -28,9 +148,13 @@ class SummaryAssistant(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.client = OpenAI(
+        self.llm = LLMClient(
             api_key=key,
-            base_url="https://api.deepseek.com/v1"
+            base_url=settings.DEEPSEEK_BASE_URL,
+            model=settings.SUMMARY_MODEL,
+            timeout=settings.LLM_TIMEOUT,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_retries=settings.LLM_MAX_RETRIES
         )
 
         # Discord 메시지 길이 제한
@@ -39,16 +163,44 @@ class SummaryAssistant(commands.Cog):
         
         # 채널 목록 캐시
         self.chatbot_channels = {}
-        
-        # 유저별 마지막 읽은 메시지 ID
-        self.last_read_message = {}  # {channel_id: {user_id: last_read_message_id}}
-        
-        # 사용자별 채널별 마지막 접속 시간
-        self.last_user_activity = {}  # {channel_id: {user_id: last_activity_timestamp}}
+
+        # 봇 채널별 최근 메시지 버퍼 (요약 시 API 조회 대신 사용)
+        self.message_buffer = MessageBuffer(maxlen=SUMMARY_BUFFER_SIZE)
+
+        # 요약 결과 캐시 {(채널, 최신 메시지 ID, 메시지 개수, 모드): {'content', 'tokens'}}
+        self.summary_cache = TTLCache(ttl=SUMMARY_CACHE_TTL, maxsize=256)
+        self.summary_flight = SingleFlight()
+
+        # 구간 요약 캐시 {(채널, 첫 메시지 ID, 마지막 메시지 ID, 내용 해시): {'content', 'tokens'}}
+        self.block_cache = TTLCache(ttl=SUMMARY_BLOCK_CACHE_TTL, maxsize=1024)
+        self.summary_stats = {
+            'hits': 0,          # 캐시에서 바로 응답
+            'misses': 0,        # LLM 요청 발생
+            'coalesced': 0,     # 진행 중인 같은 요청에 합류
+            'tokens_used': 0,   # LLM 요청에 사용한 토큰
+            'tokens_saved': 0,  # 캐시/합류로 아낀 토큰
+            'trimmed_lines': 0, # 입력 정리/예산 초과로 제외한 줄
+            'cost': 0.0,        # LLM 요청 비용 (USD)
+            'quick': 0,         # 빠른 요약 (LLM 없이)
+            'fallbacks': 0      # AI 요약 실패/지연으로 빠른 요약 대체
+        }
+
+        # 서버별/사용자별 LLM 사용량 제한
+        self.rate_limiter = LLMRateLimiter()
+        self.quota_cache = TTLCache(ttl=QUOTA_CACHE_TTL, maxsize=1024)
+
+        # 명령어 실행부터 첫 내용 표시까지 걸린 시간 (최근 200건, 초)
+        self.first_content_latency = deque(maxlen=200)
+
+        # 채널별/사용자별 마지막으로 읽은(활동한) 메시지 ID (LRU, DB에 주기적으로 저장)
+        self.read_positions = ReadPositionStore(maxsize=READ_POSITION_MAX)
+        self.read_positions_loaded = False
     
-    def cog_unload(self):
+    async def cog_unload(self):
         """코그가 언로드될 때 호출되는 메서드"""
-        pass
+        self.flush_read_positions.cancel()
+        await self.flush_read_positions()
+        await self.llm.close()
     
     async def load_chatbot_channels(self):
         """DB에서 봇 채널 목록 로드"""
@@ -67,10 +219,47 @@ class SummaryAssistant(commands.Cog):
             logger.error(f"봇 채널 로드 중 오류: {e}")
             logger.error(traceback.format_exc())
     
+    def is_chatbot_channel(self, channel_id):
+        return str(channel_id) in self.chatbot_channels.values()
+
+    async def warm_message_buffer(self, channel_id):
+        """채널 히스토리로 메시지 버퍼 채우기 (채널당 한 번)"""
+        if self.message_buffer.is_warm(channel_id):
+            return
+
+        channel = self.bot.get_channel(int(channel_id))
+        if not channel:
+            logger.warning(f"채널 {channel_id} 찾을 수 없음 (버퍼 준비 생략)")
+            return
+
+        try:
+            records = []
+            async for msg in channel.history(limit=SUMMARY_BUFFER_SIZE):
+                if not msg.author.bot:
+                    records.append(to_record(msg))
+            self.message_buffer.warm(channel_id, records)
+            logger.info(f"채널 {channel_id} 메시지 버퍼 준비 완료: {len(records)}개")
+        except Exception as e:
+            logger.error(f"채널 {channel_id} 메시지 버퍼 준비 중 오류: {e}")
+
+    def set_chatbot_channel(self, guild_id, channel_id):
+        """봇 채널 변경 시 캐시와 메시지 버퍼 갱신 (/챗봇채널설정에서 호출)"""
+        guild_id = str(guild_id)
+        old_channel_id = self.chatbot_channels.get(guild_id)
+        self.chatbot_channels[guild_id] = str(channel_id)
+
+        if old_channel_id and old_channel_id != str(channel_id) and not self.is_chatbot_channel(old_channel_id):
+            self.message_buffer.drop(old_channel_id)
+        # 히스토리 조회는 명령어 응답을 막지 않도록 백그라운드에서 진행
+        asyncio.create_task(self.warm_message_buffer(channel_id))
+
     @commands.Cog.listener()
     async def on_ready(self):
         """봇이 준비되었을 때 호출되는 이벤트"""
         await self.load_chatbot_channels()
+        await self.load_read_positions()
+        for channel_id in set(self.chatbot_channels.values()):
+            await self.warm_message_buffer(channel_id)
         logger.info("요약 어시스턴트가 준비되었습니다.")
     
     async def cog_load(self):
@@ -79,6 +268,7 @@ class SummaryAssistant(commands.Cog):
         
         # 메시지 이벤트 등록 - 메시지 히스토리를 위해 필요
         self.bot.add_listener(self.on_message_create, "on_message")
+        self.flush_read_positions.start()
     
     async def on_message_create(self, message):
         """메시지 이벤트 처리 - 히스토리 추적용"""
@@ -88,17 +278,38 @@ class SummaryAssistant(commands.Cog):
         
         # 메시지 히스토리에 추가
         self.add_to_history(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        """메시지 수정 시 버퍼 내용 갱신 (시작 시 불러온 메시지도 포함하도록 raw 이벤트 사용)"""
+        content = payload.data.get('content')
+        if content is None or not self.is_chatbot_channel(payload.channel_id):
+            return
+        self.message_buffer.edit(payload.channel_id, payload.message_id, content)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        """메시지 삭제 시 버퍼에서 제거"""
+        if self.is_chatbot_channel(payload.channel_id):
+            self.message_buffer.delete(payload.channel_id, payload.message_id)
     
     # 요약 명령어 - 채널의 일반 요약
     @app_commands.command(name="요약", description="현재 채널의 대화 내용을 요약합니다")
     @app_commands.describe(
         전송방식="요약을 받을 방식을 선택합니다 (공개: 채널에 공개적으로 표시, 개인: 개인만 보이는 메시지로 전송)", 
-        메시지개수="요약할 최근 메시지 개수를 선택합니다"
+        메시지개수="요약할 최근 메시지 개수를 선택합니다 (안 읽은 메시지는 최대 개수)",
+        범위="최근: 최근 메시지, 안읽은: 내 마지막 활동(메시지/명령어) 이후 메시지",
+        요약방식="AI: AI가 작성한 요약, 빠른: 자주 나온 주제와 대표 메시지를 바로 보여줌",
+        실시간="요약이 작성되는 대로 바로 보여줍니다 (AI 요약)"
     )
     async def summarize(self, interaction: discord.Interaction, 
                        전송방식: typing.Literal["공개", "개인"],
-                       메시지개수: typing.Literal["50", "100", "300", "500"] = "50"):
+                       메시지개수: typing.Literal["50", "100", "300", "500"] = "50",
+                       범위: typing.Literal["최근", "안읽은"] = "최근",
+                       요약방식: typing.Literal["AI", "빠른"] = "AI",
+                       실시간: bool = False):
 
+        started_at = time.monotonic()
         is_private_mode = 전송방식 == "개인"
         if is_private_mode:
             await interaction.response.defer(ephemeral=True)
@@ -109,47 +320,94 @@ class SummaryAssistant(commands.Cog):
         channel_id = str(interaction.channel_id)
         user_id = str(interaction.user.id)
         
-        # 현재 사용자의 활동 시간 업데이트
-        self.update_user_activity_from_interaction(interaction)
         
         try:
             logger.info(f"요약 명령어 실행: 채널={channel_id}, 사용자={user_id}, 전송방식={전송방식}")
-            # 요약할 메시지 가져오기
-            messages_to_summarize = []
-            
             # 메시지 개수 정수로 변환
             limit = int(메시지개수)
-            logger.info(f"요약 설정: 전송방식={전송방식}, 메시지개수={limit}")
+            logger.info(f"요약 설정: 전송방식={전송방식}, 메시지개수={limit}, 범위={범위}")
             
-            # 최근 메시지 요약 (지정된 개수만큼)
-            messages_to_summarize = await self.get_channel_history(channel_id, limit=limit)
-            logger.info(f"요약할 메시지 개수: {len(messages_to_summarize)}")
-            summary_type = "최근 메시지"
-            additional_instruction = f"최근 {limit}개의 메시지를 요약해주세요."
+            # 요약할 메시지 가져오기
+            records = None
+            if 범위 == "안읽은":
+                records = await self.get_unread_records(channel_id, user_id, limit=limit)
+                summary_type = "안 읽은 메시지"
+                mode = f"unread:{records[0]['id']}" if records else "unread"
+
+            if records is None:
+                # 최근 메시지 요약 (지정된 개수만큼, 읽은 위치 기록이 없을 때도 사용)
+                records = await self.get_channel_records(channel_id, limit=limit)
+                summary_type = "최근 메시지"
+                mode = "recent"
+            logger.info(f"요약할 메시지 개수: {len(records)}")
         
             
-            if not messages_to_summarize or len(messages_to_summarize) < 3:
+            if not records or len(records) < 3:
                 await interaction.followup.send("요약할 메시지가 충분하지 않습니다. 더 많은 대화가 필요합니다.", ephemeral=True)
-                logger.warning(f"요약할 메시지 부족: 채널={channel_id}, 사용자={user_id}, 메시지개수={len(messages_to_summarize) if messages_to_summarize else 0}")
+                logger.warning(f"요약할 메시지 부족: 채널={channel_id}, 사용자={user_id}, 메시지개수={len(records) if records else 0}")
                 return
             
             
-            # 요약 생성
-            summary = await self.generate_summary(messages_to_summarize)
+            footer_text = f"{datetime.now().strftime('%Y-%m-%d %H:%M')} | {summary_type} {len(records)}개 요약"
+            stream = None
+
+            if 요약방식 == "빠른":
+                summary = extract_summary(records)
+                footer_text = f"{footer_text} (빠른 요약)"
+                self.summary_stats['quick'] += 1
+            else:
+                # 요약 생성 (같은 위치의 요약은 캐시/진행 중인 요청 재사용)
+                cache_key = (channel_id, records[-1]['id'], limit, mode)
+
+                # 새로 LLM 요청이 필요한 경우에만 사용량 차감
+                if self.summary_cache.get(cache_key) is None and cache_key not in self.summary_flight:
+                    quota = await self.get_guild_quota(interaction.guild_id)
+                    allowed, wait, scope = self.rate_limiter.acquire(
+                        interaction.guild_id or 0, interaction.user.id,
+                        self.estimate_request_tokens(records), quota
+                    )
+                    if not allowed:
+                        await interaction.followup.send(self.cooldown_message(wait, scope), ephemeral=True)
+                        return
+
+                if 실시간:
+                    stream = SummaryStream(interaction, footer_text, self.MAX_DISCORD_LENGTH, ephemeral=is_private_mode)
+
+                deadline = min(self.interaction_deadline(interaction), started_at + SUMMARY_MAX_WAIT)
+                try:
+                    summary = await self.get_or_create_summary(
+                        cache_key,
+                        records,
+                        deadline=deadline,
+                        on_content=stream.update if stream else None
+                    )
+                except LLMTimeoutError as e:
+                    logger.warning(f"요약 생성 시간 초과: {e}")
+                    summary = None
+
+                # AI 요약 실패/지연 시 빠른 요약으로 대신 응답
+                if not summary:
+                    summary = extract_summary(records)
+                    footer_text = f"{footer_text} (AI 응답 지연으로 빠른 요약)"
+                    self.summary_stats['fallbacks'] += 1
+                    logger.info(f"빠른 요약으로 대체: 채널={channel_id}, 사용자={user_id}")
             
             if not summary:
                 await interaction.followup.send("요약을 생성할 수 없습니다. 나중에 다시 시도해주세요.", ephemeral=True)
                 return
+
+            # 요약을 받은 사용자는 명령어 시점까지 읽은 것으로 기록 (상호작용 ID도 스노우플레이크)
+            self.read_positions.update(channel_id, user_id, interaction.id)
+
+            if stream:
+                await stream.finish(summary, footer_text)
+                first_content_at = stream.first_content_at or time.monotonic()
+                self.record_first_content_latency(first_content_at - started_at)
+                logger.info(f"실시간 요약 전송 완료 (사용자: {interaction.user.name}, 길이: {len(summary)}자)")
+                return
                 
             # 임베드 생성
-            embed = discord.Embed(
-                # title=f"💬 {summary_type}{limit}개 메시지 요약 ",
-                description=f"> 요약 : \n {summary}",
-                color=0x242429
-            )
-            
-            # 현재 시간 추가
-            embed.set_footer(text=f"{datetime.now().strftime('%Y-%m-%d %H:%M')} | {summary_type}{limit}개 메시지 요약")
+            embed = build_summary_embed(summary, footer_text)
             
             # 전송 방식에 따라 요약 전송
             if is_private_mode:  # 개인 메시지로 전송 (ephemeral 메시지 사용)
@@ -158,27 +416,43 @@ class SummaryAssistant(commands.Cog):
             else:  # 채널에 공개적으로 전송
                 await interaction.followup.send(embed=embed)
                 logger.info(f"임베드 요약 전송 완료 (채널: {interaction.channel.name}, 유형: {summary_type}, 길이: {len(summary)}자)")
-        
+            self.record_first_content_latency(time.monotonic() - started_at)
+
         except Exception as e:
             logger.error(f"요약 생성 중 오류 발생: {e}")
             logger.error(traceback.format_exc())
             await interaction.followup.send("요약 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요.", ephemeral=True)
     
     def add_to_history(self, message):
-        """채널별 메시지 히스토리에 메시지 추가 (마지막 읽은 메시지 추적용)"""
+        """채널별 메시지 히스토리에 메시지 추가 (봇 채널만 버퍼에 보관)"""
         channel_id = str(message.channel.id)
-        
-        # 채널 ID로 마지막 메시지 ID 저장 (읽은 메시지 추적용)
-        if channel_id not in self.last_read_message:
-            self.last_read_message[channel_id] = {}
-            
-        # 디버그 로그만 추가
-        logger.debug(f"채널 {channel_id} 메시지 감지: {message.author.name} - {message.content[:30]}...")
+        is_chatbot_channel = self.is_chatbot_channel(channel_id)
+
+        # 메시지를 보낸 사용자는 여기까지 읽은 것으로 기록
+        # (모든 채널을 기록하면 DB 저장량이 커지므로 봇 채널과 요약을 사용한 적 있는 채널만)
+        if is_chatbot_channel or self.read_positions.tracks_channel(channel_id):
+            self.read_positions.update(channel_id, message.author.id, message.id)
+
+        if is_chatbot_channel:
+            self.message_buffer.append(channel_id, to_record(message))
     
     async def get_channel_history(self, channel_id, limit=100):
+        records = await self.get_channel_records(channel_id, limit=limit)
+        return [format_record(record) for record in records]
+
+    async def get_channel_records(self, channel_id, limit=100):
+        """최근 메시지 레코드 조회 (오래된 것이 먼저)"""
         channel_id = int(channel_id)  # Discord API는 정수 ID 사용
         
         logger.info(f"채널 {channel_id} 히스토리 요청: limit={limit}")
+
+        # 버퍼가 준비된 채널은 API 조회 없이 메모리에서 가져옴
+        # (구간별 요약 대상이면 가장 오래된 구간이 잘리지 않도록 구간 경계에 맞춤)
+        if self.message_buffer.is_warm(channel_id):
+            align = SUMMARY_BLOCK_SIZE if limit > SUMMARY_BLOCK_THRESHOLD else None
+            records = self.message_buffer.recent(channel_id, limit, align=align)
+            logger.info(f"채널 {channel_id} 버퍼에서 히스토리 가져오기: {len(records)}개 메시지")
+            return records
         
         try:
             # Discord API로 채널 객체 가져오기
@@ -201,155 +475,315 @@ class SummaryAssistant(commands.Cog):
             
             logger.info(f"채널 {channel_id} 히스토리 가져오기 성공: {len(messages)}개 메시지")
             
-            # 사람이 읽기 쉽도록 형태로 변환 (길드 내 닉네임 사용)
-            formatted_history = []
-            for msg in messages:
-                # 길드 내 닉네임 가져오기 (가능한 경우)
-                try:
-                    # 메시지가 서버에서 온 경우
-                    if hasattr(msg, 'guild') and msg.guild is not None:
-                        member = msg.guild.get_member(msg.author.id)
-                        display_name = member.display_name if member else msg.author.name
-                    else:
-                        display_name = msg.author.name
-                    
-                    formatted_history.append(f"{display_name}: {msg.content}")
-                except Exception as e:
-                    # 오류 발생 시 기본 이름 사용
-                    logger.error(f"닉네임 가져오기 오류: {e}")
-                    formatted_history.append(f"{msg.author.name}: {msg.content}")
-                
-            return formatted_history
+            # 요약용 레코드로 변환 (길드 내 닉네임 사용)
+            return [to_record(msg) for msg in messages]
             
         except Exception as e:
             logger.error(f"채널 히스토리 가져오기 오류: {e}")
             return []
 
-    def update_user_activity(self, message):
-        """메시지 객체로부터 사용자의 활동 시간 업데이트"""
-        channel_id = str(message.channel.id)
-        user_id = str(message.author.id)
-        
-        # 채널별 사용자 활동 데이터 초기화
-        if channel_id not in self.last_user_activity:
-            self.last_user_activity[channel_id] = {}
-            
-        # 현재 사용자의 활동 시간 업데이트
-        self.last_user_activity[channel_id][user_id] = datetime.now()
-        
-        # 마지막으로 읽은 메시지 ID 업데이트
-        if channel_id not in self.last_read_message:
-            self.last_read_message[channel_id] = {}
-            
-        # 현재 사용자가 읽은 메시지 ID 업데이트
-        self.last_read_message[channel_id][user_id] = str(message.id)
-            
-        logger.debug(f"사용자 {user_id} 활동 시간 업데이트 (채널: {channel_id})")
-    
-    async def update_user_activity_from_interaction(self, interaction):
-        """슬래시 명령어 상호작용에서 사용자의 활동 시간 업데이트"""
-        channel_id = str(interaction.channel_id)
-        user_id = str(interaction.user.id)
-        
-        # 채널별 사용자 활동 데이터 초기화
-        if channel_id not in self.last_user_activity:
-            self.last_user_activity[channel_id] = {}
-            
-        # 현재 사용자의 활동 시간 업데이트
-        self.last_user_activity[channel_id][user_id] = datetime.now()
-        
-        # 마지막으로 읽은 메시지 ID 업데이트
-        if channel_id not in self.last_read_message:
-            self.last_read_message[channel_id] = {}
-        
-        try:
-            # 채널의 마지막 메시지 ID 가져오기
-            channel = self.bot.get_channel(int(channel_id))
-            if channel:
-                # 가장 최근 메시지 1개만 가져오기
-                async for msg in channel.history(limit=1):
-                    if not msg.author.bot:  # 봇 메시지 제외
-                        self.last_read_message[channel_id][user_id] = str(msg.id)
-                        break
-                        
-            logger.debug(f"사용자 {user_id} 활동 시간 업데이트 (채널: {channel_id}, 슬래시 명령어)")
-        except Exception as e:
-            logger.error(f"사용자 활동 업데이트 오류: {e}")
+    async def get_unread_records(self, channel_id, user_id, limit=100):
+        """
+        사용자의 마지막 활동(메시지/명령어) 이후 메시지 레코드 조회 (자기 메시지 제외)
+        읽은 위치는 스노우플레이크라 ID 비교만으로 범위를 정함
+        - 버퍼에 범위가 모두 있으면 메모리에서, 아니면 after=위치로 한 번만 조회
+        반환: 레코드 목록 / 읽은 위치 기록이 없으면 None
+        """
+        last_read_id = self.read_positions.get(channel_id, user_id)
+        if last_read_id is None:
+            logger.info(f"사용자의 마지막 읽은 위치 기록 없음: 채널={channel_id}, 사용자={user_id}")
+            return None
 
-    async def get_unread_messages(self, channel_id, user_id, limit=100):
-        channel_id = str(channel_id)
-        user_id = str(user_id)
-        
-        logger.info(f"읽지 않은 메시지 검색: 채널={channel_id}, 사용자={user_id}, 최대개수={limit}")
-        
-        # 사용자의 마지막 읽은 메시지 ID 가져오기
-        last_read_id = None
-        if channel_id in self.last_read_message and user_id in self.last_read_message[channel_id]:
-            last_read_id = self.last_read_message[channel_id][user_id]
-            logger.info(f"사용자의 마지막 읽은 메시지 ID: {last_read_id}")
+        logger.info(f"읽지 않은 메시지 검색: 채널={channel_id}, 사용자={user_id}, 위치={last_read_id}, 최대개수={limit}")
+        if self.message_buffer.covers(channel_id, last_read_id):
+            records = self.message_buffer.since(channel_id, last_read_id, limit)
         else:
-            logger.info(f"사용자의 마지막 읽은 메시지 기록 없음")
-            
-            # 마지막 읽은 메시지 기록 없는 경우, 지정된 개수의 메시지만 가져옴
-            return await self.get_channel_history(channel_id, limit=limit)
-        
-        try:
-            # Discord API로 채널 객체 가져오기
             channel = self.bot.get_channel(int(channel_id))
             if not channel:
                 logger.warning(f"채널 {channel_id} 찾을 수 없음")
                 return []
-            
-            # 최대 100개의 메시지 가져오기
-            messages = []
-            async for msg in channel.history(limit=100):
-                # 봇 메시지 제외
-                if msg.author.bot:
-                    continue
-                    
-                messages.append(msg)
-                # 마지막으로 읽은 메시지를 찾으면 중단
-                if str(msg.id) == last_read_id:
-                    break
-            
-            # 읽지 않은 메시지만 필터링 (마지막 읽은 메시지 이후의 메시지들)
-            unread_messages = []
-            found_last_read = False
-            
-            # 시간 순서로 정렬 (가장 오래된 것이 먼저 오도록)
+            messages = [
+                msg async for msg in channel.history(
+                    limit=limit, after=discord.Object(id=last_read_id), oldest_first=False
+                )
+                if not msg.author.bot
+            ]
             messages.reverse()
-            
-            for msg in messages:
-                if str(msg.id) == last_read_id:
-                    found_last_read = True
-                    continue  # 마지막으로 읽은 메시지는 제외
-                
-                if found_last_read and str(msg.author.id) != user_id:  # 자기 메시지 제외
-                    # 길드 내 닉네임 가져오기
-                    try:
-                        if hasattr(msg, 'guild') and msg.guild is not None:
-                            member = msg.guild.get_member(msg.author.id)
-                            display_name = member.display_name if member else msg.author.name
-                        else:
-                            display_name = msg.author.name
-                            
-                        unread_messages.append(f"{display_name}: {msg.content}")
-                    except Exception as e:
-                        logger.error(f"닉네임 가져오기 오류: {e}")
-                        unread_messages.append(f"{msg.author.name}: {msg.content}")
-            
-            logger.info(f"읽지 않은 메시지 검색 결과: {len(unread_messages)}개 발견")
-            return unread_messages
-        
+            records = [to_record(msg) for msg in messages]
+
+        unread = [record for record in records if record['author_id'] != int(user_id)]
+        logger.info(f"읽지 않은 메시지 검색 결과: {len(unread)}개 발견")
+        return unread
+
+    async def load_read_positions(self):
+        """DB에 저장된 읽은 위치 불러오기 (시작 시 한 번)"""
+        if self.read_positions_loaded:
+            return
+        try:
+            rows = await asyncio.to_thread(fetch_read_positions, READ_POSITION_MAX)
+            self.read_positions.load(rows)
+            self.read_positions_loaded = True
+            logger.info(f"요약 읽은 위치 {len(rows)}개 로드됨")
         except Exception as e:
-            logger.error(f"읽지 않은 메시지 검색 오류: {e}")
-            return []
-        
-        return unread_messages
+            logger.error(f"요약 읽은 위치 로드 중 오류: {e}")
 
-    async def generate_summary(self, history: List[str], additional_instruction: str = "") -> Optional[str]:
+    @tasks.loop(minutes=1)
+    async def flush_read_positions(self):
+        """변경된 읽은 위치를 한 번에 저장"""
+        positions = self.read_positions.take_dirty()
+        if not positions:
+            return
+        try:
+            saved = await asyncio.to_thread(save_read_positions, positions)
+            if not saved:
+                self.read_positions.restore_dirty(positions)
+                return
+            logger.debug(f"요약 읽은 위치 {len(positions)}개 저장")
+        except Exception as e:
+            self.read_positions.restore_dirty(positions)
+            logger.error(f"요약 읽은 위치 저장 중 오류: {e}")
+
+    async def get_or_create_summary(self, cache_key, records: List[Dict[str, Any]], deadline: Optional[float] = None,
+                                    on_content=None) -> Optional[str]:
+        """
+        캐시된 요약 반환, 없으면 생성
+        같은 키로 동시에 들어온 요청은 하나의 LLM 요청을 공유
+        on_content: 실시간 요약 표시 콜백 (직접 생성하는 요청에서만 호출됨)
+        """
+        cached = self.summary_cache.get(cache_key)
+        if cached is not None:
+            self.summary_stats['hits'] += 1
+            self.summary_stats['tokens_saved'] += cached['tokens']
+            logger.info(f"요약 캐시 적중: {cache_key}")
+            return cached['content']
+
+        result, shared = await self.summary_flight.do(cache_key, self.create_summary, cache_key, records, deadline, on_content)
+        if shared:
+            self.summary_stats['coalesced'] += 1
+            if result:
+                self.summary_stats['tokens_saved'] += result['tokens']
+        return result['content'] if result else None
+
+    async def create_summary(self, cache_key, records, deadline, on_content=None):
+        """LLM으로 요약 생성 후 캐시에 저장"""
+        self.summary_stats['misses'] += 1
+        if len(records) > SUMMARY_BLOCK_THRESHOLD:
+            result = await self.generate_block_summary(cache_key[0], records, deadline, on_content)
+        else:
+            lines = self.build_summary_input(records)
+            result = await self.generate_summary(lines, deadline=deadline, on_content=on_content)
+        if not result:
+            return None
+
+        cost = result['cost'] + result.get('fresh_block_cost', 0)
+        logger.info(f"요약 비용: 메시지 {len(records)}개, ${cost:.5f}")
+        cached = {
+            'content': result['content'],
+            'tokens': result['prompt_tokens'] + result['completion_tokens'] + result.get('block_tokens', 0)
+        }
+        self.summary_cache.set(cache_key, cached)
+        return cached
+
+    def build_summary_input(self, records):
+        """입력 토큰 예산에 맞춰 요약할 대화 줄 생성"""
+        lines, report = build_history(records, settings.SUMMARY_INPUT_TOKEN_BUDGET)
+        self.summary_stats['trimmed_lines'] += report['dropped'] + report['over_budget']
+        logger.info(
+            f"요약 입력: {report['input_lines']}줄 → {report['lines']}줄 "
+            f"(제외 {report['dropped']}, 정리 {report['compacted']}, 예산 초과 {report['over_budget']}), "
+            f"약 {report['tokens']}토큰"
+        )
+        return lines
+
+    def record_llm_usage(self, response):
+        """LLM 응답의 토큰 사용량/비용 집계 (response['cost']에 비용 기록)"""
+        response['cost'] = estimate_cost(
+            response['prompt_tokens'], response['completion_tokens'],
+            settings.LLM_INPUT_PRICE, settings.LLM_OUTPUT_PRICE
+        )
+        self.summary_stats['tokens_used'] += response['prompt_tokens'] + response['completion_tokens']
+        self.summary_stats['cost'] += response['cost']
+        return response
+
+    async def generate_block_summary(self, channel_id, records, deadline, on_content=None):
+        """
+        구간별 요약 (map-reduce)
+        고정 크기 구간을 각각 요약해 캐시하고, 구간 요약들을 합쳐 최종 요약 생성
+        새 메시지가 들어오면 마지막 구간만 다시 요약됨
+        """
+        blocks = split_blocks(records, SUMMARY_BLOCK_SIZE)
+        block_results = await asyncio.gather(*[
+            self.get_or_create_block_summary(channel_id, block, deadline) for block in blocks
+        ])
+        if not all(block_results):
+            return None
+
+        block_tokens = sum(result['tokens'] for result in block_results)
+        sections = [
+            f"[구간 {index}] {result['content']}"
+            for index, result in enumerate(block_results, 1) if result['content']
+        ]
+        logger.info(f"구간별 요약: 채널={channel_id}, 구간 {len(blocks)}개, 구간 요약 토큰 {block_tokens}")
+
+        result = await self.generate_summary(
+            sections,
+            additional_instruction="아래 내용은 대화를 시간 순서대로 구간별 요약한 것입니다. 구간을 합쳐 전체 대화를 하나의 요약으로 정리해주세요",
+            deadline=deadline,
+            on_content=on_content
+        )
+        if not result:
+            return None
+
+        # 구간 요약 비용 (전체 토큰 / 이번 요청에서 새로 요약한 구간 비용)
+        result['block_tokens'] = block_tokens
+        result['fresh_block_cost'] = sum(r['cost'] for r in block_results if r.get('fresh'))
+        return result
+
+    async def get_or_create_block_summary(self, channel_id, block, deadline):
+        """구간 요약 조회 (구간 경계 + 내용 해시로 캐시, 수정/삭제된 구간은 다시 요약)"""
+        digest = hash(tuple((record['id'], record['content']) for record in block))
+        block_key = (channel_id, block[0]['id'], block[-1]['id'], digest)
+
+        cached = self.block_cache.get(block_key)
+        if cached is not None:
+            self.summary_stats['tokens_saved'] += cached['tokens']
+            return cached
+
+        result, shared = await self.summary_flight.do(("block",) + block_key, self.create_block_summary, block_key, block, deadline)
+        if shared and result:
+            self.summary_stats['tokens_saved'] += result['tokens']
+            return dict(result, fresh=False)
+        return result
+
+    async def create_block_summary(self, block_key, block, deadline):
+        lines = self.build_summary_input(block)
+        if not lines:
+            # 이모지/링크만 있는 구간
+            cached = {'content': "", 'tokens': 0}
+            self.block_cache.set(block_key, cached)
+            return dict(cached, fresh=True, cost=0)
+
+        history_text = "\n".join(lines)
+        messages = [
+            {
+                "role": "system",
+                "content": "Discord Conversation Summary Helper. Summarize this part of a conversation as short Korean bullet points. Keep names, decisions and questions. No extra text."
+            },
+            {
+                "role": "user",
+                "content": f"다음 대화 구간의 핵심 내용을 간단히 요약해주세요:\n\n{history_text}"
+            }
+        ]
+        try:
+            response = await self.llm.complete(messages, max_tokens=SUMMARY_BLOCK_MAX_TOKENS, deadline=deadline)
+        except LLMTimeoutError:
+            raise
+        except Exception as e:
+            logger.error(f"구간 요약 생성 중 오류 발생: {e}")
+            return None
+
+        self.record_llm_usage(response)
+        cached = {
+            'content': response['content'].strip(),
+            'tokens': response['prompt_tokens'] + response['completion_tokens']
+        }
+        self.block_cache.set(block_key, cached)
+        return dict(cached, fresh=True, cost=response['cost'])
+
+    async def get_guild_quota(self, guild_id):
+        """
+        서버별 시간당 LLM 사용량 한도 (guilds 테이블 값, 없으면 기본값)
+        QUOTA_CACHE_TTL 동안 캐시, /요약한도설정에서 invalidate_guild_quota로 무효화
+        """
+        quota = self.quota_cache.get(guild_id)
+        if quota is not None:
+            return quota
+
+        guild_quota = {}
+        if guild_id:
+            try:
+                guild_quota = await asyncio.to_thread(fetch_guild_llm_quota, guild_id)
+            except Exception as e:
+                logger.error(f"LLM 사용량 한도 조회 중 오류: {e}")
+
+        quota = {
+            'guild_requests': guild_quota.get('guild_requests') or settings.LLM_GUILD_REQUESTS_PER_HOUR,
+            'guild_tokens': guild_quota.get('guild_tokens') or settings.LLM_GUILD_TOKENS_PER_HOUR,
+            'user_requests': guild_quota.get('user_requests') or settings.LLM_USER_REQUESTS_PER_HOUR,
+            'user_tokens': guild_quota.get('user_tokens') or settings.LLM_USER_TOKENS_PER_HOUR
+        }
+        self.quota_cache.set(guild_id, quota)
+        return quota
+
+    def invalidate_guild_quota(self, guild_id):
+        """/요약한도설정 후 호출"""
+        self.quota_cache.pop(int(guild_id))
+
+    def estimate_request_tokens(self, records):
+        """요약 1회에 쓸 토큰 예상치 (입력 + 최대 출력)"""
+        input_tokens = sum(estimate_tokens(record['content']) + MESSAGE_OVERHEAD for record in records)
+        return input_tokens + self.DEFAULT_MAX_TOKENS
+
+    def cooldown_message(self, wait, scope):
+        minutes, seconds = divmod(int(wait) + 1, 60)
+        wait_text = f"{minutes}분 {seconds}초" if minutes else f"{seconds}초"
+        target = "이 서버의 요약 사용량이" if scope == "guild" else "요약을 자주 요청하셔서 사용량이"
+        return (
+            f"⏳ {target} 잠시 한도에 도달했어요. 약 {wait_text} 후에 다시 시도해주세요.\n"
+            f"기다리기 어렵다면 `요약방식: 빠른`으로 바로 요약을 볼 수 있어요."
+        )
+
+    def record_first_content_latency(self, seconds):
+        self.first_content_latency.append(seconds)
+        logger.info(f"요약 첫 내용 표시까지 {seconds:.2f}초")
+
+    @is_super_user()
+    @app_commands.command(name="요약통계", description="요약 캐시 적중률과 토큰 사용량을 확인합니다")
+    async def summary_statistics(self, interaction: discord.Interaction):
+        stats = self.summary_stats
+        total = stats['hits'] + stats['misses'] + stats['coalesced']
+        hit_ratio = (stats['hits'] + stats['coalesced']) / total * 100 if total else 0
+
+        embed = discord.Embed(title="요약 캐시 통계", color=0x242429)
+        embed.add_field(name="요청", value=f"{total}회", inline=True)
+        embed.add_field(name="캐시 적중", value=f"{stats['hits']}회", inline=True)
+        embed.add_field(name="요청 합류", value=f"{stats['coalesced']}회", inline=True)
+        embed.add_field(name="LLM 요청", value=f"{stats['misses']}회", inline=True)
+        embed.add_field(name="적중률", value=f"{hit_ratio:.1f}%", inline=True)
+        embed.add_field(name="캐시 항목", value=f"{len(self.summary_cache)}개", inline=True)
+        embed.add_field(name="사용 토큰", value=f"{stats['tokens_used']:,}", inline=True)
+        embed.add_field(name="절약 토큰", value=f"{stats['tokens_saved']:,}", inline=True)
+        embed.add_field(name="제외한 줄", value=f"{stats['trimmed_lines']:,}", inline=True)
+        embed.add_field(name="누적 비용", value=f"${stats['cost']:.4f}", inline=True)
+        embed.add_field(name="빠른 요약", value=f"{stats['quick']}회 (대체 {stats['fallbacks']}회)", inline=True)
+        if self.rate_limiter.metrics:
+            top_guilds = sorted(self.rate_limiter.metrics.items(), key=lambda item: item[1]['tokens'], reverse=True)[:5]
+            lines = []
+            for guild_id, metrics in top_guilds:
+                guild = self.bot.get_guild(int(guild_id)) if guild_id else None
+                name = guild.name if guild else str(guild_id)
+                lines.append(f"{name}: {metrics['requests']}회, 약 {metrics['tokens']:,}토큰, 제한 {metrics['limited']}회")
+            embed.add_field(name="서버별 사용량 (예상 토큰 기준)", value="\n".join(lines), inline=False)
+        if self.first_content_latency:
+            samples = sorted(self.first_content_latency)
+            p50 = samples[len(samples) // 2]
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            embed.add_field(name="첫 내용 표시 (p50 / p95)", value=f"{p50:.2f}초 / {p95:.2f}초", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    def interaction_deadline(self, interaction) -> float:
+        """상호작용 만료 시각을 time.monotonic() 기준 마감 시각으로 변환"""
+        expires_at = interaction.created_at + INTERACTION_TTL
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds() - INTERACTION_MARGIN
+        return time.monotonic() + remaining
+
+    async def generate_summary(self, history: List[str], additional_instruction: str = "",
+                               deadline: Optional[float] = None, on_content=None) -> Optional[Dict[str, Any]]:
         """
         대화 히스토리를 기반으로 요약을 생성합니다.
+        deadline이 지나면 요청을 취소합니다 (상호작용 만료 시각, LLMTimeoutError 발생).
+        on_content 지정 시 스트리밍으로 받아 내용이 도착할 때마다 호출합니다.
+        반환: {'content', 'prompt_tokens', 'completion_tokens'} / 실패 시 None
         """
         try:
             # 채팅 히스토리 포맷팅
@@ -380,29 +814,42 @@ class SummaryAssistant(commands.Cog):
                 }
             ]
             
-            response = self.client.chat.completions.create(
-                model="deepseek-chat",
-                messages=messages,
-                max_tokens=self.DEFAULT_MAX_TOKENS,
-                temperature=1.0,
-                stream=False
-            )
+            if on_content:
+                response = await self.llm.complete_stream(
+                    messages,
+                    max_tokens=self.DEFAULT_MAX_TOKENS,
+                    on_content=on_content,
+                    temperature=1.0,
+                    deadline=deadline
+                )
+            else:
+                response = await self.llm.complete(
+                    messages,
+                    max_tokens=self.DEFAULT_MAX_TOKENS,
+                    temperature=1.0,
+                    deadline=deadline
+                )
             
+            self.record_llm_usage(response)
+
             # 응답 내용 가져오기
-            content = response.choices[0].message.content.strip()
+            content = response['content'].strip()
             
             # 디스코드 메시지 길이 제한 적용
             if len(content) > self.MAX_DISCORD_LENGTH:
                 content = content[:self.MAX_DISCORD_LENGTH] + "..."
                 logger.info(f"응답이 너무 길어 {self.MAX_DISCORD_LENGTH}자로 잘렸습니다.")
             
-            logger.info(f"요약 생성 완료: {len(content)}자")
-            return content
+            logger.info(f"요약 생성 완료: {len(content)}자, 토큰 {response['prompt_tokens']}+{response['completion_tokens']}")
+            response['content'] = content
+            return response
             
+        except LLMTimeoutError:
+            raise
         except Exception as e:
             logger.error(f"요약 생성 중 오류 발생: {e}")
             logger.error(traceback.format_exc())
-            return "요약 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
+            return None
 
 async def setup(bot):
     """
@@ -1,16 +1,241 @@
+import asyncio
 import discord
 from discord import app_commands
-from discord.ext import commands
-import aiohttp
+from discord.ext import commands, tasks
 import logging
 import traceback
-from db.session import sessionmaker, rank_engine
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from db.session import SessionLocal, RankSessionLocal
 from core.config import settings
-from sqlalchemy import text
-from views.rank_views.personal_rank_view import _build_rank_embed
+from core.utils import interaction_response
+from core.rank_client import RankAPIClient, RankAPIError
+from core.cache import TTLCache, SingleFlight
+from cogs.channel import is_super_user
+from queries.rank_query import select_recent_character_rank, select_recent_character_ranks
+from queries.rank_query import select_known_characters, select_rank_servers
+from queries.rank_query import select_latest_snapshot, select_snapshot_classes, select_leaderboard_page
+from queries.rank_query import select_oldest_snapshot, select_ranking_daily_rollup, select_rank_changes
+from queries.rank_history_query import insert_rollup_state, rollup_state_exists, lock_rollup_range, update_rollup_state
+from queries.rank_history_query import upsert_rank_daily_history, upsert_rank_character_names, select_character_daily_history
+from queries.rank_history_query import search_character_names
+from queries.rank_watch_query import select_all_rank_watches, select_rank_watchlist, insert_rank_watch, delete_rank_watch
+from queries.rank_watch_query import select_rank_notify_channels, upsert_rank_notify_channel, delete_rank_notify_channel
+from queries.rank_watch_query import update_rank_notified_at
+from views.rank_views.personal_rank_view import build_character_embed
+from views.rank_views.party_rank_view import PartyRankView, build_party_rank_pages
+from views.rank_views.leaderboard_view import LeaderboardView
+from views.rank_views.trend_view import build_trend_embed
+from views.rank_views.rank_notify_view import build_rank_digest_embed
 
 logger = logging.getLogger(__name__)
 
+# 랭크 조회 캐시 - DB 신선도 기준(15분)과 같은 TTL
+RANK_CACHE_TTL = 15 * 60
+RANK_NEGATIVE_CACHE_TTL = 5 * 60  # 없는 캐릭터(오타 등) 응답 캐시
+RANK_CACHE_SIZE = 5000
+
+# 이름 자동완성 - 검색 결과 캐시 (같은 입력이 키 입력마다 반복되므로 짧게 유지)
+NAME_SEARCH_CACHE_TTL = 60
+SERVER_LIST_CACHE_TTL = 3600
+AUTOCOMPLETE_LIMIT = 25  # 디스코드 자동완성 최대 개수
+SUGGESTION_LIMIT = 5     # 없는 캐릭터 응답에 붙일 추천 이름 수
+
+# 순위표 - 페이지 크기, 페이지/최신 스냅샷 캐시
+LEADERBOARD_PAGE_SIZE = 10
+LEADERBOARD_CACHE_TTL = 60
+
+# 일간 기록 - 한 번에 반영할 최대 구간 수 (구간당 최대 6시간, 밀린 기록은 여러 주기에 걸쳐 따라잡음)
+RANK_ROLLUP_MAX_BATCHES = 8
+
+# 관심 캐릭터 미리 조회 - 캐시가 곧 만료되는 캐릭터만 작은 묶음으로 나눠 간격을 두고 조회 (API 부하 분산)
+RANK_WATCH_MAX_PER_GUILD = 30
+RANK_PREFETCH_INTERVAL = 5           # 분
+RANK_PREFETCH_MARGIN = 2 * 60        # 다음 주기 전에 만료될 항목도 미리 갱신 (초)
+RANK_PREFETCH_BATCH_SIZE = 5
+RANK_PREFETCH_BATCH_DELAY = 3        # 묶음 사이 대기 (초)
+RANK_PREFETCH_MAX_PER_TICK = 100
+
+# 순위 변동 알림 - 주기마다 채널별로 한 번 모아서 전송
+RANK_NOTIFY_INTERVAL = 30            # 분
+RANK_NOTIFY_LAG = timedelta(minutes=5)  # 수집 중인 최근 스냅샷은 다음 주기에 비교
+
+# 파티 랭킹 - 한 번에 조회할 수 있는 캐릭터 수, 동시에 보낼 API 요청 수
+RANK_BATCH_MAX = 8
+RANK_BATCH_CONCURRENCY = 4
+
+
+def fetch_recent_rank(server, character):
+    """최근 15분 이내 랭킹 조회 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        return select_recent_character_rank(db, server, character)
+
+
+def fetch_recent_ranks(server, characters):
+    """여러 캐릭터의 최근 15분 이내 랭킹을 쿼리 한 번으로 조회 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        return select_recent_character_ranks(db, server, characters)
+
+
+def fetch_known_characters(server, characters):
+    """랭킹 데이터에 있는 캐릭터 이름 집합 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        return select_known_characters(db, server, characters)
+
+
+def fetch_character_names(server, query, limit):
+    """캐릭터 이름 앞부분/유사도 검색 - 기본 DB의 이름 목록 사용 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return search_character_names(db, server, query, limit)
+
+
+def fetch_rank_servers():
+    """랭킹 데이터의 서버 목록 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        return select_rank_servers(db)
+
+
+def fetch_leaderboard_snapshot(server):
+    """서버의 최신 스냅샷 시각과 클래스 목록 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        snapshot_at = select_latest_snapshot(db, server)
+        classes = select_snapshot_classes(db, server, snapshot_at) if snapshot_at else []
+        return snapshot_at, classes
+
+
+def fetch_leaderboard_page(server, snapshot_at, after, class_name, limit):
+    """순위표 한 페이지 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        return select_leaderboard_page(db, server, snapshot_at, after, class_name, limit)
+
+
+def run_rank_rollup():
+    """
+    일간 기록 한 구간 반영 (동기, asyncio.to_thread로 호출)
+    원본 스냅샷은 rank_data에서 읽기만 하고, 일간 기록과 처리 위치는 기본 DB에 저장
+    반환: {'range_end', 'rows', 'caught_up'} / 다른 곳에서 반영 중이거나 새 구간이 없으면 None
+    """
+    with SessionLocal() as db, RankSessionLocal() as rank_db:
+        if not rollup_state_exists(db):
+            # 처음에는 가장 오래된 스냅샷부터 반영 (다음 주기부터 여러 구간씩 따라잡음)
+            oldest = select_oldest_snapshot(rank_db)
+            insert_rollup_state(db, oldest - timedelta(seconds=1) if oldest else datetime.now(timezone.utc))
+            db.commit()
+
+        rollup_range = lock_rollup_range(db)
+        if rollup_range is None:
+            return None
+        rows = select_ranking_daily_rollup(rank_db, rollup_range['range_start'], rollup_range['range_end'])
+        upsert_rank_daily_history(db, rows)
+        upsert_rank_character_names(db, rows)
+        update_rollup_state(db, rollup_range['range_end'])
+        db.commit()
+        return {
+            'range_end': rollup_range['range_end'],
+            'rows': len(rows),
+            'caught_up': rollup_range['caught_up']
+        }
+
+
+def fetch_character_history(server, character, days):
+    """캐릭터 일간 기록 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return select_character_daily_history(db, server, character, days)
+
+
+def fetch_all_rank_watches():
+    """전체 관심 캐릭터 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return select_all_rank_watches(db)
+
+
+def fetch_rank_watchlist(guild_id):
+    """서버(길드)의 관심 캐릭터 목록 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return select_rank_watchlist(db, guild_id)
+
+
+def save_rank_watch(guild_id, server, character, user_id):
+    """관심 캐릭터 저장, 새로 추가됐으면 True (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        added = insert_rank_watch(db, guild_id, server, character, user_id)
+        db.commit()
+        return added
+
+
+def discard_rank_watch(guild_id, server, character):
+    """관심 캐릭터 삭제, 삭제됐으면 True (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        deleted = delete_rank_watch(db, guild_id, server, character)
+        db.commit()
+        return deleted
+
+
+def fetch_rank_notify_channels():
+    """순위 변동 알림 채널 설정 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        return select_rank_notify_channels(db)
+
+
+def save_rank_notify_channel(guild_id, channel_id, min_change):
+    """순위 변동 알림 채널 저장, channel_id가 None이면 알림 끔 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        if channel_id is None:
+            delete_rank_notify_channel(db, guild_id)
+        else:
+            upsert_rank_notify_channel(db, guild_id, channel_id, min_change)
+        db.commit()
+
+
+def save_rank_notified_at(guild_ids, until):
+    """순위 변동 알림 위치 저장 (동기, asyncio.to_thread로 호출)"""
+    with SessionLocal() as db:
+        update_rank_notified_at(db, guild_ids, until)
+        db.commit()
+
+
+def fetch_rank_changes(characters, since, until):
+    """관심 캐릭터 순위 변동 (동기, asyncio.to_thread로 호출)"""
+    with RankSessionLocal() as db:
+        return select_rank_changes(db, characters, since, until)
+
+
+def format_lookup_error(result):
+    """조회 실패 응답 문구 (추천 이름이 있으면 함께 표시)"""
+    message = f"데이터 조회 실패: {result['error']}"
+    if result.get("suggestions"):
+        message += f"\n혹시 이 캐릭터를 찾으셨나요? {', '.join(result['suggestions'])}"
+    return message
+
+
+def parse_character_names(value):
+    """쉼표/공백으로 구분된 캐릭터 이름 목록 (입력 순서 유지, 중복 제거)"""
+    names = [name for name in re.split(r"[,\s]+", value) if name]
+    return list(dict.fromkeys(names))
+
+
+def parse_api_character(character_info):
+    """API 응답의 캐릭터 정보를 DB 조회 결과와 같은 키로 변환"""
+    # Ensure change_amount is treated as int for logic, API might return string or int
+    raw_change_amount = character_info.get("change") or character_info.get("change_amount", 0)
+    try:
+        change_amount = int(raw_change_amount)
+    except ValueError:
+        change_amount = 0 # Default to 0 if conversion fails
+        logger.warning(f"Could not convert change_amount '{raw_change_amount}' to int. Defaulting to 0.")
+
+    return {
+        "character_name": character_info.get("character") or character_info.get("character_name", "알 수 없음"),
+        "server_name": character_info.get("server") or character_info.get("server_name", "알 수 없음"),
+        "class_name": character_info.get("class") or character_info.get("class_name", "알 수 없음"),
+        "rank_position": character_info.get("rank") or character_info.get("rank_position", "알 수 없음"),
+        "power_value": character_info.get("power") or character_info.get("power_value", "알 수 없음"),
+        "change_amount": change_amount,
+        "change_type": character_info.get("change_type", "none")
+    }
+
+
 # 랭크 조회를 위한 모달 클래스
 class RankModal(discord.ui.Modal, title='캐릭터 랭킹 조회'):
     server = discord.ui.TextInput(
@@ -26,135 +251,442 @@ class RankModal(discord.ui.Modal, title='캐릭터 랭킹 조회'):
         required=True,
         max_length=30
     )
+
+    def __init__(self, cog):
+        super().__init__()
+        self.cog = cog
     
     async def on_submit(self, interaction: discord.Interaction):
-        # 응답 지연 설정
-        await interaction.response.defer(ephemeral=False, thinking=True)
+        await self.cog.send_rank(interaction, self.server.value.strip(), self.character.value.strip())
+
+
+class Rank(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.api_client = RankAPIClient(settings.RANK_API_URL)
+
+        # 랭크 조회 결과 캐시 {(서버, 캐릭터): {'rank', 'source'} 또는 {'error', 'source'}}
+        self.rank_cache = TTLCache(ttl=RANK_CACHE_TTL, maxsize=RANK_CACHE_SIZE)
+        self.rank_flight = SingleFlight()
+        self.rank_stats = {
+            'hits': 0,          # 캐시에서 바로 응답
+            'misses': 0,        # DB/API 조회 발생
+            'coalesced': 0,     # 진행 중인 같은 조회에 합류
+            'negative_hits': 0, # 없는 캐릭터 캐시 적중
+            'db_hits': 0,       # DB(15분 이내)에서 찾음
+            'api_calls': 0,     # API 요청 발생
+            'api_saved': 0,     # 캐시/합류로 아낀 API 요청
+            'unknown_names': 0, # 랭킹에 없는 이름이라 API 요청 없이 응답
+            'prefetched': 0     # 관심 캐릭터 미리 조회
+        }
+
+        # 자동완성 검색 결과 캐시 {(서버, 입력값): [이름]}, 서버 목록 캐시
+        self.name_search_cache = TTLCache(ttl=NAME_SEARCH_CACHE_TTL, maxsize=2000)
+        self.server_list_cache = TTLCache(ttl=SERVER_LIST_CACHE_TTL, maxsize=1)
+
+        # 순위표 캐시 {서버: (스냅샷 시각, 클래스 목록)}, {(서버, 클래스, 스냅샷 시각, 시작 커서): 페이지}
+        self.snapshot_cache = TTLCache(ttl=LEADERBOARD_CACHE_TTL, maxsize=64)
+        self.leaderboard_cache = TTLCache(ttl=LEADERBOARD_CACHE_TTL, maxsize=1000)
+
+        # 관심 캐릭터 {(서버, 캐릭터): {길드 ID}} - 미리 조회 대상
+        self.watchlist = {}
+
+        # 순위 변동 알림 {길드 ID: {'channel_id', 'min_change', 'last_notified_at'}}
+        self.notify_channels = {}
+
+    async def cog_load(self):
+        """코그 로드 시 랭크 API 연결 풀 생성"""
+        await self.api_client.start()
+        await self.load_watchlist()
+        await self.load_notify_channels()
+        self.rollup_rank_history.start()
+        self.prefetch_watchlist.start()
+        self.notify_rank_changes.start()
+
+    async def cog_unload(self):
+        """코그 언로드 시 연결 풀 정리"""
+        self.rollup_rank_history.cancel()
+        self.prefetch_watchlist.cancel()
+        self.notify_rank_changes.cancel()
+        await self.api_client.close()
         
-        # 입력값 가져오기
-        server = self.server.value
-        character = self.character.value
+    @tasks.loop(minutes=10)
+    async def rollup_rank_history(self):
+        """새로 수집된 스냅샷을 일간 기록에 반영 (마지막 처리 시각 이후만)"""
+        for _ in range(RANK_ROLLUP_MAX_BATCHES):
+            try:
+                result = await asyncio.to_thread(run_rank_rollup)
+            except Exception as e:
+                logger.error(f"랭킹 일간 기록 반영 중 오류: {e}")
+                return
+            if result is None:
+                return
+            logger.info(f"랭킹 일간 기록 반영: {result['rows']}개 (~{result['range_end']})")
+            if result['caught_up']:
+                return
+
+    async def load_watchlist(self):
+        """관심 캐릭터 목록 불러오기"""
+        try:
+            rows = await asyncio.to_thread(fetch_all_rank_watches)
+        except Exception as e:
+            logger.error(f"랭크 관심 캐릭터 로드 중 오류: {e}")
+            return
+
+        watchlist = {}
+        for row in rows:
+            watchlist.setdefault((row.server_name, row.character_name), set()).add(row.guild_id)
+        self.watchlist = watchlist
+        logger.info(f"랭크 관심 캐릭터 {len(watchlist)}명 로드됨")
+
+    async def load_notify_channels(self):
+        """순위 변동 알림 채널 설정 불러오기"""
+        try:
+            rows = await asyncio.to_thread(fetch_rank_notify_channels)
+        except Exception as e:
+            logger.error(f"랭크 알림 채널 로드 중 오류: {e}")
+            return
+        self.notify_channels = {
+            row.guild_id: {
+                'channel_id': int(row.channel_id),
+                'min_change': row.min_change,
+                'last_notified_at': row.last_notified_at
+            }
+            for row in rows
+        }
+        logger.info(f"랭크 알림 채널 {len(self.notify_channels)}개 로드됨")
+
+    @tasks.loop(minutes=RANK_NOTIFY_INTERVAL)
+    async def notify_rank_changes(self):
+        """
+        알림을 켠 서버의 관심 캐릭터 순위 변동을 모아 채널마다 한 번 전송
+        서버(길드)마다 저장된 마지막 알림 시각 이후 마지막 스냅샷과 그 이전 마지막 스냅샷을 비교
+        """
+        # 알림 위치는 DB 기준 (재시작/다른 인스턴스가 보낸 알림 반영)
+        await self.load_notify_channels()
+        until = datetime.now(timezone.utc) - RANK_NOTIFY_LAG
+        default_since = until - timedelta(minutes=RANK_NOTIFY_INTERVAL)
+
+        # 알림을 켠 서버가 보는 캐릭터를 비교 시작 시각별로 묶음 (보통 모든 서버가 같은 시각)
+        guild_characters = {}
+        for key, guild_ids in self.watchlist.items():
+            for guild_id in guild_ids:
+                if guild_id in self.notify_channels:
+                    guild_characters.setdefault(guild_id, []).append(key)
+        ranges = {}
+        for guild_id in self.notify_channels:
+            since = self.notify_channels[guild_id]['last_notified_at'] or default_since
+            if since < until:
+                ranges.setdefault(since, []).append(guild_id)
+
+        for since, guild_ids in ranges.items():
+            characters = list({key for guild_id in guild_ids for key in guild_characters.get(guild_id, ())})
+            try:
+                changes = await asyncio.to_thread(fetch_rank_changes, characters, since, until)
+            except Exception as e:
+                # 알림 위치를 옮기지 않으므로 다음 주기에 같은 구간부터 다시 비교
+                logger.error(f"랭크 변동 조회 중 오류: {e}")
+                continue
+
+            # 서버(길드)별로 나눠 채널마다 한 번 전송
+            digests = {}
+            for change in changes:
+                moved = abs(change['previous_rank'] - change['current_rank'])
+                for guild_id in self.watchlist.get((change['server_name'], change['character_name']), ()):
+                    notify = self.notify_channels.get(guild_id)
+                    if guild_id in guild_ids and moved >= notify['min_change']:
+                        digests.setdefault(guild_id, []).append(change)
+
+            # 알릴 변동이 없는 서버는 바로 알림 위치만 옮김
+            await self.advance_rank_notify(set(guild_ids) - set(digests), until)
+
+            for guild_id, guild_changes in digests.items():
+                channel_id = self.notify_channels[guild_id]['channel_id']
+                channel = self.bot.get_channel(channel_id)
+                if channel is None:
+                    # 보낼 곳이 없으므로 쌓아두지 않고 건너뜀
+                    logger.warning(f"랭크 알림 채널 {channel_id}를 찾을 수 없습니다.")
+                    await self.advance_rank_notify([guild_id], until)
+                    continue
+                try:
+                    await channel.send(embed=build_rank_digest_embed(guild_changes, since, until))
+                except discord.HTTPException as e:
+                    # 다음 주기에 이번 구간까지 포함해 다시 알림
+                    logger.error(f"랭크 알림 전송 중 오류 (채널 {channel_id}): {e}")
+                    continue
+                await self.advance_rank_notify([guild_id], until)
+            if digests:
+                logger.info(f"랭크 변동 알림: 변동 {len(changes)}명, 채널 {len(digests)}개")
+
+    async def advance_rank_notify(self, guild_ids, until):
+        """알림 위치를 until로 옮김 (저장에 실패하면 다음 주기에 같은 구간을 다시 알릴 수 있음)"""
+        if not guild_ids:
+            return
+        try:
+            await asyncio.to_thread(save_rank_notified_at, list(guild_ids), until)
+        except Exception as e:
+            logger.error(f"랭크 알림 위치 저장 중 오류: {e}")
+            return
+        for guild_id in guild_ids:
+            if guild_id in self.notify_channels:
+                self.notify_channels[guild_id]['last_notified_at'] = until
+
+    @notify_rank_changes.before_loop
+    async def before_notify_rank_changes(self):
+        """봇이 준비된 후 알림 시작 (채널 조회 필요)"""
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(minutes=RANK_PREFETCH_INTERVAL)
+    async def prefetch_watchlist(self):
+        """
+        관심 캐릭터 중 캐시가 없거나 다음 주기 전에 만료되는 캐릭터를 미리 조회
+        서버별로 묶어 DB를 한 번에 조회하고, 나머지는 작은 묶음으로 간격을 두고 API 조회
+        """
+        threshold = RANK_PREFETCH_INTERVAL * 60 + RANK_PREFETCH_MARGIN
+        stale = {}
+        for server, character in list(self.watchlist):
+            remaining = self.rank_cache.expires_in((server, character))
+            if remaining is None or remaining < threshold:
+                stale.setdefault(server, []).append(character)
+        if not stale:
+            return
+
+        refreshed = 0
+        for server, characters in stale.items():
+            for start in range(0, len(characters), RANK_PREFETCH_BATCH_SIZE):
+                if refreshed >= RANK_PREFETCH_MAX_PER_TICK:
+                    logger.info("랭크 미리 조회 한도 도달, 나머지는 다음 주기에 조회")
+                    return
+                batch = characters[start:start + RANK_PREFETCH_BATCH_SIZE]
+                try:
+                    await self.lookup_ranks(server, batch, refresh=True)
+                except Exception as e:
+                    logger.error(f"랭크 미리 조회 중 오류: {e}")
+                refreshed += len(batch)
+                self.rank_stats['prefetched'] += len(batch)
+                await asyncio.sleep(RANK_PREFETCH_BATCH_DELAY)
+        logger.info(f"랭크 관심 캐릭터 {refreshed}명 미리 조회")
+
+    async def lookup_rank(self, server, character):
+        """
+        캐릭터 랭킹 조회 (캐시 → DB → API)
+        같은 캐릭터를 동시에 조회하면 하나의 DB/API 요청을 공유
+        반환: {'rank': 조회 결과} 또는 {'error': 실패 사유} / 일시적인 API 오류는 RankAPIError
+        """
+        cache_key = (server, character)
+        cached = self.get_cached_rank(cache_key)
+        if cached is not None:
+            return cached
+
+        result, shared = await self.rank_flight.do(cache_key, self.fetch_rank, server, character)
+        if shared:
+            self.rank_stats['coalesced'] += 1
+            if result['source'] == 'api':
+                self.rank_stats['api_saved'] += 1
+        return result
+
+    def get_cached_rank(self, cache_key):
+        """캐시된 조회 결과 반환 (없으면 None)"""
+        cached = self.rank_cache.get(cache_key)
+        if cached is not None:
+            self.rank_stats['hits'] += 1
+            if cached.get('error'):
+                self.rank_stats['negative_hits'] += 1
+            if cached['source'] == 'api':
+                self.rank_stats['api_saved'] += 1
+        return cached
+
+    async def lookup_ranks(self, server, characters, refresh=False):
+        """
+        여러 캐릭터 랭킹 조회 (파티 단위)
+        캐시에 없는 캐릭터는 DB 쿼리 한 번으로 찾고, DB에도 없는 캐릭터만 동시 요청 수를 제한해 API 조회
+        refresh: 캐시를 건너뛰고 다시 조회 (관심 캐릭터 미리 조회)
+        반환: {캐릭터 이름: {'rank'} 또는 {'error'}} / API 오류는 해당 캐릭터의 error로 반환
+        """
+        results = {}
+        misses = []
+        for character in characters:
+            cached = None if refresh else self.get_cached_rank((server, character))
+            if cached is not None:
+                results[character] = cached
+            else:
+                misses.append(character)
+        if not misses:
+            return results
+
+        if not refresh:
+            self.rank_stats['misses'] += len(misses)
+        db_results = {}
+        try:
+            db_results = await asyncio.to_thread(fetch_recent_ranks, server, misses)
+        except Exception as e:
+            logger.error(f"Database query error: {str(e)}\n{traceback.format_exc()}")
+
+        for character, rank in db_results.items():
+            self.rank_stats['db_hits'] += 1
+            results[character] = self.cache_db_rank(server, character, rank)
+
+        semaphore = asyncio.Semaphore(RANK_BATCH_CONCURRENCY)
+
+        async def fetch_one(character):
+            async with semaphore:
+                try:
+                    # 같은 캐릭터를 조회 중인 요청이 있으면 그 결과를 공유
+                    result, shared = await self.rank_flight.do(
+                        (server, character), self.fetch_rank_from_api, server, character
+                    )
+                except RankAPIError as e:
+                    logger.error(f"API 요청 중 오류: {character} ({server}) {str(e)}")
+                    return character, {'error': str(e), 'source': 'api'}
+                except Exception as e:
+                    # 한 캐릭터의 예상치 못한 오류로 파티 전체 조회가 실패하지 않도록 해당 캐릭터만 오류 처리
+                    logger.error(f"랭크 조회 중 오류: {character} ({server}) {str(e)}\n{traceback.format_exc()}")
+                    return character, {'error': "랭킹 정보를 처리하지 못했습니다.", 'source': 'api'}
+                if shared and result['source'] == 'api':
+                    self.rank_stats['api_saved'] += 1
+                return character, result
+
+        db_misses = [character for character in misses if character not in results]
+        known = await self.filter_known_characters(server, db_misses)
+        unknown = [character for character in db_misses if character not in known]
+        if unknown:
+            # 추천 이름 검색은 캐릭터마다 DB 조회가 필요하므로 동시에 실행
+            rejected = await asyncio.gather(*[self.reject_unknown_character(server, character) for character in unknown])
+            results.update(zip(unknown, rejected))
+
+        api_misses = [character for character in db_misses if character in known]
+        if api_misses:
+            logger.info(f"파티 랭킹 API 조회: {server} {len(api_misses)}명 (캐시/DB {len(characters) - len(api_misses)}명)")
+            results.update(await asyncio.gather(*[fetch_one(character) for character in api_misses]))
+        return results
+
+    async def fetch_rank(self, server, character):
+        """DB에서 최근 랭킹을 찾고 없으면 API 요청, 결과를 캐시에 저장"""
+        self.rank_stats['misses'] += 1
 
         db_result = None
         try:
-            RankSession = sessionmaker(autocommit=False, autoflush=False, bind=rank_engine)
-            with RankSession() as db:
-                # 데이터베이스에서 캐릭터 랭킹 정보 조회 15분 이내 갱신된 데이터만
-                query = text("""
-                    SELECT
-                        character_name
-                        , server_name
-                        , class_name
-                        , TO_CHAR(rank_position, 'FM999,999,999') || '위' AS rank_position
-                        , TO_CHAR(power_value, 'FM999,999,999') AS power_value
-                        , change_amount
-                        , change_type
-                    FROM mabinogi_ranking
-                    WHERE server_name = :server 
-                    AND character_name = :character
-                    AND retrieved_at >= NOW() - INTERVAL '15 minutes'
-                    ORDER BY retrieved_at DESC
-                    LIMIT 1
-                """)
-                result = db.execute(query, {"server": server, "character": character})
-                rank_data = result.fetchone()
-                
-                if rank_data:
-                    # 데이터베이스에서 정보 찾음
-                    logger.info(f"Found rank data in DB for {character} ({server})")
-                    # SQLAlchemy Row 객체를 안전하게 딕셔너리로 변환
-                    db_result = {column: value for column, value in rank_data._mapping.items()}
+            # 데이터베이스에서 캐릭터 랭킹 정보 조회 15분 이내 갱신된 데이터만 (이벤트 루프를 막지 않도록 스레드에서 실행)
+            db_result = await asyncio.to_thread(fetch_recent_rank, server, character)
         except Exception as e:
             logger.error(f"Database query error: {str(e)}\n{traceback.format_exc()}")
-        
+
         if db_result:
-            # character_info = db_result.get("character", {}) # This line seems unused if fields are directly accessed
-            character_name = db_result.get("character_name", "알 수 없음")
-            server_name = db_result.get("server_name", "알 수 없음")
-            class_name = db_result.get("class_name", "알 수 없음")
-            rank_position = db_result.get("rank_position", "알 수 없음")
-            power_value = db_result.get("power_value", "알 수 없음")
-            change_amount = db_result.get("change_amount", 0)
-            change_type = db_result.get("change_type", "none")
-
-            embed = _build_rank_embed(
-                character_name=character_name,
-                server_name=server_name,
-                class_name=class_name,
-                rank_position=str(rank_position), 
-                power_value=str(power_value),
-                change_amount=int(change_amount),
-                change_type=change_type,
-                footer_text="정보는 거의 실시간 조회 중입니다.(약간의 오차가 있을 수 있음)"
+            logger.info(f"Found rank data in DB for {character} ({server})")
+            self.rank_stats['db_hits'] += 1
+            return self.cache_db_rank(server, character, db_result)
+
+        # 랭킹에 한 번도 나온 적 없는 이름(오타 등)은 API를 부르지 않고 추천 이름으로 응답
+        if character not in await self.filter_known_characters(server, [character]):
+            return await self.reject_unknown_character(server, character)
+
+        return await self.fetch_rank_from_api(server, character)
+
+    def cache_db_rank(self, server, character, rank):
+        """
+        DB 조회 결과를 캐시에 저장 (수집 후 15분이 될 때까지만)
+        이미 수집된 지 오래된 데이터가 캐시에서 15분 더 살아있지 않도록 남은 시간만 TTL로 사용
+        """
+        age = float(rank.pop('age_seconds', 0) or 0)
+        result = {'rank': rank, 'source': 'db'}
+        ttl = RANK_CACHE_TTL - age
+        if ttl > 0:
+            self.rank_cache.set((server, character), result, ttl=ttl)
+        return result
+
+    async def filter_known_characters(self, server, characters):
+        """랭킹 데이터에 있는 캐릭터만 반환 (DB 오류 시에는 모두 통과시켜 API로 확인)"""
+        if not characters:
+            return set()
+        try:
+            return await asyncio.to_thread(fetch_known_characters, server, characters)
+        except Exception as e:
+            logger.error(f"Database query error: {str(e)}\n{traceback.format_exc()}")
+            return set(characters)
+
+    async def reject_unknown_character(self, server, character):
+        """랭킹에 없는 캐릭터 응답 (비슷한 이름 추천, 짧게 캐시)"""
+        self.rank_stats['unknown_names'] += 1
+        suggestions = []
+        try:
+            suggestions = await self.search_names(server, character, SUGGESTION_LIMIT)
+        except Exception as e:
+            logger.error(f"캐릭터 이름 검색 중 오류: {str(e)}")
+
+        logger.info(f"랭킹에 없는 캐릭터: {character} ({server}), 추천 {len(suggestions)}개")
+        result = {'error': "랭킹에 없는 캐릭터입니다.", 'suggestions': suggestions, 'source': 'db'}
+        self.rank_cache.set((server, character), result, ttl=RANK_NEGATIVE_CACHE_TTL)
+        return result
+
+    async def search_names(self, server, query, limit=AUTOCOMPLETE_LIMIT):
+        """캐릭터 이름 검색 (짧은 캐시)"""
+        cache_key = (server, query, limit)
+        names = self.name_search_cache.get(cache_key)
+        if names is None:
+            names = await asyncio.to_thread(fetch_character_names, server, query, limit)
+            self.name_search_cache.set(cache_key, names)
+        return names
+
+    async def get_rank_servers(self):
+        """서버 목록 (1시간 캐시)"""
+        servers = self.server_list_cache.get('servers')
+        if servers is None:
+            servers = await asyncio.to_thread(fetch_rank_servers)
+            self.server_list_cache.set('servers', servers)
+        return servers
+
+    async def get_leaderboard_snapshot(self, server):
+        """서버의 최신 스냅샷 시각과 클래스 목록 (짧은 캐시)"""
+        snapshot = self.snapshot_cache.get(server)
+        if snapshot is None:
+            snapshot = await asyncio.to_thread(fetch_leaderboard_snapshot, server)
+            self.snapshot_cache.set(server, snapshot)
+        return snapshot
+
+    async def get_leaderboard_page(self, server, class_name, snapshot_at, after):
+        """
+        순위표 한 페이지 (after = 이전 페이지 마지막 (순위, 이름) 다음부터)
+        반환: {'rows', 'has_next'} / 같은 스냅샷의 같은 페이지는 캐시에서 응답
+        """
+        cache_key = (server, class_name, snapshot_at, after)
+        page = self.leaderboard_cache.get(cache_key)
+        if page is None:
+            # 다음 페이지가 있는지 알기 위해 1개 더 조회
+            rows = await asyncio.to_thread(
+                fetch_leaderboard_page, server, snapshot_at, after, class_name, LEADERBOARD_PAGE_SIZE + 1
             )
+            page = {'rows': rows[:LEADERBOARD_PAGE_SIZE], 'has_next': len(rows) > LEADERBOARD_PAGE_SIZE}
+            self.leaderboard_cache.set(cache_key, page)
+        return page
+
+    async def send_rank(self, interaction: discord.Interaction, server, character):
+        """캐릭터 랭킹 조회 후 응답 (/랭크 명령어와 모달 공용)"""
+        # 응답 지연 설정
+        await interaction.response.defer(ephemeral=False, thinking=True)
 
-            # 메시지 전송
-            await interaction.followup.send(embed=embed)
-            return
-        
-        
-        # API 요청 데이터 준비
-        data = {
-            "server": server,
-            "character": character
-        }
-        
         try:
-            # API 요청 보내기
-            async with aiohttp.ClientSession() as session:
-                # 타임아웃 값을 30초로 늘려서 API 응답 대기 시간 연장
-                async with session.post(settings.RANK_API_URL, json=data, timeout=30) as response:
-                    if response.status != 200:
-                        await interaction.followup.send(f"API 요청 실패: {response.status}")
-                        return
-                    
-                    result = await response.json()
-                    
-                    if not result.get("success"):
-                        error_msg = result.get('message', '알 수 없는 오류')
-                        await interaction.followup.send(
-                            f"데이터 조회 실패: {error_msg}\n\n" + 
-                            "서버명과 캐릭터명을 정확하게 입력했는지 확인해주세요."
-                        )
-                        return
-                    
-                    # 캐릭터 정보 추출 및 키 매핑
-                    character_info = result.get("character", {})
-                    character_name = character_info.get("character") or character_info.get("character_name", "알 수 없음")
-                    server_name = character_info.get("server") or character_info.get("server_name", "알 수 없음")
-                    class_name = character_info.get("class") or character_info.get("class_name", "알 수 없음")
-                    rank_position = character_info.get("rank") or character_info.get("rank_position", "알 수 없음")
-                    power_value = character_info.get("power") or character_info.get("power_value", "알 수 없음")
-                    # Ensure change_amount is treated as int for logic, API might return string or int
-                    raw_change_amount = character_info.get("change") or character_info.get("change_amount", 0)
-                    try:
-                        change_amount = int(raw_change_amount)
-                    except ValueError:
-                        change_amount = 0 # Default to 0 if conversion fails
-                        logger.warning(f"Could not convert change_amount '{raw_change_amount}' to int. Defaulting to 0.")
-
-                    change_type = character_info.get("change_type", "none")
-                    
-                    embed = _build_rank_embed(
-                        character_name=character_name,
-                        server_name=server_name,
-                        class_name=class_name,
-                        rank_position=str(rank_position), # Ensure string for display
-                        power_value=str(power_value),     # Ensure string for display
-                        change_amount=change_amount,      # Already int
-                        change_type=change_type,
-                        footer_text="정보는 거의 실시간 조회 중입니다.(약간의 오차가 있을 수 있음)"
-                    )
-                    
-                    # 메시지 전송
-                    await interaction.followup.send(embed=embed)
-        
-        except aiohttp.ClientError as e:
+            # 캐시 → DB(15분 이내) → API 순서로 조회
+            result = await self.lookup_rank(server, character)
+
+            if result.get("error"):
+                await interaction.followup.send(
+                    format_lookup_error(result) + "\n\n" +
+                    "서버명과 캐릭터명을 정확하게 입력했는지 확인해주세요."
+                )
+                return
+
+            # 메시지 전송
+            await interaction.followup.send(embed=build_character_embed(result["rank"]))
+
+        except RankAPIError as e:
             logger.error(f"API 요청 중 오류: {str(e)}")
-            await interaction.followup.send(
-                f"API 서버 연결 중 오류가 발생했습니다: {str(e)}\n" +
-                "잠시 후 다시 시도해주세요."
-            )
+            if e.status:
+                await interaction.followup.send(str(e))
+            else:
+                await interaction.followup.send(
+                    f"API 서버 연결 중 오류가 발생했습니다: {str(e)}\n" +
+                    "잠시 후 다시 시도해주세요."
+                )
         except Exception as e:
             logger.error(f"처리 중 오류: {str(e)}\n{traceback.format_exc()}")
             await interaction.followup.send(
@@ -162,15 +694,36 @@ class RankModal(discord.ui.Modal, title='캐릭터 랭킹 조회'):
                 "서버명과 캐릭터명을 정확하게 입력했는지 확인해주세요."
             )
 
-class Rank(commands.Cog):
-    def __init__(self, bot):
-        self.bot = bot
-        
+    async def fetch_rank_from_api(self, server, character):
+        """API로 랭킹 조회 후 캐시에 저장"""
+        cache_key = (server, character)
+
+        # API 요청 보내기 (코그의 공용 클라이언트, 연결 재사용/재시도) - 일시 오류는 캐시하지 않음
+        self.rank_stats['api_calls'] += 1
+        response = await self.api_client.fetch_character(server, character)
+
+        if not response.get("success"):
+            # 없는 캐릭터/오타는 짧게 캐시해서 같은 잘못된 이름으로 API를 반복 호출하지 않음
+            result = {'error': response.get('message', '알 수 없는 오류'), 'source': 'api'}
+            self.rank_cache.set(cache_key, result, ttl=RANK_NEGATIVE_CACHE_TTL)
+            return result
+
+        result = {'rank': parse_api_character(response.get("character", {})), 'source': 'api'}
+        self.rank_cache.set(cache_key, result)
+        return result
+
     @app_commands.command(name="랭크", description="캐릭터의 랭킹 정보를 조회합니다")
-    async def rank(self, interaction: discord.Interaction):
+    @app_commands.describe(서버="서버 이름 (비우면 입력창 표시)", 캐릭터="캐릭터 이름 (입력하면 이름 추천)")
+    async def rank(self, interaction: discord.Interaction, 서버: Optional[str] = None, 캐릭터: Optional[str] = None):
+        if 서버 and 캐릭터:
+            await self.send_rank(interaction, 서버.strip(), 캐릭터.strip())
+            return
+
         try:
             # 모달 표시
-            modal = RankModal()
+            modal = RankModal(self)
+            if 서버:
+                modal.server.default = 서버
             await interaction.response.send_modal(modal)
         except discord.errors.NotFound as e:
             # 상호작용이 이미 만료된 경우 처리
@@ -192,5 +745,317 @@ class Rank(commands.Cog):
                 # 이미 응답했거나 상호작용이 만료된 경우 무시
                 pass
 
+    @rank.autocomplete('서버')
+    async def server_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        try:
+            servers = await self.get_rank_servers()
+        except Exception as e:
+            logger.error(f"서버 목록 조회 중 오류: {str(e)}")
+            return []
+        return [app_commands.Choice(name=server, value=server) for server in servers if current in server][:AUTOCOMPLETE_LIMIT]
+
+    @rank.autocomplete('캐릭터')
+    async def character_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        server = (interaction.namespace.서버 or "").strip()
+        current = current.strip()
+        if not server or not current:
+            return []
+        try:
+            names = await self.search_names(server, current)
+        except Exception as e:
+            logger.error(f"캐릭터 이름 검색 중 오류: {str(e)}")
+            return []
+        return [app_commands.Choice(name=name, value=name) for name in names]
+
+    @app_commands.command(name="랭킹순위표", description="서버/클래스별 랭킹 순위표를 확인합니다")
+    @app_commands.describe(서버="서버 이름", 클래스="클래스 이름 (비우면 전체)")
+    async def leaderboard(self, interaction: discord.Interaction, 서버: str, 클래스: Optional[str] = None):
+        server = 서버.strip()
+        class_name = 클래스.strip() if 클래스 and 클래스.strip() else None
+
+        await interaction.response.defer(ephemeral=False, thinking=True)
+        try:
+            snapshot_at, classes = await self.get_leaderboard_snapshot(server)
+            if snapshot_at is None:
+                await interaction.followup.send(f"{server} 서버의 랭킹 데이터가 없습니다. 서버 이름을 확인해주세요.")
+                return
+            if class_name and class_name not in classes:
+                await interaction.followup.send(f"{server} 서버에 {class_name} 클래스 랭킹이 없습니다.")
+                return
+
+            # 페이지를 넘기는 동안 같은 스냅샷을 보도록 시각을 고정
+            async def fetch_page(after):
+                return await self.get_leaderboard_page(server, class_name, snapshot_at, after)
+
+            first_page = await fetch_page(LeaderboardView.FIRST_CURSOR)
+            view = LeaderboardView(interaction.user.id, server, class_name, snapshot_at, fetch_page, first_page)
+            view.message = await interaction.followup.send(embed=view.embed, view=view, wait=True)
+        except Exception as e:
+            logger.error(f"랭킹 순위표 조회 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.followup.send(
+                f"데이터 처리 중 오류가 발생했습니다: {str(e)}\n" +
+                "잠시 후 다시 시도해주세요."
+            )
+
+    @leaderboard.autocomplete('서버')
+    async def leaderboard_server_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.server_autocomplete(interaction, current)
+
+    @leaderboard.autocomplete('클래스')
+    async def leaderboard_class_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        server = (interaction.namespace.서버 or "").strip()
+        if not server:
+            return []
+        try:
+            _, classes = await self.get_leaderboard_snapshot(server)
+        except Exception as e:
+            logger.error(f"클래스 목록 조회 중 오류: {str(e)}")
+            return []
+        return [app_commands.Choice(name=name, value=name) for name in classes if current in name][:AUTOCOMPLETE_LIMIT]
+
+    @app_commands.command(name="랭크추이", description="캐릭터의 전투력/순위 변화를 확인합니다")
+    @app_commands.describe(서버="서버 이름", 캐릭터="캐릭터 이름", 기간="조회할 일수 (기본 30일)")
+    async def rank_trend(self, interaction: discord.Interaction, 서버: str, 캐릭터: str,
+                         기간: app_commands.Range[int, 7, 180] = 30):
+        server = 서버.strip()
+        character = 캐릭터.strip()
+
+        await interaction.response.defer(ephemeral=False, thinking=True)
+        try:
+            history = await asyncio.to_thread(fetch_character_history, server, character, 기간)
+            if not history:
+                await interaction.followup.send(
+                    f"{character} ({server})의 랭킹 기록이 없습니다.\n" +
+                    "서버명과 캐릭터명을 정확하게 입력했는지 확인해주세요."
+                )
+                return
+            await interaction.followup.send(embed=build_trend_embed(server, character, history, 기간))
+        except Exception as e:
+            logger.error(f"랭크 추이 조회 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.followup.send(
+                f"데이터 처리 중 오류가 발생했습니다: {str(e)}\n" +
+                "잠시 후 다시 시도해주세요."
+            )
+
+    @rank_trend.autocomplete('서버')
+    async def trend_server_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.server_autocomplete(interaction, current)
+
+    @rank_trend.autocomplete('캐릭터')
+    async def trend_character_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        return await self.character_autocomplete(interaction, current)
+
+    @app_commands.command(name="랭크관심추가", description="서버 관심 캐릭터에 추가합니다 (랭킹을 미리 조회해 둠)")
+    @app_commands.describe(서버="서버 이름", 캐릭터="캐릭터 이름")
+    async def add_rank_watch(self, interaction: discord.Interaction, 서버: str, 캐릭터: str):
+        if interaction.guild is None:
+            await interaction.response.send_message("서버에서만 사용할 수 있는 명령어입니다.", ephemeral=True)
+            return
+        server = 서버.strip()
+        character = 캐릭터.strip()
+        guild_id = str(interaction.guild.id)
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            # 랭킹에 있는 캐릭터만 등록 (오타로 API를 반복 호출하지 않도록)
+            if character not in await self.filter_known_characters(server, [character]):
+                result = await self.reject_unknown_character(server, character)
+                await interaction.followup.send(format_lookup_error(result), ephemeral=True)
+                return
+
+            watched = sum(1 for guild_ids in self.watchlist.values() if guild_id in guild_ids)
+            if watched >= RANK_WATCH_MAX_PER_GUILD:
+                await interaction.followup.send(f"관심 캐릭터는 서버당 최대 {RANK_WATCH_MAX_PER_GUILD}명까지 등록할 수 있습니다.", ephemeral=True)
+                return
+
+            added = await asyncio.to_thread(save_rank_watch, guild_id, server, character, interaction.user.id)
+        except Exception as e:
+            logger.error(f"랭크 관심 캐릭터 추가 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.followup.send("관심 캐릭터 추가 중 오류가 발생했습니다.", ephemeral=True)
+            return
+
+        self.watchlist.setdefault((server, character), set()).add(guild_id)
+        if added:
+            logger.info(f"랭크 관심 캐릭터 추가: {character} ({server}) guild={guild_id}")
+            await interaction.followup.send(f"✅ {character} ({server})을(를) 관심 캐릭터에 추가했습니다.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"{character} ({server})은(는) 이미 관심 캐릭터입니다.", ephemeral=True)
+
+    @app_commands.command(name="랭크관심삭제", description="서버 관심 캐릭터에서 삭제합니다")
+    @app_commands.describe(서버="서버 이름", 캐릭터="캐릭터 이름")
+    async def remove_rank_watch(self, interaction: discord.Interaction, 서버: str, 캐릭터: str):
+        if interaction.guild is None:
+            await interaction.response.send_message("서버에서만 사용할 수 있는 명령어입니다.", ephemeral=True)
+            return
+        server = 서버.strip()
+        character = 캐릭터.strip()
+        guild_id = str(interaction.guild.id)
+
+        try:
+            deleted = await asyncio.to_thread(discard_rank_watch, guild_id, server, character)
+        except Exception as e:
+            logger.error(f"랭크 관심 캐릭터 삭제 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.response.send_message("관심 캐릭터 삭제 중 오류가 발생했습니다.", ephemeral=True)
+            return
+
+        # 다른 서버에서도 보고 있지 않으면 미리 조회 대상에서 제외
+        guild_ids = self.watchlist.get((server, character))
+        if guild_ids is not None:
+            guild_ids.discard(guild_id)
+            if not guild_ids:
+                del self.watchlist[(server, character)]
+
+        if deleted:
+            await interaction.response.send_message(f"🗑️ {character} ({server})을(를) 관심 캐릭터에서 삭제했습니다.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"{character} ({server})은(는) 관심 캐릭터가 아닙니다.", ephemeral=True)
+
+    @remove_rank_watch.autocomplete('캐릭터')
+    async def watched_character_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        if interaction.guild is None:
+            return []
+        guild_id = str(interaction.guild.id)
+        server = (interaction.namespace.서버 or "").strip()
+        names = sorted(
+            character for (watch_server, character), guild_ids in self.watchlist.items()
+            if guild_id in guild_ids and (not server or watch_server == server) and current in character
+        )
+        return [app_commands.Choice(name=name, value=name) for name in names[:AUTOCOMPLETE_LIMIT]]
+
+    @is_super_user()
+    @app_commands.command(name="랭크알림설정", description="관심 캐릭터 순위 변동 알림 채널을 설정합니다 (채널을 비우면 알림 끔)")
+    @app_commands.describe(채널="알림을 받을 채널 (비우면 알림 끔)", 최소변동="이 값 이상 순위가 움직였을 때만 알림 (기본 1)")
+    async def set_rank_notify(self, interaction: discord.Interaction, 채널: Optional[discord.TextChannel] = None,
+                              최소변동: app_commands.Range[int, 1, 100000] = 1):
+        if interaction.guild is None:
+            await interaction.response.send_message("서버에서만 사용할 수 있는 명령어입니다.", ephemeral=True)
+            return
+        guild_id = str(interaction.guild.id)
+
+        try:
+            await asyncio.to_thread(save_rank_notify_channel, guild_id, 채널.id if 채널 else None, 최소변동)
+        except Exception as e:
+            logger.error(f"랭크 알림 설정 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.response.send_message("알림 설정 중 오류가 발생했습니다.", ephemeral=True)
+            return
+
+        if 채널 is None:
+            self.notify_channels.pop(guild_id, None)
+            await interaction.response.send_message("🔕 관심 캐릭터 순위 변동 알림을 껐습니다.", ephemeral=True)
+            return
+
+        last_notified_at = self.notify_channels.get(guild_id, {}).get('last_notified_at')
+        self.notify_channels[guild_id] = {'channel_id': 채널.id, 'min_change': 최소변동, 'last_notified_at': last_notified_at}
+        await interaction.response.send_message(
+            f"🔔 {채널.mention}에 관심 캐릭터 순위 변동을 {RANK_NOTIFY_INTERVAL}분마다 모아서 알립니다. "
+            f"(최소 변동 {최소변동}위)",
+            ephemeral=True
+        )
+
+    @set_rank_notify.error
+    async def set_rank_notify_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        """랭크 알림 설정 중 오류 처리"""
+        if isinstance(error, app_commands.errors.CheckFailure):
+            await interaction_response(interaction, "이 명령어는 봇 운영자만 사용할 수 있습니다.")
+        else:
+            logger.error(f"랭크 알림 설정 중 오류: {error}")
+            await interaction_response(interaction, "명령어 실행 중 오류가 발생했습니다.")
+
+    @app_commands.command(name="랭크관심목록", description="서버 관심 캐릭터의 랭킹을 확인합니다")
+    async def list_rank_watch(self, interaction: discord.Interaction):
+        if interaction.guild is None:
+            await interaction.response.send_message("서버에서만 사용할 수 있는 명령어입니다.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=False, thinking=True)
+        try:
+            watches = await asyncio.to_thread(fetch_rank_watchlist, interaction.guild.id)
+            if not watches:
+                await interaction.followup.send("등록된 관심 캐릭터가 없습니다. `/랭크관심추가`로 추가해주세요.")
+                return
+
+            # 서버별로 묶어 조회 (미리 조회된 캐릭터는 캐시에서 바로 응답)
+            by_server = {}
+            for watch in watches:
+                by_server.setdefault(watch['server_name'], []).append(watch['character_name'])
+            results = {}
+            for server, characters in by_server.items():
+                for character, result in (await self.lookup_ranks(server, characters)).items():
+                    results[(server, character)] = result
+
+            pages = build_party_rank_pages([
+                (watch['server_name'], watch['character_name'], results[(watch['server_name'], watch['character_name'])])
+                for watch in watches
+            ])
+            view = PartyRankView(interaction.user.id, pages) if len(pages) > 1 else discord.utils.MISSING
+            message = await interaction.followup.send(embed=pages[0], view=view, wait=True)
+            if view is not discord.utils.MISSING:
+                view.message = message
+        except Exception as e:
+            logger.error(f"랭크 관심 캐릭터 조회 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.followup.send(
+                f"데이터 처리 중 오류가 발생했습니다: {str(e)}\n" +
+                "잠시 후 다시 시도해주세요."
+            )
+
+    @app_commands.command(name="파티랭크", description="여러 캐릭터의 랭킹 정보를 한 번에 조회합니다")
+    @app_commands.describe(서버="캐릭터들이 있는 서버 이름", 캐릭터="캐릭터 이름 (쉼표나 공백으로 구분, 최대 8명)")
+    async def party_rank(self, interaction: discord.Interaction, 서버: str, 캐릭터: str):
+        server = 서버.strip()
+        characters = parse_character_names(캐릭터)
+        if not characters:
+            await interaction.response.send_message("조회할 캐릭터 이름을 입력해주세요.", ephemeral=True)
+            return
+        if len(characters) > RANK_BATCH_MAX:
+            await interaction.response.send_message(f"한 번에 최대 {RANK_BATCH_MAX}명까지 조회할 수 있습니다.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=False, thinking=True)
+        try:
+            results = await self.lookup_ranks(server, characters)
+            pages = build_party_rank_pages([(server, character, results[character]) for character in characters])
+
+            view = PartyRankView(interaction.user.id, pages) if len(pages) > 1 else discord.utils.MISSING
+            message = await interaction.followup.send(embed=pages[0], view=view, wait=True)
+            if view is not discord.utils.MISSING:
+                view.message = message
+        except Exception as e:
+            logger.error(f"파티 랭킹 조회 중 오류: {str(e)}\n{traceback.format_exc()}")
+            await interaction.followup.send(
+                f"데이터 처리 중 오류가 발생했습니다: {str(e)}\n" +
+                "잠시 후 다시 시도해주세요."
+            )
+
+    @is_super_user()
+    @app_commands.command(name="랭크통계", description="랭크 API 요청 통계를 확인합니다")
+    async def rank_statistics(self, interaction: discord.Interaction):
+        stats = self.api_client.stats
+        latency = self.api_client.latency_summary()
+
+        cache = self.rank_stats
+        total = cache['hits'] + cache['misses'] + cache['coalesced']
+        hit_ratio = (cache['hits'] + cache['coalesced']) / total * 100 if total else 0
+
+        embed = discord.Embed(title="랭크 조회 통계", color=0x242429)
+        embed.add_field(name="조회", value=f"{total}회", inline=True)
+        embed.add_field(name="캐시 적중률", value=f"{hit_ratio:.1f}%", inline=True)
+        embed.add_field(name="캐시 항목", value=f"{len(self.rank_cache)}개", inline=True)
+        embed.add_field(name="캐시 적중", value=f"{cache['hits']}회 (없는 캐릭터 {cache['negative_hits']}회)", inline=True)
+        embed.add_field(name="동시 조회 합류", value=f"{cache['coalesced']}회", inline=True)
+        embed.add_field(name="DB 적중", value=f"{cache['db_hits']}회", inline=True)
+        embed.add_field(name="아낀 API 조회", value=f"{cache['api_saved']}회", inline=True)
+        embed.add_field(name="없는 이름 (API 생략)", value=f"{cache['unknown_names']}회", inline=True)
+        embed.add_field(name="관심 캐릭터", value=f"{len(self.watchlist)}명 (미리 조회 {cache['prefetched']}회)", inline=True)
+        embed.add_field(name="API 요청", value=f"{stats['requests']}회", inline=True)
+        embed.add_field(name="재시도", value=f"{stats['retries']}회", inline=True)
+        embed.add_field(name="실패", value=f"{stats['failures']}회", inline=True)
+        if latency:
+            embed.add_field(
+                name=f"API 응답 시간 (최근 {latency['count']}건)",
+                value=f"p50 {latency['p50']:.2f}초 / p95 {latency['p95']:.2f}초 / 최대 {latency['max']:.2f}초",
+                inline=False
+            )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Rank(bot))
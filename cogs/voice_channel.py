@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 
 from db.session import SessionLocal
 from core.utils import interaction_response, interaction_followup
-from queries.channel_query import select_voice_channels
+from queries.channel_query import select_voice_channels, select_all_voice_channels
 from queries.recruitment_query import select_recruitment, select_participants
 from queries.thread_query import update_complete_recruitment, select_complete_thread
 
@@ -17,6 +17,39 @@ class VoiceChannelCog(commands.Cog):
         self.bot = bot
         self.temp_channels = {}  # 임시 채널 저장: {channel_id: {"owner": user_id, "thread_id": thread_id, "recru_id": recru_id}}
         self.user_channels = {}  # 사용자별 채널 매핑: {user_id: channel_id}
+        # 부모 음성채널 캐시: {guild_id: {channel_id}} (정수 ID, /음성채널설정에서 갱신)
+        self.parent_voice_channels = {}
+        self.parent_voice_channels_loaded = False
+
+    async def cog_load(self):
+        """코그 로드 시 전체 길드의 부모 음성채널 캐시 채우기"""
+        try:
+            with SessionLocal() as db:
+                rows = select_all_voice_channels(db)
+        except Exception as e:
+            # 실패하면 길드별로 처음 입장할 때 조회
+            logger.error(f"부모 음성채널 캐시 로드 중 오류: {e}")
+            return
+
+        parent_voice_channels = {}
+        for guild_id, channel_id in rows:
+            parent_voice_channels.setdefault(int(guild_id), set()).add(int(channel_id))
+        self.parent_voice_channels = parent_voice_channels
+        self.parent_voice_channels_loaded = True
+        logger.info(f"부모 음성채널 캐시 로드: 길드 {len(parent_voice_channels)}개")
+
+    def get_parent_voice_channels(self, guild_id):
+        """길드의 부모 음성채널 ID 집합 (캐시 로드 실패 시에만 DB 조회)"""
+        channel_ids = self.parent_voice_channels.get(guild_id)
+        if channel_ids is None and not self.parent_voice_channels_loaded:
+            with SessionLocal() as db:
+                channel_ids = {int(ch_id) for ch_id in select_voice_channels(db, guild_id)}
+            self.parent_voice_channels[guild_id] = channel_ids
+        return channel_ids or set()
+
+    def set_parent_voice_channels(self, guild_id, channel_ids):
+        """/음성채널설정 저장 후 부모 음성채널 캐시 갱신"""
+        self.parent_voice_channels[int(guild_id)] = {int(ch_id) for ch_id in channel_ids}
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
@@ -46,31 +79,25 @@ class VoiceChannelCog(commands.Cog):
             # 추가 로깅
             # logger.info(f"음성 채널 입장 처리 시작: 사용자 {member.display_name}, 채널 {channel.name} ({channel.id})")
             
-            with SessionLocal() as db:
-                # 부모 음성채널 ID 목록 조회 (새 테이블에서)
-                # logger.info(f"부모 음성채널 ID 목록 조회 시작: 길드 ID {member.guild.id}")
-                parent_voice_ch_ids = select_voice_channels(db, member.guild.id)
-                # logger.info(f"부모 음성채널 ID 목록 조회 결과: {parent_voice_ch_ids}")
-                
-                # 입장한 채널이 부모 음성채널 중 하나인지 확인
-                if str(channel.id) in parent_voice_ch_ids:
-                    # logger.info(f"채널 {channel.id}는 부모 음성채널입니다. 임시 채널 생성 절차 시작.")
-                    
-                    # 이미 임시 채널이 있는지 확인
-                    if member.id in self.user_channels:
-                        existing_channel_id = self.user_channels[member.id]
-                        existing_channel = member.guild.get_channel(int(existing_channel_id))
-                        if existing_channel:
-                            logger.info(f"사용자 {member.display_name}의 기존 임시 채널 발견: {existing_channel.name}")
-                            # 기존 임시 채널로 이동
-                            await member.move_to(existing_channel)
-                            return
-                    
-                    # 임시 채널 생성
-                    # logger.info(f"새 임시 채널 생성 시작: 사용자 {member.display_name}, 부모 채널 ID {channel.id}")
-                    await self.create_temp_voice_channel(member, str(channel.id))
-                else:
-                    logger.info(f"채널 {channel.id}는 부모 음성채널이 아닙니다. 설정된 부모 채널: {parent_voice_ch_ids}")
+            # 입장한 채널이 부모 음성채널 중 하나인지 확인 (캐시된 정수 ID 집합, 대부분의 입장은 여기서 끝남)
+            if channel.id not in self.get_parent_voice_channels(member.guild.id):
+                return
+
+            # logger.info(f"채널 {channel.id}는 부모 음성채널입니다. 임시 채널 생성 절차 시작.")
+
+            # 이미 임시 채널이 있는지 확인
+            if member.id in self.user_channels:
+                existing_channel_id = self.user_channels[member.id]
+                existing_channel = member.guild.get_channel(int(existing_channel_id))
+                if existing_channel:
+                    logger.info(f"사용자 {member.display_name}의 기존 임시 채널 발견: {existing_channel.name}")
+                    # 기존 임시 채널로 이동
+                    await member.move_to(existing_channel)
+                    return
+
+            # 임시 채널 생성
+            # logger.info(f"새 임시 채널 생성 시작: 사용자 {member.display_name}, 부모 채널 ID {channel.id}")
+            await self.create_temp_voice_channel(member, str(channel.id))
         except Exception as e:
             logger.error(f"음성 채널 입장 처리 중 오류 발생: {str(e)}")
 
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """만료 시간(TTL)과 최대 크기를 가진 간단한 LRU 캐시"""
+
+    def __init__(self, ttl, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()  # {key: (만료 시각, 값)}
+
+    def get(self, key, default=None):
+        """키에 해당하는 값 조회 (만료된 항목은 제거 후 default 반환)"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expire_at, value = item
+        if expire_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        """값 저장 (ttl 미지정 시 기본 TTL 사용)"""
+        expire_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+
+        # 최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def expires_in(self, key):
+        """남은 유효 시간 (초), 없거나 만료된 키는 None"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        remaining = item[0] - time.monotonic()
+        return remaining if remaining > 0 else None
+
+    def pop(self, key, default=None):
+        """키 삭제 후 값 반환"""
+        item = self._data.pop(key, None)
+        return item[1] if item else default
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 비동기 작업을 하나로 합치는 도우미
+    먼저 들어온 요청만 실제로 실행하고 나머지는 그 결과를 함께 받음
+    """
+
+    def __init__(self):
+        self._calls = {}  # {key: asyncio.Task}
+
+    def __contains__(self, key):
+        return key in self._calls
+
+    async def do(self, key, func, *args, **kwargs):
+        """
+        func(*args, **kwargs) 실행 결과 반환
+        반환: (결과, 다른 요청의 결과를 공유했는지 여부)
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            # 대기 중인 요청 하나가 취소되어도 공유 작업은 계속 진행
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(func(*args, **kwargs))
+        self._calls[key] = task
+        task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task), False
@@ -24,6 +24,22 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     DEEPSEEK_API_KEY: str
 
+    # 요약 LLM (DeepSeek, OpenAI 호환 API)
+    DEEPSEEK_BASE_URL: str = "https://api.deepseek.com/v1"
+    SUMMARY_MODEL: str = "deepseek-chat"
+    LLM_TIMEOUT: float = 30.0        # 요청 1회 제한 시간 (초)
+    LLM_MAX_CONCURRENCY: int = 4     # 동시에 진행할 수 있는 LLM 요청 수
+    LLM_MAX_RETRIES: int = 2         # 타임아웃/일시 오류 시 재시도 횟수
+    SUMMARY_INPUT_TOKEN_BUDGET: int = 6000  # 요약 요청 1회 입력 토큰 예산
+    LLM_INPUT_PRICE: float = 0.27    # 입력 100만 토큰당 가격 (USD)
+    LLM_OUTPUT_PRICE: float = 1.10   # 출력 100만 토큰당 가격 (USD)
+
+    # LLM 기능 시간당 기본 사용량 한도 (서버별 값은 guilds 테이블)
+    LLM_GUILD_REQUESTS_PER_HOUR: int = 60
+    LLM_GUILD_TOKENS_PER_HOUR: int = 300000
+    LLM_USER_REQUESTS_PER_HOUR: int = 10
+    LLM_USER_TOKENS_PER_HOUR: int = 60000
+
     # ENV
     ENV: str
 
@@ -0,0 +1,113 @@
+import re
+import math
+from collections import Counter, defaultdict
+import logging
+
+from core.prompt_builder import compact_content
+
+logger = logging.getLogger(__name__)
+
+# 한글 2글자 이상, 영문 3글자 이상, 숫자+단위(예: 3시, 10강)
+TERM_PATTERN = re.compile(r"[가-힣]{2,}|[A-Za-z]{3,}|\d+[가-힣]+")
+
+# 흔한 조사/어미 (단어 끝에서 제거)
+JOSA_SUFFIXES = (
+    "에서는", "으로는", "이라고", "에서", "으로", "이랑", "한테", "까지", "부터", "처럼", "보다",
+    "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "랑", "와", "과", "만"
+)
+
+# 주제로 쓰기 어려운 말
+STOPWORDS = {
+    "그냥", "진짜", "근데", "그래서", "그리고", "아니", "이거", "저거", "그거", "우리", "너무", "정말",
+    "있어", "없어", "있는", "없는", "하는", "해서", "하고", "했는데", "나도", "저도", "제가", "내가",
+    "오늘", "지금", "이제", "그럼", "아마", "혹시", "ㅋㅋ", "ㅎㅎ", "네네", "the", "and", "you", "that"
+}
+
+TOPIC_COUNT = 4
+MAX_TOPIC_RATIO = 0.9  # 이 비율보다 많은 메시지에 나오는 단어는 주제에서 제외
+MAX_LINE_LENGTH = 120
+
+
+def _terms(content):
+    """메시지에서 주제 후보 단어 추출 (조사 제거, 불용어 제외)"""
+    terms = set()
+    for word in TERM_PATTERN.findall(content.lower()):
+        for suffix in JOSA_SUFFIXES:
+            if len(word) > len(suffix) + 1 and word.endswith(suffix):
+                word = word[:-len(suffix)]
+                break
+        if word not in STOPWORDS:
+            terms.add(word)
+    return terms
+
+
+def extract_summary(records, topic_count=TOPIC_COUNT):
+    """
+    LLM 없이 만드는 빠른 요약 (추출식)
+
+    - 여러 사람이 많이 언급한 단어를 주제로 고르고
+    - 주제 단어가 들어간 메시지 중 핵심 단어를 가장 많이 담은 메시지를 대표 문장으로 사용
+    반환: LLM 요약과 같은 '- [주제]' 형식의 문자열 / 요약할 내용이 없으면 None
+    """
+    lines = []
+    for record in records:
+        content = compact_content(record['content'])
+        if content:
+            lines.append((record['author_name'], content, _terms(content)))
+    if not lines:
+        return None
+
+    # 단어별 등장 메시지 수, 언급한 사람
+    document_frequency = Counter()
+    authors = defaultdict(set)
+    for author_name, _, terms in lines:
+        document_frequency.update(terms)
+        for term in terms:
+            authors[term].add(author_name)
+
+    # 주제 점수: 여러 메시지/여러 사람이 언급할수록 높음
+    # 거의 모든 메시지(90% 초과)에 나오는 말은 제외 - 한 주제에 집중된 대화의 주제어는 남도록 높게 잡음
+    all_weights = {
+        term: count * math.log2(1 + len(authors[term]))
+        for term, count in document_frequency.items()
+        if count >= 2
+    }
+    max_frequency = max(2, int(len(lines) * MAX_TOPIC_RATIO))
+    weights = {term: weight for term, weight in all_weights.items() if document_frequency[term] <= max_frequency}
+    if not weights:
+        # 모든 후보가 제외되면 빈 요약 대신 점수 상위 단어를 그대로 사용
+        weights = all_weights
+    topics = sorted(weights, key=weights.get, reverse=True)
+
+    sections = []
+    used_lines = set()
+    for topic in topics:
+        if len(sections) >= topic_count:
+            break
+
+        # 주제 단어가 들어간 메시지 중 주제 점수 합이 가장 높은 메시지
+        best_index, best_score = None, 0.0
+        for index, (_, content, terms) in enumerate(lines):
+            if topic not in terms or index in used_lines:
+                continue
+            score = sum(weights.get(term, 0.0) for term in terms) / math.sqrt(len(terms))
+            if score > best_score:
+                best_index, best_score = index, score
+        if best_index is None:
+            continue
+
+        used_lines.add(best_index)
+        author_name, content, _ = lines[best_index]
+        if len(content) > MAX_LINE_LENGTH:
+            content = content[:MAX_LINE_LENGTH] + "…"
+        sections.append(
+            f"- {topic} (언급 {document_frequency[topic]}회, {len(authors[topic])}명)\n"
+            f"{author_name}: {content}"
+        )
+
+    # 분위기 대신 참여 현황
+    speakers = Counter(author_name for author_name, _, _ in lines)
+    top_speakers = ", ".join(name for name, _ in speakers.most_common(3))
+    sections.append(f"- 참여\n메시지 {len(lines)}개, {len(speakers)}명 참여 (가장 활발: {top_speakers})")
+
+    return "\n".join(sections)
@@ -0,0 +1,164 @@
+import asyncio
+import random
+import time
+import logging
+from openai import (
+    AsyncOpenAI, APITimeoutError, APIConnectionError,
+    RateLimitError, InternalServerError
+)
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 수 있는 일시적인 오류
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError, APITimeoutError, APIConnectionError,
+    RateLimitError, InternalServerError
+)
+
+
+class LLMTimeoutError(Exception):
+    """마감 시간 안에 LLM 응답을 받지 못함 (재시도 포함)"""
+
+
+class LLMClient:
+    """
+    비동기 LLM 클라이언트 (OpenAI 호환 API)
+
+    - 요청별 제한 시간과 전체 마감 시각(deadline) 적용
+    - 전역 동시 요청 수 제한 (세마포어)
+    - 일시 오류 시 지터가 포함된 지수 백오프 재시도
+    """
+
+    def __init__(self, api_key, base_url, model, timeout=30.0, max_concurrency=4, max_retries=2):
+        # 재시도/타임아웃은 직접 관리하므로 SDK 기본 재시도는 끔
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def close(self):
+        await self.client.close()
+
+    def _remaining(self, deadline):
+        """마감까지 남은 시간 (요청 제한 시간 이내)"""
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise LLMTimeoutError("LLM 요청 마감 시간 초과")
+        return min(self.timeout, remaining)
+
+    async def _acquire(self, deadline):
+        """동시 요청 슬롯 확보 (대기 시간도 마감에 포함)"""
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self._remaining(deadline))
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError("LLM 동시 요청 대기 시간 초과")
+
+    async def _backoff(self, attempt, deadline):
+        """지터가 포함된 지수 백오프 대기"""
+        delay = min(8.0, 0.5 * (2 ** attempt)) * random.uniform(0.5, 1.5)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            raise LLMTimeoutError("재시도할 시간이 남아있지 않음")
+        await asyncio.sleep(delay)
+
+    async def _with_retries(self, attempt_func, deadline):
+        """동시 요청 슬롯을 잡고 attempt_func(시도 번호) 실행, 일시 오류 시 재시도"""
+        await self._acquire(deadline)
+        try:
+            for attempt in range(self.max_retries + 1):
+                started = time.monotonic()
+                try:
+                    result = await attempt_func(attempt)
+                    logger.info(f"LLM 응답 완료: {time.monotonic() - started:.2f}초 (시도 {attempt + 1})")
+                    return result
+                except RETRYABLE_ERRORS as e:
+                    logger.warning(f"LLM 요청 실패 (시도 {attempt + 1}/{self.max_retries + 1}): {type(e).__name__}")
+                    if attempt >= self.max_retries:
+                        raise LLMTimeoutError(f"LLM 요청 재시도 횟수 초과: {type(e).__name__}") from e
+                    await self._backoff(attempt, deadline)
+        finally:
+            self.semaphore.release()
+
+    async def complete(self, messages, max_tokens, temperature=1.0, deadline=None):
+        """
+        채팅 완성 요청
+
+        deadline: time.monotonic() 기준 마감 시각 (예: 상호작용 만료 시각)
+        반환: {'content', 'prompt_tokens', 'completion_tokens'}
+        """
+        async def attempt(_):
+            response = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=False
+                ),
+                timeout=self._remaining(deadline)
+            )
+            usage = response.usage
+            return {
+                'content': response.choices[0].message.content or "",
+                'prompt_tokens': usage.prompt_tokens if usage else 0,
+                'completion_tokens': usage.completion_tokens if usage else 0
+            }
+
+        return await self._with_retries(attempt, deadline)
+
+    async def complete_stream(self, messages, max_tokens, on_content, temperature=1.0, deadline=None):
+        """
+        스트리밍 채팅 완성 요청
+        토큰이 도착할 때마다 on_content(지금까지의 내용) 호출
+        (내용을 보여주기 시작한 뒤 실패하면 재시도하지 않고 LLMTimeoutError 발생)
+
+        반환: {'content', 'prompt_tokens', 'completion_tokens', 'first_content_at'}
+        """
+        async def attempt(_):
+            stream = await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True}
+                ),
+                timeout=self._remaining(deadline)
+            )
+            content = []
+            usage = None
+            first_content_at = None
+            try:
+                chunks = stream.__aiter__()
+                while True:
+                    try:
+                        # 청크 사이 대기 시간에도 제한 시간 적용
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self._remaining(deadline))
+                    except StopAsyncIteration:
+                        break
+                    except RETRYABLE_ERRORS as e:
+                        if content:
+                            raise LLMTimeoutError(f"스트리밍 중단: {type(e).__name__}") from e
+                        raise
+
+                    if chunk.usage:
+                        usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if first_content_at is None:
+                            first_content_at = time.monotonic()
+                        content.append(chunk.choices[0].delta.content)
+                        await on_content("".join(content))
+            finally:
+                await stream.close()
+
+            return {
+                'content': "".join(content),
+                'prompt_tokens': usage.prompt_tokens if usage else 0,
+                'completion_tokens': usage.completion_tokens if usage else 0,
+                'first_content_at': first_content_at
+            }
+
+        return await self._with_retries(attempt, deadline)
@@ -0,0 +1,151 @@
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def to_record(message):
+    """discord.Message를 요약용 압축 레코드로 변환 (작성자/내용만 보관)"""
+    return {
+        'id': message.id,
+        'author_id': message.author.id,
+        # 서버 메시지는 Member이므로 display_name이 서버 닉네임
+        'author_name': message.author.display_name,
+        'content': message.content
+    }
+
+
+def format_record(record):
+    return f"{record['author_name']}: {record['content']}"
+
+
+def split_blocks(records, block_size):
+    """
+    레코드를 고정 크기 구간으로 나눔
+    버퍼 레코드는 seq 기준으로 나눠 새 메시지가 와도 이전 구간 경계가 바뀌지 않음
+    """
+    blocks = []
+    current_block = None
+    for index, record in enumerate(records):
+        block = record.get('seq', index) // block_size
+        if block != current_block:
+            blocks.append([])
+            current_block = block
+        blocks[-1].append(record)
+    return blocks
+
+
+class MessageBuffer:
+    """
+    채널별 최근 메시지 링 버퍼
+
+    - 채널마다 최대 maxlen개의 메시지를 메시지 ID 순서로 보관
+    - 메시지 생성/수정/삭제 이벤트로 갱신
+    - 시작 시 한 번 채워진(warm) 채널만 버퍼에서 바로 조회
+    - 레코드마다 채널 내 일련번호(seq)를 붙여 요약 구간 경계를 고정
+    """
+
+    def __init__(self, maxlen=500):
+        self.maxlen = maxlen
+        self._channels = {}  # {channel_id: OrderedDict({message_id: record})}
+        self._next_seq = {}  # {channel_id: 다음 일련번호}
+        self._warmed = set()
+
+    def is_warm(self, channel_id):
+        return int(channel_id) in self._warmed
+
+    def channels(self):
+        return list(self._channels.keys())
+
+    def _trim(self, buffer):
+        while len(buffer) > self.maxlen:
+            buffer.popitem(last=False)
+
+    def append(self, channel_id, record):
+        """새 메시지 추가 (가장 오래된 메시지부터 밀려남)"""
+        channel_id = int(channel_id)
+        buffer = self._channels.setdefault(channel_id, OrderedDict())
+        record['seq'] = self._next_seq.get(channel_id, 0)
+        self._next_seq[channel_id] = record['seq'] + 1
+        buffer[record['id']] = record
+        self._trim(buffer)
+
+    def edit(self, channel_id, message_id, content):
+        """버퍼에 있는 메시지 내용 수정"""
+        buffer = self._channels.get(int(channel_id))
+        if buffer is None:
+            return False
+        record = buffer.get(int(message_id))
+        if record is None:
+            return False
+        record['content'] = content
+        return True
+
+    def delete(self, channel_id, message_id):
+        buffer = self._channels.get(int(channel_id))
+        if buffer is None:
+            return False
+        return buffer.pop(int(message_id), None) is not None
+
+    def warm(self, channel_id, records):
+        """
+        시작 시 히스토리로 버퍼 채우기
+        채우는 동안 이벤트로 들어온 메시지와 합친 뒤 ID(시간) 순으로 정렬
+        """
+        channel_id = int(channel_id)
+        merged = {record['id']: record for record in records}
+        merged.update(self._channels.get(channel_id, {}))
+
+        buffer = OrderedDict((message_id, merged[message_id]) for message_id in sorted(merged))
+        for seq, record in enumerate(buffer.values()):
+            record['seq'] = seq
+        self._next_seq[channel_id] = len(buffer)
+        self._trim(buffer)
+        self._channels[channel_id] = buffer
+        self._warmed.add(channel_id)
+
+    def drop(self, channel_id):
+        channel_id = int(channel_id)
+        self._channels.pop(channel_id, None)
+        self._next_seq.pop(channel_id, None)
+        self._warmed.discard(channel_id)
+
+    def recent(self, channel_id, limit, align=None):
+        """
+        최근 limit개의 메시지 레코드 (오래된 것이 먼저)
+        align 지정 시 가장 오래된 메시지가 속한 구간(seq // align) 전체가 포함되도록 앞쪽을 늘림
+        """
+        buffer = self._channels.get(int(channel_id))
+        if not buffer:
+            return []
+        records = list(buffer.values())
+        start = max(0, len(records) - limit)
+        if align and start > 0:
+            first_block = records[start]['seq'] // align
+            while start > 0 and records[start - 1]['seq'] // align == first_block:
+                start -= 1
+        return records[start:]
+
+    def covers(self, channel_id, message_id):
+        """message_id 이후의 메시지가 모두 버퍼에 있는지 (준비된 채널이고 가장 오래된 메시지가 그 이전)"""
+        buffer = self._channels.get(int(channel_id))
+        if not self.is_warm(channel_id) or not buffer:
+            return False
+        return next(iter(buffer)) <= int(message_id)
+
+    def since(self, channel_id, message_id, limit):
+        """message_id 이후의 메시지 중 최근 limit개 (오래된 것이 먼저)"""
+        buffer = self._channels.get(int(channel_id))
+        if not buffer:
+            return []
+        message_id = int(message_id)
+        records = []
+        for record in reversed(buffer.values()):
+            if record['id'] <= message_id or len(records) >= limit:
+                break
+            records.append(record)
+        records.reverse()
+        return records
+
+    def __len__(self):
+        return sum(len(buffer) for buffer in self._channels.values())
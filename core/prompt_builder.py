@@ -0,0 +1,102 @@
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 요약에 도움이 되지 않는 메시지 판별용 패턴
+CUSTOM_EMOJI_PATTERN = re.compile(r"<a?:\w+:\d+>")
+URL_PATTERN = re.compile(r"https?://\S+")
+CODE_BLOCK_PATTERN = re.compile(r"```.*?```", re.DOTALL)
+WORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]")  # 숫자/영문/완성형 한글 (ㅋㅋ, ㅇㅇ 같은 자모만 있는 메시지는 제외)
+
+MAX_LINE_CHARS = 300      # 이보다 긴 메시지(붙여넣기 등)는 잘라냄
+MESSAGE_OVERHEAD = 4      # 메시지마다 붙는 이름/구분자 토큰
+
+
+def estimate_tokens(text):
+    """
+    토큰 수 추정 (토크나이저 없이 빠르게)
+    한글/한자 등 비 ASCII 문자는 글자당 1토큰, ASCII는 4글자당 1토큰으로 계산
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii + 3) // 4
+
+
+def compact_content(content):
+    """
+    메시지 내용 정리
+    반환: 정리된 내용 / 요약에 필요 없는 메시지면 None
+    """
+    content = CODE_BLOCK_PATTERN.sub("(코드 생략)", content).strip()
+    if not content:
+        return None
+
+    # 링크만 있는 메시지
+    without_links = URL_PATTERN.sub("", content).strip()
+    if not without_links:
+        return None
+    if without_links != content:
+        content = URL_PATTERN.sub("(링크)", content)
+
+    # 이모지/기호/자모만 있는 메시지
+    if not WORD_PATTERN.search(CUSTOM_EMOJI_PATTERN.sub("", content)):
+        return None
+
+    # 긴 붙여넣기
+    if len(content) > MAX_LINE_CHARS:
+        content = content[:MAX_LINE_CHARS] + "…(생략)"
+
+    return content
+
+
+def build_history(records, token_budget):
+    """
+    요약 입력용 대화 줄 생성
+    불필요한 줄을 정리하고, 예산을 넘으면 오래된 줄부터 제외
+
+    반환: (줄 목록, 보고서 {'input_lines', 'lines', 'compacted', 'dropped', 'over_budget', 'tokens'})
+    """
+    report = {
+        'input_lines': len(records),
+        'lines': 0,
+        'compacted': 0,     # 잘리거나 링크/코드가 정리된 줄
+        'dropped': 0,       # 이모지/링크만 있거나 반복된 줄
+        'over_budget': 0,   # 예산 초과로 제외된 오래된 줄
+        'tokens': 0
+    }
+
+    lines = []
+    seen = set()
+    for record in records:
+        content = compact_content(record['content'])
+        key = (record['author_id'], content)
+        if content is None or key in seen:
+            report['dropped'] += 1
+            continue
+        seen.add(key)
+        if content != record['content']:
+            report['compacted'] += 1
+        lines.append(f"{record['author_name']}: {content}")
+
+    # 최신 줄부터 예산만큼 채움
+    kept = []
+    tokens = 0
+    for line in reversed(lines):
+        line_tokens = estimate_tokens(line) + MESSAGE_OVERHEAD
+        if tokens + line_tokens > token_budget:
+            break
+        kept.append(line)
+        tokens += line_tokens
+    kept.reverse()
+
+    report['over_budget'] = len(lines) - len(kept)
+    report['lines'] = len(kept)
+    report['tokens'] = tokens
+    return kept, report
+
+
+def estimate_cost(prompt_tokens, completion_tokens, input_price, output_price):
+    """토큰 사용량으로 요청 비용 계산 (가격은 100만 토큰당 USD)"""
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
@@ -0,0 +1,121 @@
+import asyncio
+import random
+import time
+import logging
+from collections import deque
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 상태 코드 (일시적인 서버 오류/요청 과다)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RankAPIError(Exception):
+    """랭크 API 요청 실패 (status: HTTP 상태 코드, 연결 실패 시 None)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class RankAPIClient:
+    """
+    랭크 API 클라이언트 (코그가 소유하는 장기 세션)
+
+    - keep-alive 연결 풀 재사용, 호스트당 연결 수 제한, DNS 캐시
+    - 일시 오류 시 지터가 포함된 지수 백오프로 제한된 횟수만 재시도
+      (timeout은 재시도를 포함한 요청 전체 기한, 남은 시간만큼만 다음 시도에 사용)
+    - 요청 지연 시간 기록
+    """
+
+    def __init__(self, url, timeout=30, max_retries=2, limit_per_host=8):
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limit_per_host = limit_per_host
+        self.session = None
+        self.latencies = deque(maxlen=500)  # 성공한 요청 지연 시간 (초)
+        self.stats = {'requests': 0, 'retries': 0, 'failures': 0}
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.limit_per_host * 2,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=60,
+            ttl_dns_cache=300
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def _backoff(self, attempt, deadline):
+        """지터가 포함된 지수 백오프 대기 (전체 기한을 넘기면 재시도하지 않음)"""
+        delay = min(4.0, 0.5 * (2 ** attempt)) * random.uniform(0.5, 1.5)
+        if time.monotonic() + delay >= deadline:
+            self.stats['failures'] += 1
+            raise RankAPIError("API 재시도할 시간이 남아있지 않음")
+        self.stats['retries'] += 1
+        await asyncio.sleep(delay)
+
+    async def fetch_character(self, server, character):
+        """
+        캐릭터 랭킹 조회
+        반환: API 응답 JSON (200일 때) / 실패 시 RankAPIError
+        """
+        if self.session is None:
+            await self.start()
+
+        self.stats['requests'] += 1
+        deadline = time.monotonic() + self.timeout
+        for attempt in range(self.max_retries + 1):
+            started = time.monotonic()
+            try:
+                async with self.session.post(
+                    self.url,
+                    json={"server": server, "character": character},
+                    timeout=aiohttp.ClientTimeout(total=deadline - started)
+                ) as response:
+                    if response.status == 200:
+                        result = await response.json()
+                        if not isinstance(result, dict):
+                            raise ValueError("응답이 JSON 객체가 아님")
+                        latency = time.monotonic() - started
+                        self.latencies.append(latency)
+                        logger.info(f"랭크 API 응답: {character} ({server}) {latency:.2f}초 (시도 {attempt + 1})")
+                        return result
+
+                    if response.status not in RETRYABLE_STATUS or attempt >= self.max_retries:
+                        self.stats['failures'] += 1
+                        raise RankAPIError(f"API 요청 실패: {response.status}", status=response.status)
+                    logger.warning(f"랭크 API 오류 응답 {response.status} (시도 {attempt + 1}/{self.max_retries + 1})")
+            except asyncio.TimeoutError as e:
+                # 전체 기한을 다 쓴 것이므로 재시도하지 않음
+                self.stats['failures'] += 1
+                raise RankAPIError(f"API 응답 시간 초과 ({self.timeout}초)") from e
+            except aiohttp.ClientConnectionError as e:
+                if attempt >= self.max_retries:
+                    self.stats['failures'] += 1
+                    raise RankAPIError(f"API 서버 연결 실패: {type(e).__name__}") from e
+                logger.warning(f"랭크 API 연결 오류 (시도 {attempt + 1}/{self.max_retries + 1}): {type(e).__name__}")
+            except (aiohttp.ClientError, ValueError) as e:
+                # JSON이 아니거나 잘린 응답 등 - 다시 요청해도 같은 응답일 가능성이 높아 재시도하지 않음
+                self.stats['failures'] += 1
+                raise RankAPIError(f"API 응답 처리 실패: {type(e).__name__}") from e
+
+            await self._backoff(attempt, deadline)
+
+    def latency_summary(self):
+        """지연 시간 요약 {'count', 'p50', 'p95', 'max'} (초)"""
+        if not self.latencies:
+            return None
+        samples = sorted(self.latencies)
+        return {
+            'count': len(samples),
+            'p50': samples[len(samples) // 2],
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'max': samples[-1]
+        }
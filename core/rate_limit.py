@@ -0,0 +1,84 @@
+import time
+import logging
+
+from core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """토큰 버킷 - capacity만큼 쌓이고 period초 동안 capacity만큼 다시 채워짐"""
+
+    def __init__(self, capacity, period=3600):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """amount만큼 쓸 수 있을 때까지 남은 시간 (초, 지금 가능하면 0)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # 한도보다 큰 요청도 가득 찼을 때는 허용
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate if self.rate > 0 else float('inf')
+
+    def consume(self, amount):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMRateLimiter:
+    """
+    LLM 기능 사용량 제한 (서버별 / 사용자별, 요청 수 + 예상 토큰)
+
+    quota: {'guild_requests', 'guild_tokens', 'user_requests', 'user_tokens'} (시간당)
+    모든 버킷에 여유가 있을 때만 한 번에 차감
+    """
+
+    def __init__(self, period=3600, maxsize=10000):
+        self.period = period
+        # 오래 쓰지 않은 버킷은 가득 찬 상태와 같으므로 period가 지나면 버려도 됨
+        self._buckets = TTLCache(ttl=period, maxsize=maxsize)
+        self.metrics = {}  # {guild_id: {'requests', 'tokens', 'limited'}}
+
+    def _bucket(self, key, capacity):
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.capacity != capacity:
+            bucket = TokenBucket(capacity, self.period)
+        self._buckets.set(key, bucket)
+        return bucket
+
+    def _guild_metrics(self, guild_id):
+        return self.metrics.setdefault(guild_id, {'requests': 0, 'tokens': 0, 'limited': 0})
+
+    def acquire(self, guild_id, user_id, estimated_tokens, quota):
+        """
+        요청 1회 + 예상 토큰 차감
+        반환: (허용 여부, 다시 시도까지 남은 초, 제한 대상 'user'/'guild'/None)
+        """
+        checks = [
+            ('user', self._bucket(('user_requests', user_id), quota['user_requests']), 1),
+            ('user', self._bucket(('user_tokens', user_id), quota['user_tokens']), estimated_tokens),
+            ('guild', self._bucket(('guild_requests', guild_id), quota['guild_requests']), 1),
+            ('guild', self._bucket(('guild_tokens', guild_id), quota['guild_tokens']), estimated_tokens),
+        ]
+
+        metrics = self._guild_metrics(guild_id)
+        for scope, bucket, amount in checks:
+            wait = bucket.wait_time(amount)
+            if wait > 0:
+                metrics['limited'] += 1
+                logger.info(f"LLM 사용량 제한: 서버={guild_id}, 사용자={user_id}, 대상={scope}, 대기={wait:.0f}초")
+                return False, wait, scope
+
+        for _, bucket, amount in checks:
+            bucket.consume(amount)
+        metrics['requests'] += 1
+        metrics['tokens'] += estimated_tokens
+        return True, 0.0, None
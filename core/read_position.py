@@ -0,0 +1,90 @@
+from collections import Counter, OrderedDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ReadPositionStore:
+    """
+    채널별/사용자별 마지막으로 읽은 메시지 ID 저장소
+
+    - 최대 maxsize개까지 보관하고 오래 사용되지 않은 위치부터 제거 (LRU)
+    - 위치는 스노우플레이크라 앞으로만 이동 (더 작은 ID로 갱신하지 않음)
+    - 변경된 위치는 dirty로 모아 두었다가 한 번에 DB에 저장
+    """
+
+    def __init__(self, maxsize=50000):
+        self.maxsize = maxsize
+        self._positions = OrderedDict()  # {(channel_id, user_id): message_id}
+        self._channels = Counter()  # {channel_id: 보관 중인 위치 수} - 추적 중인 채널 확인용
+        self._dirty = set()
+
+    def tracks_channel(self, channel_id):
+        """이 채널의 읽은 위치를 하나라도 보관 중인지 (요약을 사용한 적 있는 채널)"""
+        return int(channel_id) in self._channels
+
+    def _add(self, key, message_id, last=True):
+        if key not in self._positions:
+            self._channels[key[0]] += 1
+        self._positions[key] = message_id
+        self._positions.move_to_end(key, last=last)
+
+    def _evict(self):
+        key, _ = self._positions.popitem(last=False)
+        self._channels[key[0]] -= 1
+        if self._channels[key[0]] <= 0:
+            del self._channels[key[0]]
+        return key
+
+    def get(self, channel_id, user_id):
+        key = (int(channel_id), int(user_id))
+        message_id = self._positions.get(key)
+        if message_id is not None:
+            self._positions.move_to_end(key)
+        return message_id
+
+    def update(self, channel_id, user_id, message_id):
+        """읽은 위치 갱신 (이전 위치보다 뒤일 때만)"""
+        key = (int(channel_id), int(user_id))
+        message_id = int(message_id)
+        current = self._positions.get(key)
+        if current is not None and current >= message_id:
+            return False
+
+        self._add(key, message_id)
+        self._dirty.add(key)
+
+        while len(self._positions) > self.maxsize:
+            evicted = self._evict()
+            # 저장 전에 밀려난 위치는 저장 대상에서도 제외 (다음 접속 시 다시 기록됨)
+            self._dirty.discard(evicted)
+        return True
+
+    def load(self, rows):
+        """DB에서 읽은 (channel_id, user_id, message_id) 목록으로 채우기 (최근 갱신 순)"""
+        # 최근 것부터 앞쪽에 넣으면 가장 오래된 위치가 맨 앞(먼저 제거)에 옴
+        for channel_id, user_id, message_id in rows:
+            key = (int(channel_id), int(user_id))
+            if key not in self._positions:
+                self._add(key, int(message_id), last=False)
+        while len(self._positions) > self.maxsize:
+            self._evict()
+
+    def take_dirty(self):
+        """저장할 위치 목록을 꺼내고 dirty 비우기"""
+        positions = [
+            (channel_id, user_id, self._positions[(channel_id, user_id)])
+            for channel_id, user_id in self._dirty
+            if (channel_id, user_id) in self._positions
+        ]
+        self._dirty.clear()
+        return positions
+
+    def restore_dirty(self, positions):
+        """저장 실패 시 다시 dirty로 표시"""
+        for channel_id, user_id, _ in positions:
+            if (channel_id, user_id) in self._positions:
+                self._dirty.add((channel_id, user_id))
+
+    def __len__(self):
+        return len(self._positions)
@@ -0,0 +1,38 @@
+-- 알림 예약 조회 인덱스화
+-- 요일을 alert_type 문자열('wed', 'custom_wed')에서 분리해 weekday 컬럼으로 정규화하고
+-- 예약 알림 조회(get_upcoming_alerts, get_alert_by_time)와 사용자 알림 조회가 인덱스를 타도록 한다.
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/001_alert_schedule_index.sql
+
+BEGIN;
+
+-- 0=월 ... 6=일 (datetime.weekday()와 동일), 매일 알림은 NULL
+ALTER TABLE alert ADD COLUMN IF NOT EXISTS weekday SMALLINT;
+
+UPDATE alert
+SET weekday = CASE regexp_replace(alert_type, '^custom_', '')
+        WHEN 'mon' THEN 0
+        WHEN 'tue' THEN 1
+        WHEN 'wed' THEN 2
+        WHEN 'thu' THEN 3
+        WHEN 'fri' THEN 4
+        WHEN 'sat' THEN 5
+        WHEN 'sun' THEN 6
+    END
+WHERE interval = 'week'
+AND weekday IS NULL;
+
+-- 예약 알림 조회: alert_time 동등 조건 + interval/weekday 필터
+CREATE INDEX IF NOT EXISTS idx_alert_schedule ON alert (alert_time, interval, weekday);
+
+-- 유형별 알림 목록 (get_alert_list: alert_type 조건 + alert_time 정렬)
+CREATE INDEX IF NOT EXISTS idx_alert_type_time ON alert (alert_type, alert_time);
+
+-- 알림 ID -> 구독자 조회 (예약 알림 발송, 구독자 수 확인)
+-- user_id 기준 조회는 ON CONFLICT (user_id, alert_id)에 쓰이는 유니크 인덱스가 이미 처리한다.
+CREATE INDEX IF NOT EXISTS idx_alert_user_alert_id ON alert_user (alert_id);
+
+COMMIT;
+
+ANALYZE alert;
+ANALYZE alert_user;
@@ -0,0 +1,48 @@
+-- 커스텀 알림 정의 공유
+-- 같은 (alert_time, interval, 요일) 커스텀 알림을 하나의 alert 행으로 합치고
+-- 이후 get_or_create_custom_alert가 기존 행을 재사용하도록 유니크 인덱스를 만든다.
+-- 커스텀 알림의 요일은 alert_type('custom', 'custom_mon' ...)에 들어 있으므로
+-- (alert_type, alert_time, interval)이 곧 (시간, 주기, 요일) 키가 된다.
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/002_custom_alert_dedup.sql
+
+BEGIN;
+
+-- 중복 정의마다 가장 작은 alert_id를 대표로 선택
+CREATE TEMP TABLE custom_alert_dedup ON COMMIT DROP AS
+SELECT alert_id,
+       MIN(alert_id) OVER (PARTITION BY alert_type, alert_time, interval) AS keep_id
+FROM alert
+WHERE alert_type LIKE 'custom%';
+
+-- 구독을 대표 알림으로 이동 (이미 구독 중이면 무시)
+INSERT INTO alert_user (user_id, alert_id)
+SELECT au.user_id, d.keep_id
+FROM alert_user au
+JOIN custom_alert_dedup d ON d.alert_id = au.alert_id
+WHERE d.alert_id <> d.keep_id
+ON CONFLICT (user_id, alert_id) DO NOTHING;
+
+DELETE FROM alert_user au
+USING custom_alert_dedup d
+WHERE au.alert_id = d.alert_id
+AND d.alert_id <> d.keep_id;
+
+DELETE FROM alert a
+USING custom_alert_dedup d
+WHERE a.alert_id = d.alert_id
+AND d.alert_id <> d.keep_id;
+
+-- 구독자가 없는 커스텀 알림 정리
+DELETE FROM alert a
+WHERE a.alert_type LIKE 'custom%'
+AND NOT EXISTS (SELECT 1 FROM alert_user au WHERE au.alert_id = a.alert_id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_alert_custom_definition
+    ON alert (alert_type, alert_time, interval)
+    WHERE alert_type LIKE 'custom%';
+
+COMMIT;
+
+ANALYZE alert;
+ANALYZE alert_user;
@@ -0,0 +1,21 @@
+-- 요약 읽은 위치 저장
+-- 채널별/사용자별 마지막으로 읽은(활동한) 메시지 ID를 보관해 재시작 후에도 "안 읽은 메시지" 요약을 이어간다.
+-- message_id는 디스코드 스노우플레이크라 시간 순서로 비교할 수 있다.
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/003_summary_read_position.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS summary_read_position (
+    channel_id  TEXT      NOT NULL,
+    user_id     TEXT      NOT NULL,
+    message_id  BIGINT    NOT NULL,
+    updated_at  TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (channel_id, user_id)
+);
+
+-- 시작 시 최근 위치부터 불러오기 위한 인덱스
+CREATE INDEX IF NOT EXISTS idx_summary_read_position_updated
+    ON summary_read_position (updated_at DESC);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- 서버별 LLM 기능(요약) 사용량 한도
+-- 모두 시간당 값이며 NULL이면 설정(config)의 기본값을 사용한다.
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/004_guild_llm_quota.sql
+
+BEGIN;
+
+ALTER TABLE guilds ADD COLUMN IF NOT EXISTS llm_requests_per_hour INTEGER;       -- 서버 전체 요청 수
+ALTER TABLE guilds ADD COLUMN IF NOT EXISTS llm_tokens_per_hour INTEGER;         -- 서버 전체 예상 토큰
+ALTER TABLE guilds ADD COLUMN IF NOT EXISTS llm_user_requests_per_hour INTEGER;  -- 사용자 1명 요청 수
+ALTER TABLE guilds ADD COLUMN IF NOT EXISTS llm_user_tokens_per_hour INTEGER;    -- 사용자 1명 예상 토큰
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- 캐릭터 랭킹 조회 인덱스 (rank_data DB)
+-- select_recent_character_rank (서버 + 캐릭터 + 최근 15분, 최신 1건)가 인덱스 한 번 탐색으로 끝나도록 한다.
+-- 수집 중인 테이블을 잠그지 않도록 CONCURRENTLY로 생성 (트랜잭션 밖에서 실행해야 함)
+--
+-- 적용: psql "postgresql://.../rank_data" -f db/migrations/005_rank_lookup_index.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mabinogi_ranking_lookup
+    ON mabinogi_ranking (server_name, character_name, retrieved_at DESC);
+
+ANALYZE mabinogi_ranking;
@@ -0,0 +1,23 @@
+-- 서버별 캐릭터 이름 목록 (기본 DB)
+-- /랭크 자동완성과 오타 추천은 원본 스냅샷(rank_data) 대신 이름당 한 줄인 이 테이블만 조회함
+-- 일간 기록 반영(011_rank_daily_history.sql)이 같은 트랜잭션에서 채우므로 반영 주기(최대 약 25분)만큼 늦게 보일 수 있음
+-- character_name은 "C" 정렬 규칙: 기본 키 인덱스가 LIKE '앞부분%' 검색과 이름 순 정렬(LIMIT에서 바로 멈춤)에 그대로 쓰임
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/006_rank_character_names.sql
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE IF NOT EXISTS rank_character_names (
+    server_name     TEXT                NOT NULL,
+    character_name  TEXT COLLATE "C"    NOT NULL,
+    last_seen_at    TIMESTAMPTZ         NOT NULL,   -- 마지막으로 랭킹에 기록된 시각
+    PRIMARY KEY (server_name, character_name)
+);
+
+-- 유사도(%) 검색, 거리(<->) 순 정렬
+CREATE INDEX IF NOT EXISTS idx_rank_character_names_trgm
+    ON rank_character_names USING gist (character_name gist_trgm_ops);
+
+COMMIT;
@@ -0,0 +1,14 @@
+-- 랭킹 순위표 인덱스 (rank_data DB)
+-- /랭킹순위표: 서버별 최신 수집 묶음의 retrieved_at을 한 번 정해 두고,
+-- 그 스냅샷 안에서 (rank_position, character_name) > 이전 페이지 마지막 줄 조건으로 다음 페이지를 바로 찾아감 (OFFSET 없음)
+-- 수집 중인 테이블을 잠그지 않도록 CONCURRENTLY로 생성 (트랜잭션 밖에서 실행해야 함)
+--
+-- 적용: psql "postgresql://.../rank_data" -f db/migrations/007_rank_leaderboard_index.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mabinogi_ranking_leaderboard
+    ON mabinogi_ranking (server_name, retrieved_at, rank_position, character_name);
+
+-- 이전 버전의 순위표 인덱스 (이름 보조 정렬 키 없음)
+DROP INDEX CONCURRENTLY IF EXISTS idx_mabinogi_ranking_snapshot;
+
+ANALYZE mabinogi_ranking;
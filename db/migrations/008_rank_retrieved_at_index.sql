@@ -0,0 +1,11 @@
+-- 수집 시각 범위 조회 인덱스 (rank_data DB)
+-- 일간 기록 반영(select_ranking_daily_rollup)이 마지막 처리 시각 이후 스냅샷만 읽도록 한다.
+-- 일간 기록 테이블은 봇이 쓰기 권한을 가진 기본 DB에 있음 (011_rank_daily_history.sql)
+-- 수집 중인 테이블을 잠그지 않도록 CONCURRENTLY로 생성 (트랜잭션 밖에서 실행해야 함)
+--
+-- 적용: psql "postgresql://.../rank_data" -f db/migrations/008_rank_retrieved_at_index.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_mabinogi_ranking_retrieved_at
+    ON mabinogi_ranking (retrieved_at);
+
+ANALYZE mabinogi_ranking;
@@ -0,0 +1,17 @@
+-- 서버(길드)별 관심 캐릭터 목록
+-- Rank 코그가 목록의 캐릭터를 주기적으로 미리 조회해 /랭크 조회가 캐시에서 바로 응답되도록 한다.
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/009_rank_watchlist.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS rank_watchlist (
+    guild_id        TEXT      NOT NULL,
+    server_name     TEXT      NOT NULL,
+    character_name  TEXT      NOT NULL,
+    create_user_id  TEXT      NOT NULL,
+    create_dt       TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (guild_id, server_name, character_name)
+);
+
+COMMIT;
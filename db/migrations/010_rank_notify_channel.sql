@@ -0,0 +1,15 @@
+-- 랭크 변동 알림 채널 (서버(길드)별 선택 기능)
+-- 설정한 서버만 관심 캐릭터(rank_watchlist)의 순위 변동을 주기마다 한 번 모아서 알린다.
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/010_rank_notify_channel.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS rank_notify_channel (
+    guild_id    TEXT      PRIMARY KEY,
+    channel_id  TEXT      NOT NULL,
+    min_change  INTEGER   NOT NULL DEFAULT 1,   -- 이 값 이상 순위가 움직였을 때만 알림
+    update_dt   TIMESTAMP NOT NULL DEFAULT now()
+);
+
+COMMIT;
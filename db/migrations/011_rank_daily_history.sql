@@ -0,0 +1,31 @@
+-- 캐릭터별 일간 랭킹 기록 (기본 DB)
+-- rank_data의 mabinogi_ranking 원본 스냅샷을 캐릭터/날짜(한국 시간)별 한 줄로 압축
+-- 봇의 Rank 코그가 10분마다 마지막 처리 시각(rank_rollup_state) 이후 스냅샷만 rank_data에서 읽어 반영함
+-- (rank_data는 읽기 전용, 원본 조회 인덱스는 008_rank_retrieved_at_index.sql)
+-- /랭크추이는 이 테이블만 조회하므로 원본 스냅샷을 훑지 않음
+-- 같은 반영에서 이름 목록(006_rank_character_names.sql)도 갱신
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/011_rank_daily_history.sql
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS rank_daily_history (
+    server_name        TEXT        NOT NULL,
+    character_name     TEXT        NOT NULL,
+    rank_date          DATE        NOT NULL,
+    class_name         TEXT,
+    best_rank          INTEGER     NOT NULL,   -- 그날 가장 높은 순위
+    last_rank          INTEGER     NOT NULL,   -- 그날 마지막 수집 순위
+    max_power          BIGINT      NOT NULL,   -- 그날 가장 높은 전투력
+    last_power         BIGINT      NOT NULL,   -- 그날 마지막 수집 전투력
+    last_retrieved_at  TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (server_name, character_name, rank_date)
+);
+
+-- 증분 반영 위치 (한 줄, 처음 반영할 때 rank_data의 가장 오래된 스냅샷 시각으로 채움)
+CREATE TABLE IF NOT EXISTS rank_rollup_state (
+    id                 SMALLINT    PRIMARY KEY CHECK (id = 1),
+    last_retrieved_at  TIMESTAMPTZ NOT NULL
+);
+
+COMMIT;
@@ -0,0 +1,12 @@
+-- 랭크 변동 알림 위치 (기본 DB)
+-- 서버(길드)별로 마지막으로 알린 구간의 끝 시각을 저장해 봇을 다시 시작해도 같은 변동을 또 알리거나 건너뛰지 않음
+-- 알림을 보낸 뒤에만 앞으로 옮김 (비어 있으면 다음 주기에 최근 한 주기만 비교)
+--
+-- 적용: psql "$DATABASE_URL" -f db/migrations/012_rank_notify_watermark.sql
+
+BEGIN;
+
+ALTER TABLE rank_notify_channel
+    ADD COLUMN IF NOT EXISTS last_notified_at TIMESTAMPTZ;
+
+COMMIT;
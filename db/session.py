@@ -20,6 +20,7 @@ rank_engine = create_engine(
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+RankSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=rank_engine)
 
 def get_db():
     """DB 세션을 반환하는 함수"""
@@ -35,7 +36,7 @@ def get_db():
 
 def get_rank_db():
     """랭크 데이터베이스 세션을 반환하는 함수"""
-    db = sessionmaker(autocommit=False, autoflush=False, bind=rank_engine)()
+    db = RankSessionLocal()
     try:
         yield db
     except Exception as e:
@@ -20,6 +20,9 @@ def check_alert_table_exists(db):
 
 # alert_type = boss, barrier, mon, tue, wed, thu, fri, sat, sun / custom
 # interval = day, week, month
+# weekday = 0(월) ~ 6(일), 매주 알림만 사용 (db/migrations/001_alert_schedule_index.sql)
+WEEKDAY_INDEX = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
 ALERT_LIST = text("""
     SELECT alert_id, interval, alert_type, alert_time
     FROM alert  
@@ -95,6 +98,62 @@ def get_user_alerts(db, user_id):
     } for row in list]
 
 
+# 알림 설정 화면 구성용 사용자 알림 상태 일괄 조회 (기본/요일 알림 목록 + 구독 여부, 커스텀 알림, 심층 알림)
+REGULAR_ALERT_TYPES = ('boss', 'barrier', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+GET_USER_ALERT_STATE = text("""
+    SELECT 'alert' AS kind, a.alert_id, a.interval, a.alert_type, a.alert_time,
+           au.user_id IS NOT NULL AS subscribed, NULL AS deep_guild_auth
+    FROM alert a
+    LEFT JOIN alert_user au ON au.alert_id = a.alert_id AND au.user_id = :user_id
+    WHERE a.alert_type IN ('boss', 'barrier', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+    UNION ALL
+    SELECT 'alert', a.alert_id, a.interval, a.alert_type, a.alert_time,
+           true, NULL
+    FROM alert_user au
+    JOIN alert a ON a.alert_id = au.alert_id
+    WHERE au.user_id = :user_id
+    AND a.alert_type NOT IN ('boss', 'barrier', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+    UNION ALL
+    SELECT 'deep', NULL, NULL, NULL, NULL,
+           bool_or(dau.user_id IS NOT NULL), dp.deep_guild_auth
+    FROM deep_pair dp
+    LEFT JOIN deep_alert_user dau ON dau.deep_ch_id = dp.deep_ch_id
+        AND dau.guild_id = dp.guild_id
+        AND dau.user_id = :user_id
+    WHERE dp.guild_id = :guild_id
+    GROUP BY dp.deep_guild_auth
+    ORDER BY 1, 4, 5, 7
+""")
+def get_user_alert_state(db, user_id, guild_id=None):
+    rows = db.execute(GET_USER_ALERT_STATE, {
+        "user_id": str(user_id),
+        "guild_id": str(guild_id) if guild_id else None
+    }).fetchall()
+
+    state = {
+        'guild_id': guild_id,
+        'alert_list': {},   # {alert_type: [alert]} - 기본/요일 알림 선택지
+        'user_alerts': [],  # 사용자가 구독 중인 알림 (get_user_alerts와 동일한 형식)
+        'deep_alerts': {}   # {deep_guild_auth: 구독 여부}
+    }
+    for kind, alert_id, interval, alert_type, alert_time, subscribed, deep_guild_auth in rows:
+        if kind == 'deep':
+            state['deep_alerts'][deep_guild_auth] = bool(subscribed)
+            continue
+
+        alert = {
+            'alert_id': alert_id,
+            'interval': interval,
+            'alert_type': alert_type,
+            'alert_time': alert_time
+        }
+        if alert_type in REGULAR_ALERT_TYPES:
+            state['alert_list'].setdefault(alert_type, []).append(alert)
+        if subscribed:
+            state['user_alerts'].append(alert)
+    return state
+
+
 # Check if a user has subscribed to an alert
 CHECK_USER_ALERT = text("""
     SELECT COUNT(*)
@@ -138,19 +197,86 @@ def remove_user_alert(db, user_id, alert_id):
     return result.rowcount > 0
 
 
-# Create custom alert
-CREATE_CUSTOM_ALERT = text("""
-    INSERT INTO alert (alert_type, alert_time, interval)
-    VALUES (:alert_type, :alert_time, :interval)
+# 알림 유형 단위 구독 일괄 변경 - 원하는 구독 집합을 받아 삭제/추가를 한 번의 쿼리로 처리
+# alert_ids: 선택한 알림 ID 목록, selected_types: 해당 유형의 모든 알림을 선택 (요일 알림용)
+SET_USER_ALERTS = text("""
+    WITH desired AS (
+        SELECT alert_id
+        FROM alert
+        WHERE alert_type = ANY(:alert_types)
+        AND (CAST(alert_id AS TEXT) = ANY(:alert_ids) OR alert_type = ANY(:selected_types))
+    ), removed AS (
+        DELETE FROM alert_user au
+        USING alert a
+        WHERE au.alert_id = a.alert_id
+        AND au.user_id = :user_id
+        AND a.alert_type = ANY(:alert_types)
+        AND au.alert_id NOT IN (SELECT alert_id FROM desired)
+        RETURNING au.alert_id
+    ), added AS (
+        INSERT INTO alert_user (user_id, alert_id)
+        SELECT :user_id, alert_id FROM desired
+        ON CONFLICT (user_id, alert_id) DO NOTHING
+        RETURNING alert_id
+    )
+    SELECT 'current', alert_id FROM desired
+    UNION ALL
+    SELECT 'added', alert_id FROM added
+    UNION ALL
+    SELECT 'removed', alert_id FROM removed
+""")
+def set_user_alerts(db, user_id, alert_types, alert_ids=None, selected_types=None):
+    rows = db.execute(SET_USER_ALERTS, {
+        "user_id": str(user_id),
+        "alert_types": list(alert_types),
+        "alert_ids": [str(alert_id) for alert_id in alert_ids or []],
+        "selected_types": list(selected_types or [])
+    }).fetchall()
+    result = {'alert_ids': [], 'added': [], 'removed': []}
+    for kind, alert_id in rows:
+        result['alert_ids' if kind == 'current' else kind].append(alert_id)
+    return result
+
+
+# 커스텀 알림 조회 또는 생성 - 같은 (시간, 주기, 요일) 정의는 모든 사용자가 하나의 알림을 공유
+# 요일은 alert_type(custom_[day])에 포함되므로 (alert_type, alert_time, interval)로 중복 판단
+# 기존 알림은 FOR KEY SHARE로 잠가서, 구독을 추가하기 전에 remove_user_custom_alert가
+# 고아 알림으로 보고 지우지 못하게 함 (삭제 쪽 FOR UPDATE는 이 트랜잭션이 끝날 때까지 대기)
+LOCK_EXISTING_CUSTOM_ALERT = text("""
+    SELECT alert_id
+    FROM alert
+    WHERE alert_type = :alert_type
+    AND alert_time = :alert_time
+    AND interval = :interval
+    FOR KEY SHARE
+""")
+INSERT_CUSTOM_ALERT = text("""
+    INSERT INTO alert (alert_type, alert_time, interval, weekday)
+    VALUES (:alert_type, :alert_time, :interval, :weekday)
+    ON CONFLICT (alert_type, alert_time, interval) WHERE alert_type LIKE 'custom%' DO NOTHING
     RETURNING alert_id
 """)
-def create_custom_alert(db, alert_time, interval='day', alert_type='custom'):
-    row = db.execute(CREATE_CUSTOM_ALERT, {
+GET_OR_CREATE_RETRIES = 3
+def get_or_create_custom_alert(db, alert_time, interval='day', alert_type='custom'):
+    """반환: 알림 ID (호출한 쪽에서 같은 트랜잭션으로 구독 추가 후 commit)"""
+    # custom_[day] 형식에서 요일 추출 (매주 알림만)
+    weekday = WEEKDAY_INDEX.get(alert_type[7:]) if interval == 'week' else None
+    params = {
         "alert_time": alert_time,
         "interval": interval,
-        "alert_type": alert_type
-    }).fetchone()
-    return row[0] if row else None
+        "alert_type": alert_type,
+        "weekday": weekday
+    }
+    for _ in range(GET_OR_CREATE_RETRIES):
+        row = db.execute(LOCK_EXISTING_CUSTOM_ALERT, params).fetchone()
+        if row:
+            return row[0]
+        # 없으면 생성 - 다른 트랜잭션이 먼저 만들었거나 잠금 대기 중 삭제된 경우 다시 조회
+        row = db.execute(INSERT_CUSTOM_ALERT, params).fetchone()
+        if row:
+            return row[0]
+    logger.error(f"Error getting or creating custom alert: {alert_type} {alert_time} {interval}")
+    return None
 
 
 # Delete custom alert
@@ -171,6 +297,75 @@ def delete_custom_alert(db, alert_id):
         return None
 
 
+# 커스텀 알림 행 잠금 - 같은 알림의 구독자들이 동시에 삭제해도 마지막 구독자가 고아 알림을 정리하도록
+# 삭제 쿼리보다 먼저 별도 문장으로 실행해야 함 (잠금을 기다린 뒤 시작하는 다음 문장이 먼저 커밋된 삭제를 봄)
+LOCK_CUSTOM_ALERT = text("""
+    SELECT alert_id
+    FROM alert
+    WHERE alert_id = :alert_id
+    AND (alert_type = 'custom' OR alert_type LIKE 'custom_%')
+    FOR UPDATE
+""")
+
+# 내 커스텀 알림 삭제 - 소유 확인, 구독 삭제, 고아 알림 정리, 남은 커스텀 알림 조회를 한 번에 처리
+# (한 쿼리 안의 CTE는 같은 스냅샷을 보므로 다른 구독자/남은 알림 확인 시 삭제 대상을 직접 제외)
+REMOVE_USER_CUSTOM_ALERT = text("""
+    WITH removed AS (
+        DELETE FROM alert_user au
+        USING alert a
+        WHERE au.alert_id = a.alert_id
+        AND au.user_id = :user_id
+        AND au.alert_id = :alert_id
+        AND (a.alert_type = 'custom' OR a.alert_type LIKE 'custom_%')
+        RETURNING au.alert_id
+    ), orphaned AS (
+        DELETE FROM alert a
+        USING removed r
+        WHERE a.alert_id = r.alert_id
+        AND NOT EXISTS (
+            SELECT 1 FROM alert_user au
+            WHERE au.alert_id = a.alert_id
+            AND au.user_id <> :user_id
+        )
+        RETURNING a.alert_id
+    )
+    SELECT 'removed' AS kind, alert_id, NULL AS interval, NULL AS alert_type, NULL::time AS alert_time
+    FROM removed
+    UNION ALL
+    SELECT 'orphaned', alert_id, NULL, NULL, NULL
+    FROM orphaned
+    UNION ALL
+    SELECT 'remaining', a.alert_id, a.interval, a.alert_type, a.alert_time
+    FROM alert_user au
+    JOIN alert a ON a.alert_id = au.alert_id
+    WHERE au.user_id = :user_id
+    AND au.alert_id <> :alert_id
+    AND (a.alert_type = 'custom' OR a.alert_type LIKE 'custom_%')
+    ORDER BY 1, 4, 5
+""")
+def remove_user_custom_alert(db, user_id, alert_id):
+    """알림 행을 잠근 뒤 삭제 (잠금은 호출한 쪽의 commit/rollback까지 유지)"""
+    result = {'removed': False, 'orphaned': False, 'custom_alerts': []}
+    if db.execute(LOCK_CUSTOM_ALERT, {"alert_id": alert_id}).fetchone() is None:
+        return result
+
+    rows = db.execute(REMOVE_USER_CUSTOM_ALERT, {
+        "user_id": str(user_id),
+        "alert_id": alert_id
+    }).fetchall()
+    for kind, row_alert_id, interval, alert_type, alert_time in rows:
+        if kind == 'remaining':
+            result['custom_alerts'].append({
+                'alert_id': row_alert_id,
+                'interval': interval,
+                'alert_type': alert_type,
+                'alert_time': alert_time
+            })
+        else:
+            result[kind] = True
+    return result
+
+
 # Get alert by time (for notification sending)
 GET_alert_BY_TIME = text("""
     SELECT a.alert_id, a.alert_type, a.alert_time, a.interval, au.user_id
@@ -179,13 +374,13 @@ GET_alert_BY_TIME = text("""
     WHERE a.alert_time = :alert_time
     AND (
         (a.interval = 'day') OR
-        (a.interval = 'week' AND a.alert_type = :day_of_week)
+        (a.interval = 'week' AND a.weekday = :weekday AND a.alert_type NOT LIKE 'custom%')
     )
 """)
 def get_alert_by_time(db, alert_time, day_of_week):
     list = db.execute(GET_alert_BY_TIME, {
         "alert_time": alert_time,
-        "day_of_week": day_of_week
+        "weekday": WEEKDAY_INDEX.get(day_of_week)
     }).fetchall()
     return [{
         'alert_id': row[0],
@@ -201,19 +396,16 @@ GET_UPCOMING_alert = text("""
     SELECT a.alert_id, a.alert_type, a.alert_time, a.interval, au.user_id
     FROM alert a
     JOIN alert_user au ON a.alert_id = au.alert_id
-    WHERE 
-        CASE 
-            WHEN a.interval = 'day' THEN true
-            WHEN a.interval = 'week' AND a.alert_type = :day_of_week THEN true
-            WHEN a.interval = 'week' AND a.alert_type = 'custom_' || :day_of_week THEN true
-            ELSE false
-        END
-    AND a.alert_time = :alert_time
+    WHERE a.alert_time = :alert_time
+    AND (
+        (a.interval = 'day') OR
+        (a.interval = 'week' AND a.weekday = :weekday)
+    )
 """)
 def get_upcoming_alerts(db, alert_time, day_of_week):
     list = db.execute(GET_UPCOMING_alert, {
         "alert_time": alert_time,
-        "day_of_week": day_of_week
+        "weekday": WEEKDAY_INDEX.get(day_of_week)
     }).fetchall()
     return [{
         'alert_id': row[0],
@@ -240,6 +240,14 @@ def select_voice_channels(db, guild_id):
         logger.error(f"음성채널 ID 목록 조회 중 오류: {e}")
         return []
 
+# 전체 길드의 음성채널 부모채널 ID 조회 (시작 시 캐시 채우기)
+SELECT_ALL_VOICE_CHANNELS = text("""
+    SELECT guild_id, parents_voice_ch_id
+    FROM guilds_voice_ch
+""")
+def select_all_voice_channels(db):
+    return db.execute(SELECT_ALL_VOICE_CHANNELS).fetchall()
+
 # 음성채널 추가
 INSERT_VOICE_CHANNEL = text("""
     INSERT INTO guilds_voice_ch (
@@ -341,4 +349,51 @@ def select_chatbot_channel(db, guild_id):
     result = db.execute(SELECT_CHATBOT_CHANNEL, {
         "guild_id": str(guild_id)
     }).fetchone()
-    return result[0] if result else None
\ No newline at end of file
+    return result[0] if result else None
+
+# LLM 기능 사용량 한도 조회 (NULL이면 기본값 사용)
+SELECT_GUILD_LLM_QUOTA = text('''
+    SELECT
+        llm_requests_per_hour,
+        llm_tokens_per_hour,
+        llm_user_requests_per_hour,
+        llm_user_tokens_per_hour
+    FROM guilds
+    WHERE guild_id = :guild_id
+''')
+
+def select_guild_llm_quota(db, guild_id):
+    """특정 길드의 LLM 사용량 한도 조회"""
+    row = db.execute(SELECT_GUILD_LLM_QUOTA, {
+        "guild_id": str(guild_id)
+    }).fetchone()
+    if not row:
+        return {}
+    return {
+        'guild_requests': row[0],
+        'guild_tokens': row[1],
+        'user_requests': row[2],
+        'user_tokens': row[3]
+    }
+
+# LLM 기능 사용량 한도 설정 (NULL로 설정하면 기본값 사용)
+UPDATE_GUILD_LLM_QUOTA = text('''
+    UPDATE guilds
+    SET llm_requests_per_hour = :guild_requests,
+        llm_tokens_per_hour = :guild_tokens,
+        llm_user_requests_per_hour = :user_requests,
+        llm_user_tokens_per_hour = :user_tokens,
+        update_dt = now()
+    WHERE guild_id = :guild_id
+    RETURNING guild_id
+''')
+
+def update_guild_llm_quota(db, guild_id, guild_requests=None, guild_tokens=None, user_requests=None, user_tokens=None):
+    """특정 길드의 LLM 사용량 한도 설정"""
+    return db.execute(UPDATE_GUILD_LLM_QUOTA, {
+        "guild_id": str(guild_id),
+        "guild_requests": guild_requests,
+        "guild_tokens": guild_tokens,
+        "user_requests": user_requests,
+        "user_tokens": user_tokens
+    }).fetchone()
@@ -0,0 +1,208 @@
+from datetime import timedelta
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 캐릭터별 일간 랭킹 기록 (rank_daily_history, 기본 DB)
+# 원본 스냅샷은 rank_data에서 읽기만 하고 (select_ranking_daily_rollup) 합친 결과를 여기에 저장
+# 서버별 캐릭터 이름 목록(rank_character_names)도 같은 반영에서 갱신
+
+# 반영 시작 위치 기록 (처음 한 번, 여러 봇이 동시에 넣어도 한 줄만 남음)
+INSERT_ROLLUP_STATE = text("""
+    INSERT INTO rank_rollup_state (id, last_retrieved_at)
+    VALUES (1, :last_retrieved_at)
+    ON CONFLICT (id) DO NOTHING
+""")
+def insert_rollup_state(db, last_retrieved_at):
+    db.execute(INSERT_ROLLUP_STATE, {"last_retrieved_at": last_retrieved_at})
+
+
+SELECT_ROLLUP_STATE_EXISTS = text("""
+    SELECT EXISTS (SELECT 1 FROM rank_rollup_state WHERE id = 1)
+""")
+def rollup_state_exists(db):
+    return db.execute(SELECT_ROLLUP_STATE_EXISTS).scalar()
+
+
+# 반영 구간 잠금 (봇이 여러 개 떠 있어도 한 곳에서만 반영)
+# 마지막 처리 시각부터 최대 6시간
+# 수집기 트랜잭션이 늦게 커밋되면 retrieved_at이 과거 시각으로 들어오므로 최근 15분은 다음 주기로 미룸
+# (두 DB 서버의 시각 차이도 이 여유 안에서 흡수)
+SELECT_ROLLUP_RANGE = text("""
+    SELECT
+        last_retrieved_at AS range_start
+        , LEAST(last_retrieved_at + INTERVAL '6 hours', NOW() - INTERVAL '15 minutes') AS range_end
+    FROM rank_rollup_state
+    WHERE id = 1
+    FOR UPDATE SKIP LOCKED
+""")
+def lock_rollup_range(db):
+    """
+    다음 반영 구간을 잠그고 반환 (잠금은 호출한 쪽의 commit/rollback까지 유지)
+    반환: {'range_start', 'range_end', 'caught_up'} / 다른 곳에서 반영 중이거나 새 구간이 없으면 None
+    """
+    state = db.execute(SELECT_ROLLUP_RANGE).fetchone()
+    if state is None or state.range_end <= state.range_start:
+        return None
+    return {
+        "range_start": state.range_start,
+        "range_end": state.range_end,
+        # 6시간보다 짧은 구간이면 최신까지 따라잡은 것
+        "caught_up": state.range_end < state.range_start + timedelta(hours=6)
+    }
+
+
+UPDATE_ROLLUP_STATE = text("""
+    UPDATE rank_rollup_state
+    SET last_retrieved_at = :range_end
+    WHERE id = 1
+""")
+def update_rollup_state(db, range_end):
+    db.execute(UPDATE_ROLLUP_STATE, {"range_end": range_end})
+
+
+# 구간별로 합친 기록을 일간 기록에 반영 (같은 날은 최고 기록/마지막 기록만 갱신)
+UPSERT_RANK_DAILY_HISTORY = text("""
+    INSERT INTO rank_daily_history AS d (
+        server_name, character_name, rank_date, class_name,
+        best_rank, last_rank, max_power, last_power, last_retrieved_at
+    )
+    SELECT * FROM unnest(
+        CAST(:server_names AS TEXT[]),
+        CAST(:character_names AS TEXT[]),
+        CAST(:rank_dates AS DATE[]),
+        CAST(:class_names AS TEXT[]),
+        CAST(:best_ranks AS INTEGER[]),
+        CAST(:last_ranks AS INTEGER[]),
+        CAST(:max_powers AS BIGINT[]),
+        CAST(:last_powers AS BIGINT[]),
+        CAST(:last_retrieved_ats AS TIMESTAMPTZ[])
+    )
+    ON CONFLICT (server_name, character_name, rank_date) DO UPDATE SET
+        best_rank = LEAST(d.best_rank, EXCLUDED.best_rank)
+        , max_power = GREATEST(d.max_power, EXCLUDED.max_power)
+        , class_name = CASE WHEN EXCLUDED.last_retrieved_at >= d.last_retrieved_at THEN EXCLUDED.class_name ELSE d.class_name END
+        , last_rank = CASE WHEN EXCLUDED.last_retrieved_at >= d.last_retrieved_at THEN EXCLUDED.last_rank ELSE d.last_rank END
+        , last_power = CASE WHEN EXCLUDED.last_retrieved_at >= d.last_retrieved_at THEN EXCLUDED.last_power ELSE d.last_power END
+        , last_retrieved_at = GREATEST(d.last_retrieved_at, EXCLUDED.last_retrieved_at)
+""")
+def upsert_rank_daily_history(db, rows):
+    """rows: select_ranking_daily_rollup 결과"""
+    if not rows:
+        return
+    db.execute(UPSERT_RANK_DAILY_HISTORY, {
+        "server_names": [row['server_name'] for row in rows],
+        "character_names": [row['character_name'] for row in rows],
+        "rank_dates": [row['rank_date'] for row in rows],
+        "class_names": [row['class_name'] for row in rows],
+        "best_ranks": [row['best_rank'] for row in rows],
+        "last_ranks": [row['last_rank'] for row in rows],
+        "max_powers": [row['max_power'] for row in rows],
+        "last_powers": [row['last_power'] for row in rows],
+        "last_retrieved_ats": [row['last_retrieved_at'] for row in rows]
+    })
+
+
+# 반영 구간에 나온 캐릭터 이름을 이름 목록에 추가 (이미 있으면 마지막 기록 시각만 갱신)
+UPSERT_RANK_CHARACTER_NAMES = text("""
+    INSERT INTO rank_character_names AS n (server_name, character_name, last_seen_at)
+    SELECT server_name, character_name, MAX(last_retrieved_at)
+    FROM unnest(
+        CAST(:server_names AS TEXT[]),
+        CAST(:character_names AS TEXT[]),
+        CAST(:last_retrieved_ats AS TIMESTAMPTZ[])
+    ) AS r(server_name, character_name, last_retrieved_at)
+    GROUP BY server_name, character_name
+    ON CONFLICT (server_name, character_name) DO UPDATE SET
+        last_seen_at = EXCLUDED.last_seen_at
+    WHERE n.last_seen_at < EXCLUDED.last_seen_at
+""")
+def upsert_rank_character_names(db, rows):
+    """rows: select_ranking_daily_rollup 결과"""
+    if not rows:
+        return
+    db.execute(UPSERT_RANK_CHARACTER_NAMES, {
+        "server_names": [row['server_name'] for row in rows],
+        "character_names": [row['character_name'] for row in rows],
+        "last_retrieved_ats": [row['last_retrieved_at'] for row in rows]
+    })
+
+
+# 서버별 캐릭터 이름 앞부분 검색 (기본 키 인덱스, "C" 정렬이라 LIMIT개를 찾으면 바로 멈춤)
+SELECT_CHARACTER_NAMES_BY_PREFIX = text("""
+    SELECT character_name
+    FROM rank_character_names
+    WHERE server_name = :server
+    AND character_name LIKE :pattern
+    ORDER BY character_name
+    LIMIT :limit
+""")
+
+# 서버별 캐릭터 이름 유사도 검색 (idx_rank_character_names_trgm, 오타 추천)
+# 거리(<->) 순으로 인덱스를 읽으므로 비슷한 이름 LIMIT개만 확인
+SELECT_CHARACTER_NAMES_BY_SIMILARITY = text("""
+    SELECT character_name
+    FROM rank_character_names
+    WHERE server_name = :server
+    AND character_name % :query
+    ORDER BY character_name <-> :query, character_name
+    LIMIT :limit
+""")
+def search_character_names(db, server, query, limit=25):
+    """
+    캐릭터 이름 검색 - 앞부분이 일치하는 이름 먼저, 모자라면 비슷한 이름으로 채움
+    유사도 검색이 실패해도 (pg_trgm 미설치 등) 앞부분 검색 결과는 그대로 반환
+    반환: 이름 목록
+    """
+    # LIKE 특수문자는 그대로 검색되도록 이스케이프
+    pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    names = [row.character_name for row in db.execute(SELECT_CHARACTER_NAMES_BY_PREFIX, {
+        "server": server,
+        "pattern": pattern,
+        "limit": limit
+    }).fetchall()]
+
+    # 유사도 검색은 3글자(트라이그램) 이상일 때만 의미가 있음
+    if len(names) < limit and len(query) >= 3:
+        try:
+            rows = db.execute(SELECT_CHARACTER_NAMES_BY_SIMILARITY, {
+                "server": server,
+                "query": query,
+                "limit": limit
+            }).fetchall()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"캐릭터 이름 유사도 검색 실패, 앞부분 검색 결과만 사용: {str(e)}")
+            return names
+
+        for row in rows:
+            if row.character_name not in names:
+                names.append(row.character_name)
+            if len(names) >= limit:
+                break
+    return names
+
+
+# 캐릭터 일간 기록 (최근 days일)
+SELECT_CHARACTER_DAILY_HISTORY = text("""
+    SELECT
+        rank_date
+        , class_name
+        , best_rank
+        , last_rank
+        , max_power
+        , last_power
+    FROM rank_daily_history
+    WHERE server_name = :server
+    AND character_name = :character
+    AND rank_date >= (NOW() AT TIME ZONE 'Asia/Seoul')::date - :days
+    ORDER BY rank_date
+""")
+def select_character_daily_history(db, server, character, days=30):
+    rows = db.execute(SELECT_CHARACTER_DAILY_HISTORY, {
+        "server": server,
+        "character": character,
+        "days": days
+    }).fetchall()
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,252 @@
+from sqlalchemy import text
+
+# 랭킹 데이터 (rank_data DB, RankSessionLocal 사용)
+# mabinogi_ranking 조회는 (server_name, character_name, retrieved_at DESC) 인덱스를 사용
+# (db/migrations/005_rank_lookup_index.sql)
+
+# 최근 15분 이내 갱신된 캐릭터 랭킹 조회
+# age_seconds: 수집 후 지난 시간 (DB 시각 기준, 캐시 유효 시간 계산용)
+SELECT_RECENT_CHARACTER_RANK = text("""
+    SELECT
+        character_name
+        , server_name
+        , class_name
+        , TO_CHAR(rank_position, 'FM999,999,999') || '위' AS rank_position
+        , TO_CHAR(power_value, 'FM999,999,999') AS power_value
+        , change_amount
+        , change_type
+        , retrieved_at
+        , EXTRACT(EPOCH FROM NOW() - retrieved_at) AS age_seconds
+    FROM mabinogi_ranking
+    WHERE server_name = :server
+    AND character_name = :character
+    AND retrieved_at >= NOW() - INTERVAL '15 minutes'
+    ORDER BY retrieved_at DESC
+    LIMIT 1
+""")
+def select_recent_character_rank(db, server, character):
+    row = db.execute(SELECT_RECENT_CHARACTER_RANK, {
+        "server": server,
+        "character": character
+    }).fetchone()
+    return dict(row._mapping) if row else None
+
+# 여러 캐릭터의 최근 15분 이내 랭킹을 한 번에 조회 (캐릭터별 최신 1건)
+SELECT_RECENT_CHARACTER_RANKS = text("""
+    SELECT DISTINCT ON (character_name)
+        character_name
+        , server_name
+        , class_name
+        , TO_CHAR(rank_position, 'FM999,999,999') || '위' AS rank_position
+        , TO_CHAR(power_value, 'FM999,999,999') AS power_value
+        , change_amount
+        , change_type
+        , retrieved_at
+        , EXTRACT(EPOCH FROM NOW() - retrieved_at) AS age_seconds
+    FROM mabinogi_ranking
+    WHERE server_name = :server
+    AND character_name = ANY(:characters)
+    AND retrieved_at >= NOW() - INTERVAL '15 minutes'
+    ORDER BY character_name, retrieved_at DESC
+""")
+def select_recent_character_ranks(db, server, characters):
+    """반환: {캐릭터 이름: 랭킹} (15분 이내 데이터가 없는 캐릭터는 제외)"""
+    if not characters:
+        return {}
+    rows = db.execute(SELECT_RECENT_CHARACTER_RANKS, {
+        "server": server,
+        "characters": list(characters)
+    }).fetchall()
+    return {row.character_name: dict(row._mapping) for row in rows}
+
+# 랭킹에 있는 서버 목록 (server_name 인덱스를 건너뛰며 읽어 테이블 전체를 훑지 않음)
+SELECT_RANK_SERVERS = text("""
+    WITH RECURSIVE servers AS (
+        SELECT MIN(server_name) AS server_name FROM mabinogi_ranking
+        UNION ALL
+        SELECT (
+            SELECT MIN(server_name) FROM mabinogi_ranking
+            WHERE server_name > servers.server_name
+        )
+        FROM servers
+        WHERE servers.server_name IS NOT NULL
+    )
+    SELECT server_name FROM servers WHERE server_name IS NOT NULL
+""")
+def select_rank_servers(db):
+    rows = db.execute(SELECT_RANK_SERVERS).fetchall()
+    return [row.server_name for row in rows]
+
+# 랭킹에 한 번이라도 기록된 캐릭터인지 확인
+# 이름마다 idx_mabinogi_ranking_lookup을 한 번 탐색하고 첫 행에서 멈춤 (스냅샷 전체를 읽지 않음)
+# 이름 목록(rank_character_names)은 반영 주기만큼 늦으므로 방금 랭킹에 오른 캐릭터도 찾도록 원본에서 확인
+SELECT_KNOWN_CHARACTERS = text("""
+    SELECT names.character_name
+    FROM unnest(CAST(:characters AS TEXT[])) AS names(character_name)
+    WHERE EXISTS (
+        SELECT 1
+        FROM mabinogi_ranking
+        WHERE server_name = :server
+        AND character_name = names.character_name
+        LIMIT 1
+    )
+""")
+def select_known_characters(db, server, characters):
+    """반환: 랭킹 데이터에 있는 캐릭터 이름 집합"""
+    if not characters:
+        return set()
+    rows = db.execute(SELECT_KNOWN_CHARACTERS, {
+        "server": server,
+        "characters": list(set(characters))
+    }).fetchall()
+    return {row.character_name for row in rows}
+
+# 순위표 스냅샷 기준 시각 (서버의 가장 최근 수집 묶음)
+# 수집기는 한 번 수집한 순위표를 같은 retrieved_at으로 저장하지만 캐릭터 한 명씩 따로 들어오는 줄도 있으므로
+# 최근 15분 안에서 줄 수가 가장 많은 retrieved_at을 고름 (같으면 최신) - 메시지마다 한 번만 조회
+SELECT_LATEST_SNAPSHOT = text("""
+    SELECT retrieved_at AS snapshot_at
+    FROM mabinogi_ranking
+    WHERE server_name = :server
+    AND retrieved_at > (
+        SELECT MAX(retrieved_at) FROM mabinogi_ranking WHERE server_name = :server
+    ) - INTERVAL '15 minutes'
+    GROUP BY retrieved_at
+    ORDER BY COUNT(*) DESC, retrieved_at DESC
+    LIMIT 1
+""")
+def select_latest_snapshot(db, server):
+    return db.execute(SELECT_LATEST_SNAPSHOT, {"server": server}).scalar()
+
+# 스냅샷의 클래스 목록
+SELECT_SNAPSHOT_CLASSES = text("""
+    SELECT DISTINCT class_name
+    FROM mabinogi_ranking
+    WHERE server_name = :server
+    AND retrieved_at = :snapshot_at
+    ORDER BY class_name
+""")
+def select_snapshot_classes(db, server, snapshot_at):
+    rows = db.execute(SELECT_SNAPSHOT_CLASSES, {"server": server, "snapshot_at": snapshot_at}).fetchall()
+    return [row.class_name for row in rows if row.class_name]
+
+# 순위표 한 페이지 (keyset) - 이전 페이지의 마지막 (순위, 이름) 다음부터 limit개
+# idx_mabinogi_ranking_leaderboard에서 (서버, 스냅샷, 순위, 이름) 위치로 바로 찾아가 limit개만 읽음 (OFFSET 없음)
+# 같은 순위가 여러 명이어도 페이지 경계에서 빠지거나 겹치지 않도록 이름을 보조 정렬 키로 사용
+SELECT_LEADERBOARD_PAGE = text("""
+    SELECT
+        rank_position
+        , character_name
+        , class_name
+        , TO_CHAR(power_value, 'FM999,999,999') AS power_value
+        , change_amount
+        , change_type
+    FROM mabinogi_ranking
+    WHERE server_name = :server
+    AND retrieved_at = :snapshot_at
+    AND (rank_position, character_name) > (:after_rank, :after_name)
+    AND (CAST(:class_name AS TEXT) IS NULL OR class_name = :class_name)
+    ORDER BY rank_position, character_name
+    LIMIT :limit
+""")
+def select_leaderboard_page(db, server, snapshot_at, after=(0, ""), class_name=None, limit=10):
+    """
+    after: 이전 페이지 마지막 줄의 (rank_position, character_name), 첫 페이지는 (0, "")
+    반환: 순위 목록 (rank_position, character_name 오름차순)
+    """
+    after_rank, after_name = after
+    rows = db.execute(SELECT_LEADERBOARD_PAGE, {
+        "server": server,
+        "snapshot_at": snapshot_at,
+        "after_rank": after_rank,
+        "after_name": after_name,
+        "class_name": class_name,
+        "limit": limit
+    }).fetchall()
+    return [dict(row._mapping) for row in rows]
+
+# 일간 기록 반영 시작 위치 (처음 반영할 때 한 번, 가장 오래된 스냅샷 시각)
+SELECT_OLDEST_SNAPSHOT = text("""
+    SELECT MIN(retrieved_at) FROM mabinogi_ranking
+""")
+def select_oldest_snapshot(db):
+    return db.execute(SELECT_OLDEST_SNAPSHOT).scalar()
+
+# 구간 내 스냅샷을 캐릭터/날짜(한국 시간)별로 합침 (idx_mabinogi_ranking_retrieved_at)
+# 읽기만 하고 결과는 기본 DB의 일간 기록에 저장 (queries/rank_history_query.py)
+SELECT_RANKING_DAILY_ROLLUP = text("""
+    SELECT
+        server_name
+        , character_name
+        , (retrieved_at AT TIME ZONE 'Asia/Seoul')::date AS rank_date
+        , (ARRAY_AGG(class_name ORDER BY retrieved_at DESC))[1] AS class_name
+        , MIN(rank_position) AS best_rank
+        , (ARRAY_AGG(rank_position ORDER BY retrieved_at DESC))[1] AS last_rank
+        , MAX(power_value) AS max_power
+        , (ARRAY_AGG(power_value ORDER BY retrieved_at DESC))[1] AS last_power
+        , MAX(retrieved_at) AS last_retrieved_at
+    FROM mabinogi_ranking
+    WHERE retrieved_at > :range_start
+    AND retrieved_at <= :range_end
+    GROUP BY server_name, character_name, rank_date
+""")
+def select_ranking_daily_rollup(db, range_start, range_end):
+    """반환: 캐릭터/날짜별 일간 기록 목록"""
+    rows = db.execute(SELECT_RANKING_DAILY_ROLLUP, {
+        "range_start": range_start,
+        "range_end": range_end
+    }).fetchall()
+    return [dict(row._mapping) for row in rows]
+
+# 관심 캐릭터 순위 변동 - 구간(since, until] 안의 마지막 스냅샷과 그 직전(since 이전) 마지막 스냅샷 비교
+# 캐릭터 목록 전체를 한 쿼리로 처리 (캐릭터마다 idx_mabinogi_ranking_lookup 인덱스 탐색)
+SELECT_RANK_CHANGES = text("""
+    SELECT
+        w.server_name
+        , w.character_name
+        , cur.class_name
+        , prev.rank_position AS previous_rank
+        , cur.rank_position AS current_rank
+        , prev.power_value AS previous_power
+        , cur.power_value AS current_power
+        , cur.retrieved_at
+    FROM unnest(
+        CAST(:servers AS TEXT[]),
+        CAST(:characters AS TEXT[])
+    ) AS w(server_name, character_name)
+    CROSS JOIN LATERAL (
+        SELECT class_name, rank_position, power_value, retrieved_at
+        FROM mabinogi_ranking m
+        WHERE m.server_name = w.server_name
+        AND m.character_name = w.character_name
+        AND m.retrieved_at > :since
+        AND m.retrieved_at <= :until
+        ORDER BY m.retrieved_at DESC
+        LIMIT 1
+    ) cur
+    CROSS JOIN LATERAL (
+        SELECT rank_position, power_value
+        FROM mabinogi_ranking m
+        WHERE m.server_name = w.server_name
+        AND m.character_name = w.character_name
+        AND m.retrieved_at <= :since
+        ORDER BY m.retrieved_at DESC
+        LIMIT 1
+    ) prev
+    WHERE cur.rank_position <> prev.rank_position
+""")
+def select_rank_changes(db, characters, since, until):
+    """
+    characters: [(서버, 캐릭터)]
+    반환: 순위가 바뀐 캐릭터 목록 (이전/현재 순위와 전투력)
+    """
+    if not characters:
+        return []
+    servers, names = zip(*characters)
+    rows = db.execute(SELECT_RANK_CHANGES, {
+        "servers": list(servers),
+        "characters": list(names),
+        "since": since,
+        "until": until
+    }).fetchall()
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,119 @@
+from sqlalchemy import text
+
+# 서버(길드)별 랭크 관심 캐릭터 (rank_watchlist, 기본 DB)
+
+# 전체 관심 캐릭터 (시작 시 미리 조회 목록 불러오기)
+SELECT_ALL_RANK_WATCHES = text("""
+    SELECT guild_id, server_name, character_name
+    FROM rank_watchlist
+""")
+def select_all_rank_watches(db):
+    return db.execute(SELECT_ALL_RANK_WATCHES).fetchall()
+
+
+SELECT_RANK_WATCHLIST = text("""
+    SELECT server_name, character_name, create_user_id, create_dt
+    FROM rank_watchlist
+    WHERE guild_id = :guild_id
+    ORDER BY create_dt
+""")
+def select_rank_watchlist(db, guild_id):
+    rows = db.execute(SELECT_RANK_WATCHLIST, {"guild_id": str(guild_id)}).fetchall()
+    return [dict(row._mapping) for row in rows]
+
+
+INSERT_RANK_WATCH = text("""
+    INSERT INTO rank_watchlist (
+        guild_id,
+        server_name,
+        character_name,
+        create_user_id
+    ) VALUES (
+        :guild_id,
+        :server_name,
+        :character_name,
+        :create_user_id
+    )
+    ON CONFLICT (guild_id, server_name, character_name) DO NOTHING
+    RETURNING guild_id
+""")
+def insert_rank_watch(db, guild_id, server_name, character_name, user_id):
+    """반환: 새로 추가했으면 True, 이미 있으면 False"""
+    return db.execute(INSERT_RANK_WATCH, {
+        "guild_id": str(guild_id),
+        "server_name": server_name,
+        "character_name": character_name,
+        "create_user_id": str(user_id)
+    }).fetchone() is not None
+
+
+DELETE_RANK_WATCH = text("""
+    DELETE FROM rank_watchlist
+    WHERE guild_id = :guild_id
+      AND server_name = :server_name
+      AND character_name = :character_name
+""")
+def delete_rank_watch(db, guild_id, server_name, character_name):
+    """반환: 삭제했으면 True"""
+    return db.execute(DELETE_RANK_WATCH, {
+        "guild_id": str(guild_id),
+        "server_name": server_name,
+        "character_name": character_name
+    }).rowcount > 0
+
+
+# 랭크 변동 알림 채널 (rank_notify_channel)
+SELECT_RANK_NOTIFY_CHANNELS = text("""
+    SELECT guild_id, channel_id, min_change, last_notified_at
+    FROM rank_notify_channel
+""")
+def select_rank_notify_channels(db):
+    return db.execute(SELECT_RANK_NOTIFY_CHANNELS).fetchall()
+
+
+UPSERT_RANK_NOTIFY_CHANNEL = text("""
+    INSERT INTO rank_notify_channel (
+        guild_id,
+        channel_id,
+        min_change
+    ) VALUES (
+        :guild_id,
+        :channel_id,
+        :min_change
+    )
+    ON CONFLICT (guild_id)
+    DO UPDATE SET
+        channel_id = :channel_id,
+        min_change = :min_change,
+        update_dt = now()
+""")
+def upsert_rank_notify_channel(db, guild_id, channel_id, min_change):
+    db.execute(UPSERT_RANK_NOTIFY_CHANNEL, {
+        "guild_id": str(guild_id),
+        "channel_id": str(channel_id),
+        "min_change": min_change
+    })
+
+
+# 알림 위치 갱신 (알림을 보낸 뒤에만 호출, 뒤로는 옮기지 않음)
+UPDATE_RANK_NOTIFIED_AT = text("""
+    UPDATE rank_notify_channel
+    SET last_notified_at = :until
+    WHERE guild_id = ANY(:guild_ids)
+    AND (last_notified_at IS NULL OR last_notified_at < :until)
+""")
+def update_rank_notified_at(db, guild_ids, until):
+    if not guild_ids:
+        return
+    db.execute(UPDATE_RANK_NOTIFIED_AT, {
+        "guild_ids": [str(guild_id) for guild_id in guild_ids],
+        "until": until
+    })
+
+
+DELETE_RANK_NOTIFY_CHANNEL = text("""
+    DELETE FROM rank_notify_channel
+    WHERE guild_id = :guild_id
+""")
+def delete_rank_notify_channel(db, guild_id):
+    return db.execute(DELETE_RANK_NOTIFY_CHANNEL, {"guild_id": str(guild_id)}).rowcount > 0
@@ -0,0 +1,55 @@
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 요약 읽은 위치 (summary_read_position)
+# message_id는 디스코드 스노우플레이크 (BIGINT)
+
+# 최근에 갱신된 읽은 위치 조회 (시작 시 캐시 채우기)
+SELECT_READ_POSITIONS = text("""
+    SELECT channel_id, user_id, message_id
+    FROM summary_read_position
+    ORDER BY updated_at DESC
+    LIMIT :limit
+""")
+def select_read_positions(db, limit):
+    try:
+        return db.execute(SELECT_READ_POSITIONS, {"limit": limit}).fetchall()
+    except Exception as e:
+        logger.error(f"Error selecting summary read positions: {e}")
+        return []
+
+
+# 읽은 위치 일괄 저장 - 더 오래된 위치로 덮어쓰지 않음
+UPSERT_READ_POSITIONS = text("""
+    INSERT INTO summary_read_position (channel_id, user_id, message_id)
+    SELECT * FROM unnest(
+        CAST(:channel_ids AS TEXT[]),
+        CAST(:user_ids AS TEXT[]),
+        CAST(:message_ids AS BIGINT[])
+    )
+    ON CONFLICT (channel_id, user_id)
+    DO UPDATE SET
+        message_id = GREATEST(summary_read_position.message_id, EXCLUDED.message_id),
+        updated_at = now()
+""")
+def upsert_read_positions(db, positions):
+    """
+    positions: [(channel_id, user_id, message_id), ...]
+    반환: 저장 성공 여부 (실패 시 호출한 쪽에서 다시 저장 대기열에 넣음)
+    """
+    if not positions:
+        return True
+    channel_ids, user_ids, message_ids = zip(*positions)
+    try:
+        db.execute(UPSERT_READ_POSITIONS, {
+            "channel_ids": [str(channel_id) for channel_id in channel_ids],
+            "user_ids": [str(user_id) for user_id in user_ids],
+            "message_ids": list(message_ids)
+        })
+        return True
+    except Exception as e:
+        logger.error(f"Error upserting summary read positions: {e}")
+        db.rollback()
+        return False
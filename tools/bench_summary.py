@@ -0,0 +1,222 @@
+"""
+/요약 벤치마크 (실제 DeepSeek API 없이 LLM 대역 서버 사용)
+
+SummaryAssistant의 요약 경로(get_or_create_summary, 빠른 요약)를 메시지 개수/동시 요청 수별로 실행하고
+p50/p99 지연, 이벤트 루프 블로킹 시간, 요청당 토큰을 출력함
+
+실행 (대역 서버를 같은 프로세스에서 띄움):
+    python -m tools.bench_summary --counts 50 100 300 500 --concurrency 1 4 16 --requests 32
+이미 떠 있는 서버 사용:
+    python -m tools.bench_summary --base-url http://127.0.0.1:8089/v1
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+# 설정 로드 전에 벤치마크용 값 지정 (실제 .env 값이 있으면 그대로 사용)
+for name, value in {
+    'DATABASE_URL': '', 'DATABASE_NAME': '', 'DB_PW': '', 'DB_USER': '', 'DB_HOST': '',
+    'DISCORD_TOKEN': '', 'APPLICATION_ID': '0', 'PUBLIC_KEY': '',
+    'OPENAI_API_KEY': 'bench', 'DEEPSEEK_API_KEY': 'bench', 'ENV': 'bench', 'RANK_API_URL': ''
+}.items():
+    os.environ.setdefault(name, value)
+
+from tools.llm_stub_server import StubConfig, start_server  # noqa: E402
+
+BENCH_CHANNEL_ID = 1
+WORDS = [
+    "레이드", "보스", "글렌베르나", "어비스", "심층", "파티", "모집", "오늘밤", "강화", "세공",
+    "경매장", "가격", "던전", "캐릭터", "출발", "9시", "딜러", "힐러", "클리어", "보상"
+]
+NOISE = ["ㅋㅋㅋㅋ", "😂😂", "https://example.com/image.png", "ㅇㅇ"]
+
+
+def make_records(count, seed=0):
+    """합성 대화 레코드 (일부는 이모지/링크 같은 정리 대상)"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        if rng.random() < 0.15:
+            content = rng.choice(NOISE)
+        else:
+            content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 20)))
+        author_id = rng.randint(1, 12)
+        records.append({
+            'id': 10_000 + i,
+            'author_id': author_id,
+            'author_name': f"유저{author_id}",
+            'content': content,
+            'seq': i
+        })
+    return records
+
+
+class LoopMonitor:
+    """이벤트 루프 블로킹 측정 - interval마다 깨어나 예정보다 늦은 시간을 합산"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - expected
+            if lag > 0.001:
+                self.total_lag += lag
+                self.max_lag = max(self.max_lag, lag)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)  # 측정 작업이 먼저 대기 상태에 들어가도록
+
+    async def stop(self):
+        # 블로킹이 끝난 직후의 지연도 기록되도록 한 주기 더 대기
+        await asyncio.sleep(self.interval * 2)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def percentile(samples, ratio):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * ratio))]
+
+
+async def run_case(cog, mode, count, concurrency, total_requests, repeat_key=False):
+    """
+    한 가지 조합 실행 후 결과 반환
+    repeat_key: 모든 요청에 같은 캐시 키 사용 (캐시/합류 효과 측정)
+    """
+    from core.extractive_summary import extract_summary
+
+    records = make_records(count)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+    stats_before = dict(cog.summary_stats)
+
+    async def one(index):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            first_content = None
+
+            async def on_content(_):
+                nonlocal first_content
+                if first_content is None:
+                    first_content = time.perf_counter()
+
+            try:
+                if mode == "quick":
+                    summary = extract_summary(records)
+                else:
+                    # 요청마다 다른 키로 캐시를 피함 (캐시 효과는 --repeat-key로 확인)
+                    key = (BENCH_CHANNEL_ID, records[-1]['id'], count, f"bench:{0 if repeat_key else index}")
+                    summary = await cog.get_or_create_summary(
+                        key, records,
+                        deadline=time.monotonic() + 120,
+                        on_content=on_content if mode == "stream" else None
+                    )
+                if not summary:
+                    failures += 1
+            except Exception:
+                failures += 1
+            finished = first_content or time.perf_counter()
+            latencies.append(finished - started)
+
+    monitor = LoopMonitor()
+    await monitor.start()
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(total_requests)])
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    llm_calls = cog.summary_stats['misses'] - stats_before['misses']
+    tokens = cog.summary_stats['tokens_used'] - stats_before['tokens_used']
+    return {
+        'mode': mode,
+        'count': count,
+        'concurrency': concurrency,
+        'p50': percentile(latencies, 0.5),
+        'p99': percentile(latencies, 0.99),
+        'throughput': total_requests / elapsed,
+        'blocked_total': monitor.total_lag,
+        'blocked_max': monitor.max_lag,
+        'tokens_per_request': tokens / llm_calls if llm_calls else 0,
+        'failures': failures
+    }
+
+
+def print_report(results):
+    header = f"{'mode':<7}{'count':>6}{'conc':>6}{'p50(s)':>9}{'p99(s)':>9}{'req/s':>8}{'block(ms)':>11}{'max(ms)':>9}{'tok/req':>9}{'fail':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['mode']:<7}{r['count']:>6}{r['concurrency']:>6}{r['p50']:>9.3f}{r['p99']:>9.3f}"
+            f"{r['throughput']:>8.2f}{r['blocked_total'] * 1000:>11.1f}{r['blocked_max'] * 1000:>9.1f}"
+            f"{r['tokens_per_request']:>9.0f}{r['failures']:>6}"
+        )
+
+
+async def main(args):
+    runner = None
+    if not args.base_url:
+        config = StubConfig(
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            completion_tokens=args.completion_tokens,
+            failure_rate=args.failure_rate
+        )
+        runner = await start_server(config, port=args.port)
+        os.environ['DEEPSEEK_BASE_URL'] = f"http://127.0.0.1:{args.port}/v1"
+    else:
+        os.environ['DEEPSEEK_BASE_URL'] = args.base_url
+
+    # 환경 변수 지정 후 로드해야 대역 서버 주소를 사용함
+    from cogs.chat_assistant import SummaryAssistant
+
+    cog = SummaryAssistant(bot=None)
+    results = []
+    try:
+        for mode in args.modes:
+            for count in args.counts:
+                for concurrency in args.concurrency:
+                    results.append(await run_case(cog, mode, count, concurrency, args.requests, args.repeat_key))
+                    # 구간 요약 캐시가 다음 조합에 영향 주지 않도록 비움
+                    cog.block_cache.clear()
+                    cog.summary_cache.clear()
+    finally:
+        await cog.llm.close()
+        if runner:
+            await runner.cleanup()
+
+    print_report(results)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="/요약 오프라인 벤치마크")
+    parser.add_argument('--modes', nargs='+', default=['ai', 'stream', 'quick'], choices=['ai', 'stream', 'quick'])
+    parser.add_argument('--counts', nargs='+', type=int, default=[50, 100, 300, 500])
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=16, help="조합마다 보낼 요청 수")
+    parser.add_argument('--repeat-key', action='store_true', help="모든 요청에 같은 캐시 키 사용 (캐시/합류 효과 측정)")
+    parser.add_argument('--base-url', help="이미 실행 중인 OpenAI 호환 서버 주소 (없으면 대역 서버 실행)")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.3)
+    parser.add_argument('--tokens-per-second', type=float, default=200.0)
+    parser.add_argument('--completion-tokens', type=int, default=150)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,189 @@
+"""
+OpenAI 호환 LLM 대역 서버 (요약 기능 오프라인 테스트/벤치마크용)
+
+/v1/chat/completions 만 지원하며 지연 시간, 토큰 생성 속도, 실패를 설정할 수 있음
+
+실행:
+    python -m tools.llm_stub_server --port 8089 --latency 0.8 --tokens-per-second 60 --failure-rate 0.05
+봇/벤치마크에서 사용:
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8089/v1
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+import logging
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from core.prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 응답 문장 (요약 형식과 비슷하게)
+STUB_LINES = [
+    "- 레이드 일정\n오늘 밤 9시에 글렌베르나 레이드를 가기로 함",
+    "- 파티 모집\n딜러 한 자리가 남아 추가 모집 중",
+    "- 장비 강화\n세공 결과와 경매장 시세 이야기가 오감",
+    "- 분위기\n전체적으로 가볍고 즐거운 분위기",
+]
+
+
+@dataclass
+class StubConfig:
+    latency: float = 0.5             # 첫 토큰까지 지연 (초)
+    jitter: float = 0.2              # 지연 변동 폭 (비율)
+    tokens_per_second: float = 80.0  # 토큰 생성 속도
+    completion_tokens: int = 200     # 응답 토큰 수 (max_tokens보다 크면 max_tokens)
+    failure_rate: float = 0.0        # 500 오류 비율
+    rate_limit_rate: float = 0.0     # 429 오류 비율
+    hang_rate: float = 0.0           # 응답하지 않는 요청 비율 (타임아웃 확인용)
+
+
+def _completion_text(tokens):
+    """대략 tokens 토큰 길이의 응답 문장"""
+    text = "\n".join(STUB_LINES)
+    while estimate_tokens(text) < tokens:
+        text += "\n" + random.choice(STUB_LINES)
+    return text[:max(1, tokens)]
+
+
+def _split_tokens(text, tokens):
+    """스트리밍용으로 응답을 tokens개 조각으로 나눔"""
+    size = max(1, len(text) // max(1, tokens))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def create_app(config):
+    app = web.Application()
+    app['config'] = config
+    app['stats'] = {'requests': 0, 'failures': 0, 'prompt_tokens': 0, 'completion_tokens': 0}
+    app.router.add_post('/v1/chat/completions', chat_completions)
+    app.router.add_get('/stats', stats)
+    return app
+
+
+async def stats(request):
+    return web.json_response(request.app['stats'])
+
+
+async def chat_completions(request):
+    config = request.app['config']
+    stats = request.app['stats']
+    body = await request.json()
+    stats['requests'] += 1
+
+    # 실패 주입
+    roll = random.random()
+    if roll < config.hang_rate:
+        await asyncio.sleep(3600)
+    if roll < config.hang_rate + config.failure_rate:
+        stats['failures'] += 1
+        return web.json_response({'error': {'message': 'stub failure', 'type': 'server_error'}}, status=500)
+    if roll < config.hang_rate + config.failure_rate + config.rate_limit_rate:
+        stats['failures'] += 1
+        return web.json_response({'error': {'message': 'stub rate limit', 'type': 'rate_limit'}}, status=429)
+
+    prompt_tokens = sum(estimate_tokens(message.get('content', '')) for message in body.get('messages', []))
+    completion_tokens = min(config.completion_tokens, body.get('max_tokens') or config.completion_tokens)
+    text = _completion_text(completion_tokens)
+    stats['prompt_tokens'] += prompt_tokens
+    stats['completion_tokens'] += completion_tokens
+
+    usage = {
+        'prompt_tokens': prompt_tokens,
+        'completion_tokens': completion_tokens,
+        'total_tokens': prompt_tokens + completion_tokens
+    }
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    model = body.get('model', 'stub')
+
+    await asyncio.sleep(config.latency * random.uniform(1 - config.jitter, 1 + config.jitter))
+    token_interval = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0
+
+    if not body.get('stream'):
+        await asyncio.sleep(completion_tokens * token_interval)
+        return web.json_response({
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop'
+            }],
+            'usage': usage
+        })
+
+    # 스트리밍 (SSE)
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+    await response.prepare(request)
+
+    def chunk(delta, finish_reason=None, chunk_usage=None):
+        data = {
+            'id': completion_id,
+            'object': 'chat.completion.chunk',
+            'created': created,
+            'model': model,
+            'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}] if delta is not None else [],
+            'usage': chunk_usage
+        }
+        return f"data: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+    await response.write(chunk({'role': 'assistant', 'content': ''}))
+    pieces = _split_tokens(text, completion_tokens)
+    for piece in pieces:
+        await asyncio.sleep(token_interval * completion_tokens / len(pieces))
+        await response.write(chunk({'content': piece}))
+    await response.write(chunk({}, finish_reason='stop'))
+    if (body.get('stream_options') or {}).get('include_usage'):
+        await response.write(chunk(None, chunk_usage=usage))
+    await response.write(b"data: [DONE]\n\n")
+    await response.write_eof()
+    return response
+
+
+async def start_server(config, host='127.0.0.1', port=8089):
+    """다른 스크립트(벤치마크)에서 같은 이벤트 루프로 서버 실행, runner 반환"""
+    runner = web.AppRunner(create_app(config))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI 호환 LLM 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=StubConfig.latency)
+    parser.add_argument('--jitter', type=float, default=StubConfig.jitter)
+    parser.add_argument('--tokens-per-second', type=float, default=StubConfig.tokens_per_second)
+    parser.add_argument('--completion-tokens', type=int, default=StubConfig.completion_tokens)
+    parser.add_argument('--failure-rate', type=float, default=StubConfig.failure_rate)
+    parser.add_argument('--rate-limit-rate', type=float, default=StubConfig.rate_limit_rate)
+    parser.add_argument('--hang-rate', type=float, default=StubConfig.hang_rate)
+    return parser.parse_args(argv)
+
+
+def config_from_args(args):
+    return StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        hang_rate=args.hang_rate
+    )
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+    logger.info(f"LLM 대역 서버 시작: http://{args.host}:{args.port}/v1")
+    web.run_app(create_app(config_from_args(args)), host=args.host, port=args.port)
@@ -0,0 +1,109 @@
+import discord
+import logging
+import pytz
+
+logger = logging.getLogger(__name__)
+KST = pytz.timezone('Asia/Seoul')
+
+
+def format_change(change_amount, change_type):
+    """순위 변동 표시 (personal_rank_view와 같은 기호)"""
+    if not change_amount:
+        return "-"
+    if change_type == "up":
+        return f"↑ {change_amount}"
+    if change_type == "down":
+        return f"↓ {change_amount}"
+    return "-"
+
+
+def build_leaderboard_embed(server: str, class_name: str, snapshot_at, rows: list[dict], page_number: int) -> discord.Embed:
+    """순위표 한 페이지 임베드"""
+    title = f"🏆 {server} 랭킹" + (f" · {class_name}" if class_name else "")
+    if rows:
+        lines = [
+            f"`{row['rank_position']:>6,}위` **{row['character_name']}** · {row['class_name']} · "
+            f"{row['power_value']} ({format_change(row['change_amount'], row['change_type'])})"
+            for row in rows
+        ]
+        description = "\n".join(lines)
+    else:
+        description = "표시할 순위가 없습니다."
+
+    # 수집 시각은 한국 시간으로 표시 (시간대 정보가 없으면 그대로)
+    if snapshot_at.tzinfo is not None:
+        snapshot_at = snapshot_at.astimezone(KST)
+    embed = discord.Embed(title=title, color=0x242429, description=description)
+    embed.set_footer(text=f"{page_number}페이지 · {snapshot_at.strftime('%m-%d %H:%M')} 기준")
+    return embed
+
+
+class LeaderboardView(discord.ui.View):
+    """
+    순위표 페이지 버튼
+    OFFSET 대신 각 페이지의 마지막 (순위, 이름)을 커서로 기억해 다음 페이지를 조회함
+    fetch_page(after): {'rows', 'has_next'} 를 반환하는 코루틴 함수
+    """
+
+    FIRST_CURSOR = (0, "")
+
+    def __init__(self, user_id, server, class_name, snapshot_at, fetch_page, first_page, timeout=300):
+        super().__init__(timeout=timeout)
+        self.user_id = user_id
+        self.server = server
+        self.class_name = class_name
+        self.snapshot_at = snapshot_at
+        self.fetch_page = fetch_page
+        self.cursors = [self.FIRST_CURSOR]  # 페이지별 시작 커서 (이전 페이지 마지막 순위, 이름)
+        self.page = first_page
+        self.message = None
+        self.update_buttons()
+
+    @property
+    def embed(self):
+        return build_leaderboard_embed(self.server, self.class_name, self.snapshot_at, self.page['rows'], len(self.cursors))
+
+    def update_buttons(self):
+        self.previous_button.disabled = len(self.cursors) <= 1
+        self.next_button.disabled = not self.page['has_next']
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # 다른 사용자가 페이지를 넘기는 것을 방지
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("이 버튼은 명령어를 사용한 사용자만 클릭할 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    async def show_page(self, interaction: discord.Interaction):
+        try:
+            self.page = await self.fetch_page(self.cursors[-1])
+        except Exception as e:
+            logger.error(f"순위표 페이지 조회 중 오류: {e}")
+            await interaction.response.send_message("순위표를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.", ephemeral=True)
+            return
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.embed, view=self)
+
+    @discord.ui.button(label="이전", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+        await self.show_page(interaction)
+
+    @discord.ui.button(label="다음", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.page['rows']:
+            last = self.page['rows'][-1]
+            self.cursors.append((last['rank_position'], last['character_name']))
+        await self.show_page(interaction)
+
+    async def on_timeout(self):
+        # 시간이 지나면 버튼 비활성화 (메시지가 삭제된 경우 무시)
+        if self.message is None:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException as e:
+            logger.warning(f"순위표 페이지 버튼 비활성화 실패: {e}")
@@ -0,0 +1,74 @@
+import discord
+import logging
+from views.rank_views.personal_rank_view import build_character_embed, RANK_FOOTER
+
+logger = logging.getLogger(__name__)
+
+
+def build_party_rank_pages(results: list[tuple[str, str, dict]]) -> list[discord.Embed]:
+    """
+    여러 캐릭터 조회 결과를 페이지(임베드) 목록으로 변환
+    results: [(서버, 캐릭터 이름, {'rank'} 또는 {'error'})] - 입력 순서 유지
+    """
+    pages = []
+    total = len(results)
+    for index, (server, character, result) in enumerate(results, start=1):
+        footer_text = f"{index} / {total} · {RANK_FOOTER}"
+        if result.get("rank"):
+            pages.append(build_character_embed(result["rank"], footer_text=footer_text))
+            continue
+
+        description = f"**서버**: {server}\n조회 실패: {result.get('error', '알 수 없는 오류')}"
+        if result.get("suggestions"):
+            description += f"\n혹시: {', '.join(result['suggestions'])}"
+        embed = discord.Embed(title=f"❔ {character}", color=0x95A5A6, description=description)
+        embed.set_footer(text=f"{index} / {total}")
+        pages.append(embed)
+    return pages
+
+
+class PartyRankView(discord.ui.View):
+    """파티 랭킹 결과를 한 메시지에서 넘겨 보는 페이지 버튼"""
+
+    def __init__(self, user_id, pages, timeout=300):
+        super().__init__(timeout=timeout)
+        self.user_id = user_id
+        self.pages = pages
+        self.index = 0
+        self.message = None
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_button.disabled = self.index == 0
+        self.next_button.disabled = self.index >= len(self.pages) - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # 다른 사용자가 페이지를 넘기는 것을 방지
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message("이 버튼은 명령어를 사용한 사용자만 클릭할 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    async def show_page(self, interaction: discord.Interaction, index):
+        self.index = index
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+
+    @discord.ui.button(label="이전", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, max(0, self.index - 1))
+
+    @discord.ui.button(label="다음", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.show_page(interaction, min(len(self.pages) - 1, self.index + 1))
+
+    async def on_timeout(self):
+        # 시간이 지나면 버튼 비활성화 (메시지가 삭제된 경우 무시)
+        if self.message is None:
+            return
+        for item in self.children:
+            item.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException as e:
+            logger.warning(f"파티 랭킹 페이지 버튼 비활성화 실패: {e}")
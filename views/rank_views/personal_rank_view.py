@@ -36,3 +36,20 @@ def _build_rank_embed(character_name: str, server_name: str, class_name: str,
 
     embed.set_footer(text=footer_text)
     return embed
+
+
+RANK_FOOTER = "정보는 거의 실시간 조회 중입니다.(약간의 오차가 있을 수 있음)"
+
+
+def build_character_embed(rank: dict, footer_text: str = RANK_FOOTER) -> discord.Embed:
+    """조회 결과(DB/API 공통 키)로 랭킹 임베드 생성"""
+    return _build_rank_embed(
+        character_name=rank.get("character_name", "알 수 없음"),
+        server_name=rank.get("server_name", "알 수 없음"),
+        class_name=rank.get("class_name", "알 수 없음"),
+        rank_position=str(rank.get("rank_position", "알 수 없음")),
+        power_value=str(rank.get("power_value", "알 수 없음")),
+        change_amount=int(rank.get("change_amount") or 0),
+        change_type=rank.get("change_type", "none"),
+        footer_text=footer_text
+    )
@@ -0,0 +1,36 @@
+import discord
+import pytz
+
+DIGEST_MAX_LINES = 20  # 알림 한 번에 보여줄 최대 캐릭터 수
+KST = pytz.timezone('Asia/Seoul')
+
+
+def build_rank_digest_embed(changes: list[dict], since, until) -> discord.Embed:
+    """
+    관심 캐릭터 순위 변동 모음 임베드
+    changes: select_rank_changes 결과 (순위 변동이 큰 순서로 표시)
+    """
+    changes = sorted(changes, key=lambda change: abs(change['previous_rank'] - change['current_rank']), reverse=True)
+    rising = sum(1 for change in changes if change['current_rank'] < change['previous_rank'])
+
+    lines = []
+    for change in changes[:DIGEST_MAX_LINES]:
+        delta = change['previous_rank'] - change['current_rank']
+        arrow = f"↑ {delta:,}" if delta > 0 else f"↓ {-delta:,}"
+        lines.append(
+            f"**{change['character_name']}** ({change['server_name']}) "
+            f"{change['previous_rank']:,}위 → {change['current_rank']:,}위 `{arrow}` · 전투력 {change['current_power']:,}"
+        )
+    if len(changes) > DIGEST_MAX_LINES:
+        lines.append(f"외 {len(changes) - DIGEST_MAX_LINES}명")
+
+    embed = discord.Embed(
+        title="📊 관심 캐릭터 순위 변동",
+        color=0x57F287 if rising * 2 >= len(changes) else 0xED4245,
+        description="\n".join(lines)
+    )
+    embed.set_footer(
+        text=f"상승 {rising}명 · 하락 {len(changes) - rising}명 · "
+             f"{since.astimezone(KST).strftime('%H:%M')}~{until.astimezone(KST).strftime('%H:%M')}"
+    )
+    return embed
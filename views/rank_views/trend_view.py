@@ -0,0 +1,67 @@
+import discord
+
+# 추이 그래프 문자 (낮음 → 높음)
+SPARK_BARS = "▁▂▃▄▅▆▇█"
+TABLE_DAYS = 7  # 표로 보여줄 최근 일수
+
+
+def sparkline(values: list[float]) -> str:
+    """값 목록을 한 줄 막대 그래프로 표시"""
+    if not values:
+        return ""
+    low, high = min(values), max(values)
+    if high == low:
+        return SPARK_BARS[len(SPARK_BARS) // 2] * len(values)
+    scale = (len(SPARK_BARS) - 1) / (high - low)
+    return "".join(SPARK_BARS[round((value - low) * scale)] for value in values)
+
+
+def format_delta(start, end, reverse=False):
+    """기간 중 변화량 (reverse: 순위처럼 작아질수록 좋은 값)"""
+    delta = (start - end) if reverse else (end - start)
+    if delta > 0:
+        return f"▲ {delta:,}"
+    if delta < 0:
+        return f"▼ {-delta:,}"
+    return "변동 없음"
+
+
+def build_trend_embed(server: str, character: str, history: list[dict], days: int) -> discord.Embed:
+    """
+    캐릭터 일간 기록으로 전투력/순위 추이 임베드 생성
+    history: select_character_daily_history 결과 (날짜 오름차순)
+    """
+    first, last = history[0], history[-1]
+    powers = [row['last_power'] for row in history]
+    ranks = [row['last_rank'] for row in history]
+
+    if last['last_power'] >= first['last_power']:
+        color = 0x57F287  # 초록색
+    else:
+        color = 0xED4245  # 빨간색
+
+    embed = discord.Embed(
+        title=f"📈 {character}",
+        color=color,
+        description=f"**클래스**: {last['class_name'] or '알 수 없음'} \n **서버**: {server}"
+    )
+    embed.add_field(
+        name="⚔️ 전투력",
+        value=f"```{sparkline(powers)}```{first['last_power']:,} → {last['last_power']:,} ({format_delta(first['last_power'], last['last_power'])})",
+        inline=False
+    )
+    # 순위는 숫자가 작을수록 높으므로 뒤집어서 그림
+    embed.add_field(
+        name="🥇 순위",
+        value=f"```{sparkline([-rank for rank in ranks])}```{first['last_rank']:,}위 → {last['last_rank']:,}위 "
+              f"({format_delta(first['last_rank'], last['last_rank'], reverse=True)}, 최고 {min(row['best_rank'] for row in history):,}위)",
+        inline=False
+    )
+
+    lines = [
+        f"{row['rank_date'].strftime('%m-%d')}  {row['last_rank']:>7,}위  {row['last_power']:>11,}"
+        for row in history[-TABLE_DAYS:]
+    ]
+    embed.add_field(name=f"🗓️ 최근 {len(lines)}일", value="```" + "\n".join(lines) + "```", inline=False)
+    embed.set_footer(text=f"최근 {days}일 중 {len(history)}일 기록 · 하루 마지막 수집 기준")
+    return embed